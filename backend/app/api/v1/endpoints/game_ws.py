@@ -11,10 +11,11 @@ from app.db.session import get_db
 from app.crud import crud_game
 from app.services.game_logic import (
     Board as GameLogicBoard,
+    BoardGeometry,
     apply_move,
     check_draw,
-    check_win,
     create_board as service_create_board,
+    find_winning_line,
     is_valid_move,
 )
 
@@ -23,6 +24,9 @@ from app.services.game_logic import (
 from app.core import constants
 from app.services.ava_game_manager import run_ai_vs_ai_game
 from app.services.pve_game_manager import _handle_pve_ai_turn
+from app.services.ai_executor import ai_executor
+from app.services.ponder import ponder_manager
+from app.services.bot_registry import bot_registry, new_ai_seed
 
 from app.core.logging_config import setup_logger
 
@@ -50,11 +54,7 @@ async def handle_create_game_message(
         pve_ai_difficulty_str = payload.get(
             constants.DIFFICULTY_PAYLOAD_KEY, constants.DEFAULT_AI_DIFFICULTY
         ).upper()
-        if pve_ai_difficulty_str not in [
-            constants.AI_DIFFICULTY_EASY,
-            constants.AI_DIFFICULTY_MEDIUM,
-            constants.AI_DIFFICULTY_HARD,
-        ]:
+        if pve_ai_difficulty_str not in constants.AI_DIFFICULTIES:
             await manager.send_error(websocket, "Invalid AI difficulty for PVE.")
             return None
         db_game_mode = f"{constants.DB_GAME_MODE_PVE_PREFIX}{pve_ai_difficulty_str}"
@@ -65,11 +65,7 @@ async def handle_create_game_message(
         ai2_diff = payload.get(
             constants.AI2_DIFFICULTY_PAYLOAD_KEY, constants.DEFAULT_AI_DIFFICULTY
         ).upper()
-        valid_diffs = [
-            constants.AI_DIFFICULTY_EASY,
-            constants.AI_DIFFICULTY_MEDIUM,
-            constants.AI_DIFFICULTY_HARD,
-        ]
+        valid_diffs = constants.AI_DIFFICULTIES
         if ai1_diff not in valid_diffs or ai2_diff not in valid_diffs:
             await manager.send_error(websocket, "Invalid AI difficulties for AVA.")
             return None
@@ -79,17 +75,9 @@ async def handle_create_game_message(
     # This dynamic generation of allowed_game_modes can be simplified if your modes are fixed
     # Or pre-generate this list. For now, keeping it similar to original.
     allowed_game_modes = [constants.GAME_MODE_PVP]
-    for d1 in [
-        constants.AI_DIFFICULTY_EASY,
-        constants.AI_DIFFICULTY_MEDIUM,
-        constants.AI_DIFFICULTY_HARD,
-    ]:
+    for d1 in constants.AI_DIFFICULTIES:
         allowed_game_modes.append(f"{constants.DB_GAME_MODE_PVE_PREFIX}{d1}")
-        for d2 in [
-            constants.AI_DIFFICULTY_EASY,
-            constants.AI_DIFFICULTY_MEDIUM,
-            constants.AI_DIFFICULTY_HARD,
-        ]:
+        for d2 in constants.AI_DIFFICULTIES:
             allowed_game_modes.append(
                 f"{constants.DB_GAME_MODE_AVA_PREFIX}{d1}_VS_{d2}"
             )
@@ -97,10 +85,20 @@ async def handle_create_game_message(
         await manager.send_error(websocket, f"Unsupported game mode: {db_game_mode}")
         return None
 
+    # --- Board Variant (geometry stored with the game) ---
+    variant = str(
+        payload.get(constants.VARIANT_PAYLOAD_KEY, constants.DEFAULT_BOARD_VARIANT)
+    ).upper()
+    if variant not in constants.BOARD_VARIANTS:
+        await manager.send_error(websocket, f"Unsupported board variant: {variant}")
+        return None
+    geometry = BoardGeometry(*constants.BOARD_VARIANTS[variant])
+
     # --- Determine Player Tokens and Initial Status ---
     player1_token = player_human_token  # Default for PVP/PVE
     player2_token = None
     initial_status = constants.GAME_STATUS_WAITING_FOR_PLAYER2  # Default for PVP
+    ai_seed = None  # Only AI games that ask for one are seeded
 
     if db_game_mode.startswith(constants.DB_GAME_MODE_PVE_PREFIX):
         difficulty_part = db_game_mode.split("_")[1]  # PVE_EASY -> EASY
@@ -119,6 +117,14 @@ async def handle_create_game_message(
         player2_token = f"{constants.AI_PLAYER_TOKEN_PREFIX}{ai2_diff_for_token}{constants.AI_PLAYER_TOKEN_PLAYER2_SUFFIX}"
         initial_status = constants.GAME_STATUS_ACTIVE
 
+    if player2_token is not None:
+        # A recorded seed replays an earlier game's AI moves; true records a new one
+        requested_seed = payload.get(constants.AI_SEED_PAYLOAD_KEY)
+        if requested_seed is True:
+            ai_seed = new_ai_seed()
+        elif isinstance(requested_seed, int) and not isinstance(requested_seed, bool):
+            ai_seed = requested_seed % (1 << constants.AI_SEED_BITS)
+
     # --- Create Game in DB ---
     db_game = crud_game.create_game_db(
         db=db,
@@ -126,6 +132,8 @@ async def handle_create_game_message(
         player2_token=player2_token,
         initial_current_player_token=player1_token,  # P1 or AI1 starts
         game_mode=db_game_mode,
+        ai_seed=ai_seed,
+        geometry=geometry,
         # initial_status is set by create_game_db based on P2 presence
     )
     # Ensure status is correctly set if create_game_db doesn't handle it for PVE/AVA
@@ -138,6 +146,9 @@ async def handle_create_game_message(
         )
 
     active_game_id_str = str(db_game.id)
+    logger.info(f"Game {active_game_id_str} variant: {variant} {geometry}")
+    if ai_seed is not None:
+        logger.info(f"Game {active_game_id_str} AI seed: {ai_seed}")
     await manager.connect(
         websocket, active_game_id_str, client_id
     )  # Connect this websocket to the game room
@@ -164,6 +175,7 @@ async def handle_create_game_message(
                 "player_token": player_token_for_message,
                 "player_piece": player_piece_for_message,
                 "game_mode": db_game.game_mode,
+                "geometry": geometry._asdict(),
                 "message": message_text,
             },
         },
@@ -189,7 +201,7 @@ async def handle_create_game_message(
     ) or db_game.game_mode.startswith(constants.DB_GAME_MODE_AVA_PREFIX):
 
         board_to_start: GameLogicBoard = db_game.board_state.get(
-            "board", service_create_board()
+            "board", service_create_board(geometry)
         )
         # Ensure tokens from DB are used for players map
         p1_token_db = db_game.player1_token
@@ -227,6 +239,7 @@ async def handle_create_game_message(
             "your_token": your_token_for_start,
             # Include game_mode in GAME_START as well, good for client state consistency
             "game_mode": db_game.game_mode,
+            "geometry": geometry._asdict(),
         }
         await manager.broadcast_to_game(  # For PVE, only P1 is in room. For AVA, spectators.
             {"type": constants.WS_MSG_TYPE_GAME_START, "payload": game_start_payload},
@@ -239,7 +252,12 @@ async def handle_create_game_message(
             logger.info(
                 f"AvA Game {active_game_id_str}: Scheduling AI vs AI play. First turn: {db_game.current_player_token}"
             )
-            asyncio.create_task(run_ai_vs_ai_game(db_game.id))
+            asyncio.create_task(
+                run_ai_vs_ai_game(
+                    db_game.id,
+                    headless=bool(payload.get(constants.HEADLESS_PAYLOAD_KEY, False)),
+                )
+            )
 
     return active_game_id_str
 
@@ -313,8 +331,9 @@ async def handle_make_move_message(
         return
 
     # Game Logic for Human Move
+    geometry = crud_game.game_geometry(db_game)
     current_board: GameLogicBoard = db_game.board_state.get(
-        "board", service_create_board()
+        "board", service_create_board(geometry)
     )
     board_for_move = [r[:] for r in current_board]  # Work on a copy
 
@@ -339,7 +358,10 @@ async def handle_make_move_message(
         else db_game.player1_token
     )
 
-    if check_win(board_for_move, player_piece, placed_coords):
+    winning_line = find_winning_line(
+        board_for_move, player_piece, placed_coords, geometry
+    )
+    if winning_line:
         current_turn_status = constants.get_win_status(player_piece)
         winner_for_turn = player_token_from_msg
         is_game_over_this_turn = True
@@ -374,6 +396,8 @@ async def handle_make_move_message(
     }
 
     if is_game_over_this_turn:
+        ponder_manager.stop(current_active_game_id)
+        bot_registry.release_game(current_active_game_id)
         await manager.broadcast_game_over(
             current_active_game_id,
             final_board_to_broadcast,
@@ -384,6 +408,7 @@ async def handle_make_move_message(
                 if winner_for_turn != constants.DRAW_WINNER_TOKEN_VALUE
                 else None
             ),
+            winning_line=winning_line,
         )
     else:
         # Broadcast human move update FIRST
@@ -483,7 +508,7 @@ async def handle_join_game_message(
 
     # Prepare GAME_START payload for both players
     board_to_start: GameLogicBoard = updated_db_game.board_state.get(
-        "board", service_create_board()
+        "board", service_create_board(crud_game.game_geometry(updated_db_game))
     )
     p1_token_from_db = updated_db_game.player1_token
     p2_token_from_db = updated_db_game.player2_token  # This should be player2_temp_id
@@ -504,6 +529,7 @@ async def handle_join_game_message(
             p2_token_from_db: constants.PLAYER_O,
         },
         "game_mode": updated_db_game.game_mode,
+        "geometry": crud_game.game_geometry(updated_db_game)._asdict(),
     }
 
     # --- CORRECTED SECTION FOR SENDING GAME_START ---
@@ -565,6 +591,10 @@ async def handle_player_departure_in_active_game(
     db: Session
 ):
     logger.info(f"Handling player departure: Player {disconnected_player_token} from game {game_id_str}")
+    # Nobody is left to receive an AI reply for this game
+    ai_executor.cancel_game(game_id_str)
+    ponder_manager.stop(game_id_str)
+    bot_registry.release_game(game_id_str)
     try:
         game_uuid = uuid.UUID(game_id_str)
         db_game = crud_game.get_game(db, game_id=game_uuid)
@@ -613,7 +643,9 @@ async def handle_player_departure_in_active_game(
         )
 
         # Fetch the final board state to broadcast
-        final_board_state = db_game.board_state.get("board", service_create_board()) # Use current board, as no new move was made
+        final_board_state = db_game.board_state.get(
+            "board", service_create_board(crud_game.game_geometry(db_game))
+        )  # Use current board, as no new move was made
 
         await manager.broadcast_game_over(
             game_id_str,
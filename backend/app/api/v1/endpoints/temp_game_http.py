@@ -149,8 +149,9 @@ async def http_make_move(
 
     # Extract the list-based board from the JSONB structure
     # The default in the Game model ensures `board_state` has a `{"board": ...}` structure
+    geometry = crud_game.game_geometry(db_game)
     current_board_list: GameLogicBoard = db_game.board_state.get(
-        "board", service_create_board()
+        "board", service_create_board(geometry)
     )
 
     if not is_valid_move(current_board_list, move.row, move.side):
@@ -169,7 +170,7 @@ async def http_make_move(
     new_status = db_game.status  # Start with current status
     new_winner_token = db_game.winner_token  # Start with current winner
 
-    if check_win(current_board_list, move.player, placed_coords):
+    if check_win(current_board_list, move.player, placed_coords, geometry):
         new_status = f"player_{move.player.lower()}_wins"
         new_winner_token = player_making_move_token
     elif check_draw(current_board_list):
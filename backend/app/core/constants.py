@@ -11,11 +11,25 @@ GAME_STATUS_WAITING_FOR_PLAYER2: str = "waiting_for_player2"
 GAME_STATUS_ACTIVE: str = "active"
 GAME_STATUS_DRAW: str = "draw"
 
-# Board Dimensions
+# Board Dimensions (the default geometry; each game stores its own, see BOARD_VARIANTS)
 ROWS: int = 7
 COLS: int = 7
 CONNECT_N: int = 4
 
+# Board variants a game can be created with: (rows, cols, connect_n)
+BOARD_VARIANT_STANDARD: str = "STANDARD"
+BOARD_VARIANT_LARGE: str = "LARGE"
+BOARD_VARIANT_COMPACT: str = "COMPACT"
+BOARD_VARIANTS: dict = {
+    BOARD_VARIANT_STANDARD: (ROWS, COLS, CONNECT_N),
+    BOARD_VARIANT_LARGE: (9, 9, 5),
+    BOARD_VARIANT_COMPACT: (6, 7, 4),
+}
+DEFAULT_BOARD_VARIANT: str = BOARD_VARIANT_STANDARD
+# Largest board any geometry may have; bounds move validation and mate-score distances
+BOARD_MAX_ROWS: int = 9
+BOARD_MAX_COLS: int = 9
+
 
 # Function to generate win status, e.g., player_x_wins
 def get_win_status(player_piece: str) -> str:
@@ -33,6 +47,49 @@ GAME_MODE_AVA: str = "AVA"
 AI_DIFFICULTY_EASY: str = "EASY"
 AI_DIFFICULTY_MEDIUM: str = "MEDIUM"
 AI_DIFFICULTY_HARD: str = "HARD"
+AI_DIFFICULTY_MCTS: str = "MCTS"  # Monte Carlo tree search
+AI_DIFFICULTIES: list = [
+    AI_DIFFICULTY_EASY,
+    AI_DIFFICULTY_MEDIUM,
+    AI_DIFFICULTY_HARD,
+    AI_DIFFICULTY_MCTS,
+]
+
+# AI Search Limits
+AI_MEDIUM_SEARCH_DEPTH: int = 2
+AI_HARD_MAX_SEARCH_DEPTH: int = 8  # Cap for iterative deepening under the time budget
+AI_HARD_TIME_BUDGET_SECONDS: float = 1.0  # Wall-clock think time per HARD move
+# Pondered replies are searched off the critical path, so they get a longer budget
+AI_HARD_PONDER_TIME_BUDGET_SECONDS: float = 2.5
+# From this many empty cells down, HARD solves the position exactly instead of searching.
+# 16 solves in well under the think budget; around 20 a solve can take tens of seconds.
+AI_HARD_ENDGAME_MAX_EMPTY_CELLS: int = 16
+AI_MCTS_TIME_BUDGET_SECONDS: float = (
+    1.0  # Think time per MCTS move with the executor idle
+)
+# Under load the MCTS budget shrinks with the queue (it is an anytime search), down to this
+AI_MCTS_MIN_TIME_BUDGET_SECONDS: float = 0.2
+AI_MCTS_BATCH_SIZE: int = 32  # Playouts run together per expanded node
+# Seeded games must replay exactly, so their bots stop at fixed limits rather than on
+# the clock. Depth 6 takes about a third of the HARD budget; 100 MCTS iterations about
+# as long as its budget
+AI_HARD_SEEDED_SEARCH_DEPTH: int = 6
+AI_MCTS_SEEDED_MAX_ITERATIONS: int = 100
+# Difficulties whose searched moves are cached across games (see services/move_cache.py).
+# EASY and MCTS are left out on purpose: their variety is part of how they play.
+AI_MOVE_CACHE_DIFFICULTIES: list = [AI_DIFFICULTY_MEDIUM, AI_DIFFICULTY_HARD]
+# PVE and AVA games created with an ai_seed seed their bots (stored as games.ai_seed)
+AI_SEED_BITS: int = 63  # Fits a signed BIGINT column
+
+# AI "thinking" presentation delays: the minimum time before an AI move is revealed.
+# The search runs concurrently, so the reveal happens at max(search time, delay).
+AI_PVE_MIN_REVEAL_SECONDS: dict = {
+    AI_DIFFICULTY_EASY: 0.5,
+    AI_DIFFICULTY_MEDIUM: 1.0,
+    AI_DIFFICULTY_HARD: 1.5,
+    AI_DIFFICULTY_MCTS: 1.5,
+}
+AI_AVA_MIN_REVEAL_SECONDS: float = 1.0  # Per ply, for spectating; 0 in headless mode
 
 # DB Game Modes (Constructed, e.g., PVE_EASY, AVA_EASY_VS_MEDIUM)
 DB_GAME_MODE_PVE_PREFIX: str = "PVE_"
@@ -72,6 +129,9 @@ MODE_PAYLOAD_KEY: str = "mode"
 DIFFICULTY_PAYLOAD_KEY: str = "difficulty"
 AI1_DIFFICULTY_PAYLOAD_KEY: str = "ai1_difficulty"
 AI2_DIFFICULTY_PAYLOAD_KEY: str = "ai2_difficulty"
+HEADLESS_PAYLOAD_KEY: str = "headless"  # AVA only: play at full engine speed
+AI_SEED_PAYLOAD_KEY: str = "ai_seed"  # PVE/AVA, optional: a seed to replay, or true
+VARIANT_PAYLOAD_KEY: str = "variant"  # Optional, one of BOARD_VARIANTS
 GAME_ID_PAYLOAD_KEY: str = "game_id"
 PLAYER_TOKEN_PAYLOAD_KEY: str = "player_token"
 ROW_PAYLOAD_KEY: str = "row"
@@ -0,0 +1,90 @@
+# backend/app/core/metrics.py
+import asyncio
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict
+
+from app.core.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+# How many recent samples each timing keeps for percentile estimates
+TIMING_WINDOW_SIZE: int = 1000
+
+
+class MetricsRegistry:
+    """
+    Minimal in-process metrics: counters, gauges and timings.
+    Timings keep count/total/max plus a window of recent samples for p50/p99.
+    Exposed as JSON through the /metrics endpoint in main.py.
+    """
+
+    def __init__(self):
+        self._counters: Dict[str, int] = defaultdict(int)
+        self._gauges: Dict[str, float] = {}
+        self._timings: Dict[str, Dict[str, Any]] = {}
+
+    def increment(self, name: str, value: int = 1):
+        self._counters[name] += value
+
+    def set_gauge(self, name: str, value: float):
+        self._gauges[name] = value
+
+    def observe(self, name: str, value: float):
+        timing = self._timings.get(name)
+        if timing is None:
+            timing = {
+                "count": 0,
+                "total": 0.0,
+                "max": 0.0,
+                "recent": deque(maxlen=TIMING_WINDOW_SIZE),
+            }
+            self._timings[name] = timing
+        timing["count"] += 1
+        timing["total"] += value
+        timing["max"] = max(timing["max"], value)
+        timing["recent"].append(value)
+
+    @staticmethod
+    def _percentile(samples: Deque[float], fraction: float) -> float:
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        timings = {}
+        for name, timing in self._timings.items():
+            recent = timing["recent"]
+            timings[name] = {
+                "count": timing["count"],
+                "mean": timing["total"] / timing["count"],
+                "max": timing["max"],
+                "p50": self._percentile(recent, 0.50),
+                "p99": self._percentile(recent, 0.99),
+            }
+        return {
+            "counters": dict(self._counters),
+            "gauges": dict(self._gauges),
+            "timings": timings,
+        }
+
+    def reset(self):
+        self._counters.clear()
+        self._gauges.clear()
+        self._timings.clear()
+
+
+async def monitor_event_loop_lag(interval: float = 0.5):
+    """
+    Records how late the event loop wakes up from a fixed sleep. Anything that
+    blocks the loop (e.g. a CPU-bound search run inline) shows up here directly.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        metrics.observe(
+            "event_loop.lag_seconds", max(0.0, loop.time() - started - interval)
+        )
+
+
+# Singleton registry shared by the whole process
+metrics = MetricsRegistry()
@@ -7,6 +7,8 @@ import uuid
 from sqlalchemy.orm.attributes import flag_modified
 from app.db.models import Game  # Game SQLAlchemy model
 from app.services.game_logic import (
+    BoardGeometry,
+    DEFAULT_GEOMETRY,
     create_board as service_create_board,
 )  # Renaming to avoid conflict
 
@@ -51,14 +53,18 @@ def create_game_db(
     player2_token: Optional[str] = None,
     game_mode: str = "PVP",
     initial_current_player_token: Optional[str] = None,
+    ai_seed: Optional[int] = None,
+    geometry: Optional[BoardGeometry] = None,
 ) -> Game:
     """
     Creates a new game in the database.
-    The initial board state is set here.
+    The initial board state is set here, on the given board geometry (the
+    default one unless given), which is stored with the game.
     """
+    geometry = geometry or DEFAULT_GEOMETRY
     # The default for board_state in the model handles empty board creation
     # But if you want to be explicit or pass a board generated by game_logic:
-    initial_board_data = service_create_board()  # Uses our game_logic service
+    initial_board_data = service_create_board(geometry)  # Uses our game_logic service
 
     db_game = Game(
         player1_token=player1_token,
@@ -75,6 +81,10 @@ def create_game_db(
             else "active"
         ),
         game_mode=game_mode,
+        ai_seed=ai_seed,
+        board_rows=geometry.rows,
+        board_cols=geometry.cols,
+        connect_n=geometry.connect_n,
     )
     db.add(db_game)
     db.commit()
@@ -82,6 +92,20 @@ def create_game_db(
     return db_game
 
 
+def game_geometry(db_game: Game) -> BoardGeometry:
+    """
+    The board geometry the game is played on; the default one for games stored
+    before geometries were recorded.
+    """
+    if (
+        db_game.board_rows is None
+        or db_game.board_cols is None
+        or db_game.connect_n is None
+    ):
+        return DEFAULT_GEOMETRY
+    return BoardGeometry(db_game.board_rows, db_game.board_cols, db_game.connect_n)
+
+
 def update_game_state(
     db: Session,
     game_id: uuid.UUID,
@@ -0,0 +1,25 @@
+"""add_games_ai_seed
+
+Revision ID: 4c2e7d1a9b3f
+Revises: 981b356a39d8
+Create Date: 2026-10-17 08:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "4c2e7d1a9b3f"
+down_revision: Union[str, None] = "981b356a39d8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("games", sa.Column("ai_seed", sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("games", "ai_seed")
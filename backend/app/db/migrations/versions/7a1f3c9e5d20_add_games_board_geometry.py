@@ -0,0 +1,39 @@
+"""add_games_board_geometry
+
+Revision ID: 7a1f3c9e5d20
+Revises: 4c2e7d1a9b3f
+Create Date: 2026-10-17 14:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "7a1f3c9e5d20"
+down_revision: Union[str, None] = "4c2e7d1a9b3f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing games were all played on the standard 7x7 connect-4 board
+    op.add_column(
+        "games",
+        sa.Column("board_rows", sa.Integer(), server_default="7", nullable=False),
+    )
+    op.add_column(
+        "games",
+        sa.Column("board_cols", sa.Integer(), server_default="7", nullable=False),
+    )
+    op.add_column(
+        "games",
+        sa.Column("connect_n", sa.Integer(), server_default="4", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("games", "connect_n")
+    op.drop_column("games", "board_cols")
+    op.drop_column("games", "board_rows")
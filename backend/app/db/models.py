@@ -3,7 +3,9 @@
 from datetime import datetime
 import uuid
 from sqlalchemy import (
+    BigInteger,
     Column,
+    Integer,
     String,
     DateTime,
     func,
@@ -13,6 +15,7 @@ from sqlalchemy.dialects.postgresql import UUID, JSONB  # PostgreSQL specific JS
 from sqlalchemy.orm import Mapped, mapped_column
 from typing import List, Optional, Dict, Any
 
+from app.core.constants import COLS, CONNECT_N, ROWS
 from .base_class import Base  # Import Base from our base_class.py
 
 
@@ -40,7 +43,19 @@ class Game(Base):
     # Store board state as JSON. PostgreSQL JSONB is efficient.
     # The structure will be List[List[Optional[str]]]
     board_state: Mapped[Dict[str, Any]] = mapped_column(
-        JSONB, default=lambda: {"board": [([None] * 7) for _ in range(7)]}
+        JSONB, default=lambda: {"board": [([None] * COLS) for _ in range(ROWS)]}
+    )
+
+    # Board geometry of the game (see constants.BOARD_VARIANTS); board_state
+    # holds a board_rows x board_cols board, won by connect_n in a line
+    board_rows: Mapped[int] = mapped_column(
+        Integer, default=ROWS, server_default=str(ROWS)
+    )
+    board_cols: Mapped[int] = mapped_column(
+        Integer, default=COLS, server_default=str(COLS)
+    )
+    connect_n: Mapped[int] = mapped_column(
+        Integer, default=CONNECT_N, server_default=str(CONNECT_N)
     )
 
     # Game status: 'waiting_for_player2', 'active', 'player_x_wins', 'player_o_wins', 'draw', 'ava_active'
@@ -55,6 +70,9 @@ class Game(Base):
         String, nullable=True
     )  # Stores the token of the winning player
 
+    # Seed of the game's bots (PVE/AVA); the same seed replays the same AI moves
+    ai_seed: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
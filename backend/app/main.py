@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import uvicorn
 from fastapi import FastAPI
@@ -8,6 +9,9 @@ from app.api.v1.endpoints import temp_game_http # Import the new router
 from app.api.v1.endpoints import game_ws
 
 from app.core.logging_config import setup_logger, LOG_LEVEL
+from app.core.metrics import metrics, monitor_event_loop_lag
+from app.services.ai_executor import ai_executor
+from app.services.ai.root_split import shutdown_root_search_pools
 
 logger = setup_logger(__name__, level=LOG_LEVEL)
 
@@ -53,6 +57,26 @@ async def health_check():
     logger.info("Health check endpoint called.")
     return {"status": "healthy"}
 
+@app.get(f"{settings.API_V1_STR}/metrics", tags=["Health"])
+async def metrics_snapshot():
+    """
+    In-process metrics: AI executor backpressure, search timings, event-loop lag.
+    """
+    return metrics.snapshot()
+
+
+@app.on_event("startup")
+async def start_background_monitors():
+    app.state.event_loop_lag_monitor = asyncio.create_task(monitor_event_loop_lag())
+
+
+@app.on_event("shutdown")
+async def stop_background_work():
+    app.state.event_loop_lag_monitor.cancel()
+    ai_executor.shutdown()
+    shutdown_root_search_pools()  # Only populated when searches run in this process
+
+
 # Include the temporary HTTP game router
 app.include_router(
     temp_game_http.router, 
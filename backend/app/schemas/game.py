@@ -2,13 +2,20 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional, Literal, Union  # Added Union
 
+from app.core.constants import BOARD_MAX_ROWS
+
 # Corrected BoardSchema
 BoardSchema = List[List[Optional[Literal['X', 'O']]]]
 
 
 class MoveRequest(BaseModel):
     player: Literal['X', 'O'] = Field(..., description="The player making the move ('X' or 'O')")
-    row: int = Field(..., ge=0, lt=7, description="The row to play on (0-6)")
+    row: int = Field(
+        ...,
+        ge=0,
+        lt=BOARD_MAX_ROWS,
+        description="The row to play on; the game's board geometry bounds it further",
+    )
     side: Literal['L', 'R'] = Field(..., description="The side to play from ('L' for Left, 'R' for Right)")
 
 
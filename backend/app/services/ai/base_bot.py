@@ -1,20 +1,119 @@
 # backend/app/services/ai/base_bot.py
+import random
+import time
 from abc import ABC, abstractmethod
-from typing import Tuple, List, Optional
+from typing import NamedTuple, Tuple, List, Optional, Union
+
+from app.services.game_logic import BoardGeometry, BoardTables, board_tables
 
 # Assuming Board is defined in game_logic or imported appropriately
 # from app.services.game_logic import Board as GameLogicBoard
 GameLogicBoard = List[List[Optional[str]]]
 
+# Where a move came from, for SearchStats.source
+MOVE_SOURCE_SEARCH: str = "search"
+MOVE_SOURCE_FORCED: str = "forced"  # Immediate win or block, no search needed
+MOVE_SOURCE_BOOK: str = "book"
+MOVE_SOURCE_ENDGAME: str = "endgame"
+MOVE_SOURCE_RULES: str = "rules"  # Rule-based bots (Easy)
+MOVE_SOURCE_CACHE: str = "cache"  # Served from the process-wide move cache
+
+
+class SearchStats(NamedTuple):
+    """What one get_move call did. Counters a bot does not have stay at zero."""
+
+    source: str = MOVE_SOURCE_SEARCH
+    elapsed_seconds: float = 0.0
+    nodes: int = 0
+    leaf_evaluations: int = 0
+    tt_hits: int = 0
+    tt_misses: int = 0
+    cutoffs_by_ply: Tuple[
+        int, ...
+    ] = ()  # Beta/alpha cut-offs, index = plies from the root
+    completed_depth: int = 0
+    depth_seconds: Tuple[
+        float, ...
+    ] = ()  # Time per completed iterative-deepening depth
+    principal_variation: Tuple[Tuple[int, str], ...] = ()
+    score: Optional[float] = None  # Root score of the chosen move, from the bot's side
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    @property
+    def tt_hit_rate(self) -> float:
+        probes = self.tt_hits + self.tt_misses
+        return self.tt_hits / probes if probes else 0.0
+
+    def summary(self) -> str:
+        """One log line."""
+        pv = " ".join(f"{row}{side}" for row, side in self.principal_variation)
+        return (
+            f"source={self.source} depth={self.completed_depth} nodes={self.nodes} "
+            f"leaves={self.leaf_evaluations} nps={self.nodes_per_second:.0f} "
+            f"tt_hit_rate={self.tt_hit_rate:.2f} cutoffs={list(self.cutoffs_by_ply)} "
+            f"pv=[{pv}] elapsed={self.elapsed_seconds:.3f}s"
+        )
+
+
+def board_seed_key(board: GameLogicBoard) -> str:
+    """The board as one string, for seeding a bot's random choices per position."""
+    return "".join(cell or "." for row in board for cell in row)
+
 
 class BaseBot(ABC):
-    def __init__(self, player_piece: str):
+    """
+    Every random choice a bot makes goes through self.rng. With a seed, the rng
+    is reseeded from (seed, piece, board) at the start of each get_move, so the
+    same seed and board always give the same move and, for fixed-depth
+    searches from the same table contents, the same search statistics, however
+    many moves the bot made before. Without one, choices are unseeded.
+
+    A bot plays one board geometry (the default one unless given), whose
+    BoardTables it reads instead of the module-level default tables.
+    """
+
+    def __init__(
+        self,
+        player_piece: str,
+        seed: Optional[int] = None,
+        geometry: Optional[BoardGeometry] = None,
+    ):
         self.player_piece = player_piece  # 'X' or 'O'
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.tables: BoardTables = board_tables(geometry)
+        self.geometry: BoardGeometry = self.tables.geometry
 
-    @abstractmethod
-    def get_move(self, board: GameLogicBoard) -> Optional[Tuple[int, str]]:
+    def get_move(
+        self, board: GameLogicBoard, return_stats: bool = False
+    ) -> Union[
+        Optional[Tuple[int, str]], Tuple[Optional[Tuple[int, str]], SearchStats]
+    ]:
         """
         Determines the AI's next move.
-        Returns a tuple (row_index, side: 'L'|'R') or None if no valid move.
+        Returns a tuple (row_index, side: 'L'|'R') or None if no valid move, or
+        (move, SearchStats) when return_stats is set.
         """
+        started = time.perf_counter()
+        if self.seed is not None:
+            self.rng.seed(f"{self.seed}:{self.player_piece}:{board_seed_key(board)}")
+        move = self._choose_move(board)
+        if not return_stats:
+            return move
+        return move, self._search_stats(time.perf_counter() - started)
+
+    @abstractmethod
+    def _choose_move(self, board: GameLogicBoard) -> Optional[Tuple[int, str]]:
+        """The bot's move selection; see get_move."""
         pass
+
+    def _search_stats(self, elapsed_seconds: float) -> SearchStats:
+        """Stats of the last _choose_move call. Bots that count things override this."""
+        return SearchStats(source=MOVE_SOURCE_RULES, elapsed_seconds=elapsed_seconds)
+
+
+class SearchTimeout(Exception):
+    """Raised inside a bot's search when its think-time deadline has passed."""
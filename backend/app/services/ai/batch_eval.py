@@ -0,0 +1,265 @@
+# backend/app/services/ai/batch_eval.py
+"""
+Vectorised position evaluation: scores a whole batch of positions in one call.
+
+Positions are an (N, rows, cols) int8 array holding BATCH_EMPTY / BATCH_X /
+BATCH_O, for one board geometry (the default one unless given). Window counts come from one matrix product against the cell-window
+incidence matrix, and each window's score from a lookup table built from the
+bot's _evaluate_counts, so the result matches the bot's own evaluation exactly
+(SearchBot's WindowEvaluator score: windows plus the bot's cell_weights).
+
+Alpha-beta scores leaves one at a time and already does so incrementally; this
+is for the places that score many positions at once (ranking a frontier of
+replies, offline analysis of stored games):
+
+    python -m app.services.ai.batch_eval --bot hard --positions 200000
+"""
+import argparse
+import random
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .base_bot import GameLogicBoard
+from .engine import SearchBot
+from .hard_bot import HardAIBot
+from .medium_bot import MediumAIBot
+from app.services.game_logic import (
+    BitBoard,
+    BoardGeometry,
+    BoardTables,
+    board_tables,
+    geometry_of,
+)
+from app.core.constants import PLAYER_O, PLAYER_X
+
+from app.core.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+# Cell codes of the int8 position arrays
+BATCH_EMPTY: int = 0
+BATCH_X: int = 1
+BATCH_O: int = 2
+_CELL_CODES: Dict[str, int] = {PLAYER_X: BATCH_X, PLAYER_O: BATCH_O}
+
+# Rows evaluated per chunk, so that arrays of millions of positions never need
+# more than a few tens of MB of scratch space
+BATCH_EVAL_CHUNK_SIZE: int = 1 << 16
+
+
+def _build_window_incidence(tables: BoardTables) -> np.ndarray:
+    """[cell, window] = 1 where the flat cell r * cols + c lies in the window."""
+    incidence = np.zeros((tables.cell_count, len(tables.windows)), dtype=np.float32)
+    for index, window in enumerate(tables.windows):
+        for r, c in window:
+            incidence[r * tables.cols + c, index] = 1.0
+    return incidence
+
+
+# (window incidence, bitboard bit index of every flat cell) per geometry, built on first use
+_array_tables: Dict[BoardGeometry, Tuple[np.ndarray, np.ndarray]] = {}
+
+
+def _array_tables_for(tables: BoardTables) -> Tuple[np.ndarray, np.ndarray]:
+    entry = _array_tables.get(tables.geometry)
+    if entry is None:
+        cell_bit_index = np.array(
+            [
+                r * tables.row_stride + c
+                for r in range(tables.rows)
+                for c in range(tables.cols)
+            ],
+            dtype=np.uint64,
+        )
+        entry = _array_tables[tables.geometry] = (
+            _build_window_incidence(tables),
+            cell_bit_index,
+        )
+    return entry
+
+
+def boards_to_array(
+    boards: Sequence[GameLogicBoard], geometry: Optional[BoardGeometry] = None
+) -> np.ndarray:
+    """Stacks list-of-lists boards into an (N, rows, cols) int8 array."""
+    if geometry is None and boards:
+        geometry = geometry_of(boards[0])
+    tables = board_tables(geometry)
+    array = np.zeros((len(boards), tables.rows, tables.cols), dtype=np.int8)
+    for i, board in enumerate(boards):
+        for r in range(tables.rows):
+            for c in range(tables.cols):
+                code = _CELL_CODES.get(board[r][c])
+                if code is not None:
+                    array[i, r, c] = code
+    return array
+
+
+def positions_to_array(
+    positions: Sequence[BitBoard], geometry: Optional[BoardGeometry] = None
+) -> np.ndarray:
+    """Stacks BitBoards into an (N, rows, cols) int8 array straight from their bits."""
+    tables = positions[0].tables if positions else board_tables(geometry)
+    if tables.rows * tables.row_stride > 64:
+        # Too many bits for uint64 lanes; go through the list-of-lists form
+        return boards_to_array(
+            [position.to_board() for position in positions], tables.geometry
+        )
+    _, cell_bit_index = _array_tables_for(tables)
+    x_bits = np.array([position.x_bits for position in positions], dtype=np.uint64)
+    o_bits = np.array([position.o_bits for position in positions], dtype=np.uint64)
+    one = np.uint64(1)
+    x_cells = (x_bits[:, None] >> cell_bit_index[None, :]) & one
+    o_cells = (o_bits[:, None] >> cell_bit_index[None, :]) & one
+    flat = x_cells.astype(np.int8) * BATCH_X + o_cells.astype(np.int8) * BATCH_O
+    return flat.reshape(len(positions), tables.rows, tables.cols)
+
+
+class BatchEvaluator:
+    """
+    The window heuristic of a SearchBot over arrays of positions.
+
+    Built from the same pieces as WindowEvaluator: window_score tabulated per
+    (ai_count, opponent_count) pair, plus optional cell_weights[r][c] for each
+    piece (negated for the opponent's). Player-independent: evaluate() takes the
+    side whose perspective the scores are from.
+    """
+
+    def __init__(
+        self,
+        window_score: Callable[[int, int, int], int],
+        cell_weights: Optional[Sequence[Sequence[int]]] = None,
+        geometry: Optional[BoardGeometry] = None,
+    ):
+        self.tables = board_tables(geometry)
+        connect_n = self.tables.connect_n
+        self._window_incidence, _ = _array_tables_for(self.tables)
+        table = np.zeros((connect_n + 1, connect_n + 1), dtype=np.int64)
+        for ai in range(connect_n + 1):
+            for opp in range(connect_n + 1 - ai):
+                table[ai, opp] = window_score(ai, opp, connect_n - ai - opp)
+        self._flat_table = table.reshape(-1)
+        self._cell_weights = (
+            np.array(cell_weights, dtype=np.int64).reshape(-1)
+            if cell_weights is not None
+            else np.zeros(self.tables.cell_count, dtype=np.int64)
+        )
+
+    @classmethod
+    def for_bot(cls, bot: SearchBot) -> "BatchEvaluator":
+        return cls(bot._evaluate_counts, bot.cell_weights, bot.geometry)
+
+    def evaluate(
+        self,
+        positions: np.ndarray,
+        player: str,
+        chunk_size: int = BATCH_EVAL_CHUNK_SIZE,
+    ) -> np.ndarray:
+        """(N,) int64 scores of an (N, rows, cols) int8 array, from player's side."""
+        flat = positions.reshape(len(positions), self.tables.cell_count)
+        incidence = self._window_incidence
+        stride = self.tables.connect_n + 1
+        ai_code = _CELL_CODES[player]
+        opponent_code = BATCH_O if ai_code == BATCH_X else BATCH_X
+        scores = np.empty(len(flat), dtype=np.int64)
+        for start in range(0, len(flat), chunk_size):
+            chunk = flat[start : start + chunk_size]
+            ai_cells = chunk == ai_code
+            opponent_cells = chunk == opponent_code
+            # Counts are small integers, so the float32 product is exact
+            ai_counts = (ai_cells.astype(np.float32) @ incidence).astype(np.intp)
+            opponent_counts = (opponent_cells.astype(np.float32) @ incidence).astype(
+                np.intp
+            )
+            window_scores = self._flat_table[ai_counts * stride + opponent_counts]
+            scores[start : start + chunk_size] = (
+                window_scores.sum(axis=1)
+                + ai_cells @ self._cell_weights
+                - opponent_cells @ self._cell_weights
+            )
+        return scores
+
+
+# One evaluator per bot class and geometry per process; the tables do not depend on the piece
+_evaluators: Dict[Tuple[type, BoardGeometry], BatchEvaluator] = {}
+
+
+def get_batch_evaluator(
+    bot_class: type, geometry: Optional[BoardGeometry] = None
+) -> BatchEvaluator:
+    geometry = board_tables(geometry).geometry  # None and the default share one
+    evaluator = _evaluators.get((bot_class, geometry))
+    if evaluator is None:
+        evaluator = BatchEvaluator.for_bot(
+            bot_class(PLAYER_X, search_depth=1, geometry=geometry)
+        )
+        _evaluators[(bot_class, geometry)] = evaluator
+    return evaluator
+
+
+# --- Throughput check ---
+
+BATCH_EVAL_BOTS: Dict[str, type] = {"medium": MediumAIBot, "hard": HardAIBot}
+
+
+def random_positions(
+    count: int, seed: int = 0, geometry: Optional[BoardGeometry] = None
+) -> List[BitBoard]:
+    """count positions after 0 to 40 random plies (games that end early stop there)."""
+    rng = random.Random(seed)
+    positions = []
+    for _ in range(count):
+        position = BitBoard(geometry)
+        player = PLAYER_X
+        for _ in range(rng.randint(0, 40)):
+            moves = position.valid_moves()
+            if (
+                not moves
+                or position.check_win(PLAYER_X)
+                or position.check_win(PLAYER_O)
+            ):
+                break
+            position.apply_move(*rng.choice(moves), player)
+            player = PLAYER_O if player == PLAYER_X else PLAYER_X
+        positions.append(position)
+    return positions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare batched and per-position evaluation."
+    )
+    parser.add_argument("--bot", choices=sorted(BATCH_EVAL_BOTS), default="hard")
+    parser.add_argument("--positions", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    bot_class = BATCH_EVAL_BOTS[args.bot]
+    positions = random_positions(args.positions, args.seed)
+    started = time.perf_counter()
+    array = positions_to_array(positions)
+    convert_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    get_batch_evaluator(bot_class).evaluate(array, PLAYER_X)
+    batch_seconds = time.perf_counter() - started
+
+    # The per-position path is the bot's own full evaluation
+    bot = bot_class(PLAYER_X, search_depth=1)
+    sample = positions[: min(len(positions), 20000)]
+    started = time.perf_counter()
+    for position in sample:
+        bot._evaluator.reset(position)
+    scalar_seconds = time.perf_counter() - started
+
+    logger.info(
+        f"{bot_class.__name__}: {len(positions)} positions, "
+        f"batched {len(positions) / batch_seconds:.0f} positions/s "
+        f"(+{convert_seconds:.2f}s conversion), "
+        f"per position {len(sample) / scalar_seconds:.0f} positions/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# backend/app/services/ai/benchmark.py
+"""
+Search benchmark: nodes searched and time per move at fixed depths, with and
+without move ordering, over a reproducible set of midgame positions.
+
+    python -m app.services.ai.benchmark --bot hard --depths 3 4 5 --positions 12
+"""
+import argparse
+import random
+from typing import Dict, List, NamedTuple, Tuple
+
+from .engine import SearchBot, find_winning_moves
+from .hard_bot import HardAIBot
+from .medium_bot import MediumAIBot
+from app.services.game_logic import BitBoard
+from app.core.constants import PLAYER_O, PLAYER_X
+
+from app.core.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+BENCHMARK_BOTS: Dict[str, type] = {"medium": MediumAIBot, "hard": HardAIBot}
+
+
+class BenchmarkResult(NamedTuple):
+    depth: int
+    move_ordering: bool
+    nodes: int
+    seconds: float
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+
+def benchmark_positions(count: int, seed: int = 0) -> List[Tuple[BitBoard, str]]:
+    """
+    count (position, side to move) pairs reached by 4 to 14 random plies, skipping
+    any where the side to move has a forced win or block (no search happens there).
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        position = BitBoard()
+        player = PLAYER_X
+        for _ in range(rng.randint(4, 14)):
+            position.apply_move(*rng.choice(position.valid_moves()), player)
+            if position.check_win(player):
+                break
+            player = PLAYER_O if player == PLAYER_X else PLAYER_X
+        else:
+            opponent = PLAYER_O if player == PLAYER_X else PLAYER_X
+            if not find_winning_moves(position, player) and not find_winning_moves(
+                position, opponent
+            ):
+                positions.append((position, player))
+    return positions
+
+
+def run_search_benchmark(
+    bot_class: type,
+    positions: List[Tuple[BitBoard, str]],
+    depth: int,
+    move_ordering: bool = True,
+) -> BenchmarkResult:
+    """Searches every position to depth with a fresh bot and sums nodes and time."""
+    nodes = 0
+    seconds = 0.0
+    for position, player in positions:
+        bot: SearchBot = bot_class(player, search_depth=depth)
+        bot.move_ordering = move_ordering
+        if isinstance(bot, HardAIBot):
+            bot.endgame_max_empty_cells = 0  # Measure the search, not the solver
+        _, stats = bot.get_move(position.to_board(), return_stats=True)
+        seconds += stats.elapsed_seconds
+        nodes += stats.nodes
+    return BenchmarkResult(depth, move_ordering, nodes, seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the alpha-beta search.")
+    parser.add_argument("--bot", choices=sorted(BENCHMARK_BOTS), default="hard")
+    parser.add_argument("--depths", type=int, nargs="+", default=[3, 4, 5])
+    parser.add_argument("--positions", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    bot_class = BENCHMARK_BOTS[args.bot]
+    positions = benchmark_positions(args.positions, args.seed)
+    logger.info(f"{bot_class.__name__}, {len(positions)} positions (seed {args.seed})")
+    for depth in args.depths:
+        unordered = run_search_benchmark(
+            bot_class, positions, depth, move_ordering=False
+        )
+        ordered = run_search_benchmark(bot_class, positions, depth, move_ordering=True)
+        logger.info(
+            f"depth {depth}: {unordered.nodes} -> {ordered.nodes} nodes "
+            f"({100 * (1 - ordered.nodes / unordered.nodes):.0f}% fewer), "
+            f"{unordered.seconds:.2f}s -> {ordered.seconds:.2f}s, "
+            f"{ordered.nodes_per_second:.0f} nodes/s ordered"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,18 @@
 # backend/app/services/ai/easy_bot.py
-import random
 from typing import Tuple, List, Optional
 
 from .base_bot import BaseBot, GameLogicBoard
 from app.services.game_logic import (  # Import necessary functions from game_logic
+    BoardGeometry,
     is_valid_move,
     apply_move as service_apply_move,  # To avoid confusion if we had a local apply_move
+    undo_move as service_undo_move,
     check_win
 )
 from app.core.constants import (
-    COLS,
     PLAYER_X,
     PLAYER_O,
     EMPTY_CELL,
-    ROWS,
 )
 
 from app.core.logging_config import setup_logger
@@ -22,49 +21,46 @@ logger = setup_logger(__name__)
 
 
 class EasyAIBot(BaseBot):
-    def __init__(self, player_piece: str):
-        super().__init__(player_piece)
+    def __init__(
+        self,
+        player_piece: str,
+        seed: Optional[int] = None,
+        geometry: Optional[BoardGeometry] = None,
+    ):
+        super().__init__(player_piece, seed, geometry)
         # self.opponent_piece = PLAYER_O if self.player_piece == PLAYER_X else PLAYER_X
 
     def _get_all_valid_moves(self, board: GameLogicBoard) -> List[Tuple[int, str]]:
         valid_moves = []
-        for r in range(ROWS):
+        for r in range(len(board)):
             if is_valid_move(board, r, "L"):
                 valid_moves.append((r, "L"))
             if is_valid_move(board, r, "R"):  # Check right side independently
                 valid_moves.append((r, "R"))
         return valid_moves
 
-    def get_move(self, board: GameLogicBoard) -> Optional[Tuple[int, str]]:
+    def _choose_move(self, board: GameLogicBoard) -> Optional[Tuple[int, str]]:
         valid_moves = self._get_all_valid_moves(board)
         if not valid_moves:
             return None
 
         # 1. Immediate winning move
+        scratch_board = [row_list[:] for row_list in board]  # One copy, reused per move
         for move in valid_moves:
             row, side = move
-            temp_board = [row_list[:] for row_list in board]
-            placed_coords = None
-            temp_target_row = temp_board[row]
-            if side == "L":
-                for c in range(COLS):
-                    if temp_target_row[c] == EMPTY_CELL:
-                        temp_target_row[c] = self.player_piece
-                        placed_coords = (row, c)
-                        break
-            else:  # "R"
-                for c in range(COLS - 1, -1, -1):
-                    if temp_target_row[c] == EMPTY_CELL:
-                        temp_target_row[c] = self.player_piece
-                        placed_coords = (row, c)
-                        break
-            if placed_coords and check_win(
-                temp_board, self.player_piece, placed_coords
-            ):
+            placed_coords = service_apply_move(
+                scratch_board, row, side, self.player_piece
+            )
+            wins = placed_coords is not None and check_win(
+                scratch_board, self.player_piece, placed_coords, self.geometry
+            )
+            if placed_coords:
+                service_undo_move(scratch_board, placed_coords)
+            if wins:
                 return move  # Take winning move
 
         # 2. No block logic—just random
-        return random.choice(valid_moves)
+        return self.rng.choice(valid_moves)
 
 if __name__ == "__main__":
     from app.services.game_logic import print_board, create_board
@@ -0,0 +1,251 @@
+# backend/app/services/ai/endgame.py
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .base_bot import SearchTimeout
+
+from app.services.game_logic import (
+    Board,
+    BitBoard,
+    BoardGeometry,
+    board_tables,
+)
+from app.core.constants import BOARD_MAX_COLS, BOARD_MAX_ROWS, PLAYER_O, PLAYER_X
+
+from app.core.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+Move = Tuple[int, str]
+
+ENDGAME_WIN: int = 1
+ENDGAME_DRAW: int = 0
+ENDGAME_LOSS: int = -1
+
+# Scores are from the side to move: MATE_SCORE - plies for a win in that many plies,
+# -(MATE_SCORE - plies) for a loss, 0 for a draw. Maximising them picks the fastest
+# win and, when lost, the longest defence. Above the plies of a game on any geometry.
+MATE_SCORE: int = BOARD_MAX_ROWS * BOARD_MAX_COLS + 1
+
+_EXACT, _LOWER, _UPPER = 0, 1, 2
+
+
+class EndgameResult(NamedTuple):
+    outcome: int  # ENDGAME_WIN / ENDGAME_DRAW / ENDGAME_LOSS for the player asked about
+    distance: int  # Plies until the game ends with best play on both sides
+    best_move: Optional[Move]  # None only when the board is already full
+
+
+def _wins_through(bits: int, windows: Tuple[int, ...], window_masks: List[int]) -> bool:
+    """Whether bits contain a full window among windows (a cell's cell_windows entry)."""
+    for index in windows:
+        mask = window_masks[index]
+        if bits & mask == mask:
+            return True
+    return False
+
+
+class EndgameSolver:
+    """
+    Exact win/loss/draw solver for positions with few empty cells.
+
+    Negamax with alpha-beta over the bitboard, memoised in its own table keyed
+    by the two piece bitboards packed into one int, plus a bit for the side to
+    move: callers may ask about either side in any position, so the side does
+    not follow from the piece counts. Only the player who just moved can have
+    won, so each node checks just the windows through the placed cell.
+
+    The memo survives between calls (results don't depend on history) and is
+    cleared once it holds max_entries positions. A solve can be given a
+    deadline, past which it raises SearchTimeout; everything memoised up to
+    then stays valid.
+
+    A solver solves positions of one geometry (the default one unless given),
+    so that its memo keys cannot collide across board sizes.
+    """
+
+    def __init__(
+        self, max_entries: int = 1 << 20, geometry: Optional[BoardGeometry] = None
+    ):
+        self.max_entries = max_entries
+        self.tables = board_tables(geometry)
+        # The two bitboards are packed side by side into one memo key
+        self._key_shift = self.tables.rows * self.tables.row_stride
+        self._memo: Dict[int, Tuple[int, int]] = {}
+        self.nodes = 0
+        self._deadline: Optional[float] = None
+
+    def clear(self):
+        self._memo.clear()
+
+    def solve(
+        self, position: BitBoard, player: str, deadline: Optional[float] = None
+    ) -> EndgameResult:
+        """Solves position with player to move. deadline is a time.monotonic() value."""
+        if position.tables is not self.tables:
+            raise ValueError(
+                f"Position geometry {position.geometry} is not the solver's {self.tables.geometry}"
+            )
+        if len(self._memo) > self.max_entries:
+            self._memo.clear()
+        opponent = PLAYER_O if player == PLAYER_X else PLAYER_X
+        position = position.copy()
+        self.nodes = 0
+        self._deadline = deadline
+
+        best_move = None
+        best_score = -MATE_SCORE - 1
+        alpha, beta = -MATE_SCORE, MATE_SCORE
+        cell_windows, window_masks = self.tables.cell_windows, self.tables.window_masks
+        for row, side in position.valid_moves():
+            placed = position.make_move(row, side, player)
+            if _wins_through(
+                position.bits_for(player),
+                cell_windows[placed.row][placed.col],
+                window_masks,
+            ):
+                score = MATE_SCORE - 1
+            else:
+                score = -self._negamax(position, opponent, player, 2, -beta, -alpha)
+            position.undo_move(placed)
+            if score > best_score:
+                best_score, best_move = score, (row, side)
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+        if best_move is None:  # Full board: nothing left to play
+            return EndgameResult(ENDGAME_DRAW, 0, None)
+        if best_score > 0:
+            return EndgameResult(ENDGAME_WIN, MATE_SCORE - best_score, best_move)
+        if best_score < 0:
+            return EndgameResult(ENDGAME_LOSS, MATE_SCORE + best_score, best_move)
+        # A draw always runs until the board is full
+        return EndgameResult(ENDGAME_DRAW, empty_cell_count(position), best_move)
+
+    def _negamax(
+        self,
+        position: BitBoard,
+        player: str,
+        opponent: str,
+        ply: int,
+        alpha: int,
+        beta: int,
+    ) -> int:
+        """Score for player to move, at ply plies from the root (the next move is ply)."""
+        self.nodes += 1
+        if (
+            self._deadline is not None
+            and not self.nodes & 0x3FF
+            and time.monotonic() >= self._deadline
+        ):
+            raise SearchTimeout()
+        tables = self.tables
+        occupied = position.x_bits | position.o_bits
+        if occupied == tables.full_board_mask:
+            return 0
+
+        # Mate-distance bounds: nothing here can beat a win on the next move
+        alpha = max(alpha, -(MATE_SCORE - ply - 1))
+        beta = min(beta, MATE_SCORE - ply)
+        if alpha >= beta:
+            return alpha
+
+        key = ((position.x_bits << self._key_shift) | position.o_bits) << 1 | (
+            player == PLAYER_O
+        )
+        entry = self._memo.get(key)
+        if entry is not None:
+            # Stored relative to this node, so they are independent of ply
+            stored, flag = entry
+            score = stored - ply if stored > 0 else stored + ply if stored < 0 else 0
+            if flag == _EXACT:
+                return score
+            if flag == _LOWER and score >= beta:
+                return score
+            if flag == _UPPER and score <= alpha:
+                return score
+
+        moves: List[Move] = position.valid_moves()
+        # A win on the spot ends the search of this node
+        cell_windows, window_masks = tables.cell_windows, tables.window_masks
+        for row, side in moves:
+            placed = position.make_move(row, side, player)
+            wins = _wins_through(
+                position.bits_for(player),
+                cell_windows[placed.row][placed.col],
+                window_masks,
+            )
+            position.undo_move(placed)
+            if wins:
+                score = MATE_SCORE - ply
+                self._memo[key] = (score + ply, _EXACT)
+                return score
+
+        alpha_orig = alpha
+        best_score = -MATE_SCORE
+        for row, side in moves:
+            placed = position.make_move(row, side, player)
+            score = -self._negamax(position, opponent, player, ply + 1, -beta, -alpha)
+            position.undo_move(placed)
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if best_score <= alpha_orig:
+            flag = _UPPER
+        elif best_score >= beta:
+            flag = _LOWER
+        else:
+            flag = _EXACT
+        stored = (
+            best_score + ply
+            if best_score > 0
+            else best_score - ply
+            if best_score < 0
+            else 0
+        )
+        self._memo[key] = (stored, flag)
+        return best_score
+
+
+# Process-wide solver per geometry so the memo is reused across moves and games
+_default_solver = EndgameSolver()
+_solvers: Dict[BoardGeometry, EndgameSolver] = {
+    _default_solver.tables.geometry: _default_solver
+}
+
+
+def get_endgame_solver(geometry: Optional[BoardGeometry] = None) -> EndgameSolver:
+    if geometry is None:
+        return _default_solver
+    solver = _solvers.get(geometry)
+    if solver is None:
+        solver = _solvers[geometry] = EndgameSolver(geometry=geometry)
+    return solver
+
+
+def empty_cell_count(position: BitBoard) -> int:
+    return position.tables.cell_count - (position.x_bits | position.o_bits).bit_count()
+
+
+def solve_endgame(
+    board: Board,
+    player: str,
+    solver: Optional[EndgameSolver] = None,
+    geometry: Optional[BoardGeometry] = None,
+) -> EndgameResult:
+    """
+    Library entry point: exact result of board with player to move.
+
+    outcome is from player's point of view, distance is the number of plies to
+    the end of the game under best play, and best_move is the move that gets
+    there (fastest win, or longest defence when lost). Cost grows quickly with
+    the number of empty cells, so callers should gate on empty_cell_count.
+    The board is read in the solver's geometry (geometry's, without a solver).
+    """
+    if solver is None:
+        solver = get_endgame_solver(geometry)
+    return solver.solve(BitBoard.from_board(board, solver.tables.geometry), player)
@@ -0,0 +1,715 @@
+# backend/app/services/ai/engine.py
+import math
+import time
+from abc import abstractmethod
+from typing import ClassVar, Dict, List, Optional, Sequence, Tuple
+
+from .eval_weights import EvalWeights, cell_weights_for, get_eval_weights, score_window
+from .base_bot import (
+    MOVE_SOURCE_FORCED,
+    MOVE_SOURCE_SEARCH,
+    BaseBot,
+    GameLogicBoard,
+    SearchStats,
+    SearchTimeout,
+)
+from .root_split import split_search_root
+from .transposition import (
+    TT_EXACT,
+    TT_LOWER_BOUND,
+    TT_UPPER_BOUND,
+    TranspositionTable,
+)
+from .window_eval import WindowEvaluator
+from app.services.game_logic import BitBoard, BoardGeometry
+from app.core.constants import BOARD_MAX_COLS, BOARD_MAX_ROWS, PLAYER_X, PLAYER_O
+
+from app.core.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+Move = Tuple[int, str]
+
+# Move ordering tiers, tried highest first; plain moves rank by their history score,
+# which stays far below these
+ORDER_TT_MOVE: int = 1 << 40
+ORDER_WIN: int = 1 << 39  # Completes a window for the mover
+# Fills the last cell of an opponent window holding connect_n - 1
+ORDER_BLOCK: int = 1 << 38
+ORDER_KILLER: int = 1 << 37  # Minus the killer slot
+# Below every history score: uncovers a cell that completes an opponent window
+ORDER_EXPOSES_THREAT: int = -1
+
+# Terminal scores, from the side to move: a win n plies from the root scores
+# MATE_SCORE - n and a loss -(MATE_SCORE - n), so faster wins and slower losses
+# rank higher. Far above any heuristic evaluation; a full board scores 0.
+MATE_SCORE: int = 1 << 40
+# No game, on any geometry, lasts more plies than the largest board has cells
+_MATE_THRESHOLD: int = MATE_SCORE - BOARD_MAX_ROWS * BOARD_MAX_COLS - 1
+
+# Aspiration re-searches widen the failing side this many times before opening it
+ASPIRATION_MAX_WIDENINGS: int = 2
+
+
+def is_mate_score(score: float) -> bool:
+    """Whether score is a forced win or loss rather than a heuristic estimate."""
+    return abs(score) >= _MATE_THRESHOLD
+
+
+def _score_to_tt(score: float, ply: int) -> float:
+    # Mate scores are stored relative to the node, so a transposition reached at
+    # another ply still reads the right distance
+    if score >= _MATE_THRESHOLD:
+        return score + ply
+    if score <= -_MATE_THRESHOLD:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score: float, ply: int) -> float:
+    if score >= _MATE_THRESHOLD:
+        return score - ply
+    if score <= -_MATE_THRESHOLD:
+        return score + ply
+    return score
+
+
+def find_winning_moves(position: BitBoard, player: str) -> List[Move]:
+    """Moves (in valid_moves order) that complete a line for player right away."""
+    winning_moves = []
+    for row, side in position.valid_moves():
+        placed = position.make_move(row, side, player)
+        if position.check_win(player):
+            winning_moves.append((row, side))
+        position.undo_move(placed)
+    return winning_moves
+
+
+def _completes_window(
+    windows: Sequence[int], counts: List[int], blockers: List[int], threat: int
+) -> bool:
+    """
+    Whether a piece on a cell completes one of its windows (the cell's entry of
+    cell_windows), given per-window counts; threat is connect_n - 1.
+    """
+    for index in windows:
+        if counts[index] == threat and not blockers[index]:
+            return True
+    return False
+
+
+class SearchBot(BaseBot):
+    """
+    Negamax alpha-beta over the bitboard shared by the Medium and Hard bots.
+
+    Subclasses supply only the name of their evaluation weights (WEIGHTS_NAME,
+    see eval_weights.py), an ASPIRATION_WINDOW to suit them and what to play
+    when the search returns nothing (_fallback_move); depth and time limits, and
+    weights other than the stored ones, are constructor arguments. The search
+    makes and unmakes moves in place on one BitBoard and keeps the leaf score
+    current through a WindowEvaluator, so the hot loop allocates nothing per node.
+
+    Every move after a node's first is probed with a null window (principal
+    variation search); iterative deepening starts each depth inside an
+    aspiration window around the previous score. Wins and losses score by their
+    distance from the root (MATE_SCORE).
+
+    Moves are ordered for alpha-beta (_order_moves): the transposition-table
+    move, then wins and blocks of connect_n - 1 windows, then the killer moves
+    of the ply, then the rest by history score. The search is deterministic;
+    self.rng only picks among root moves that score exactly the same (and
+    among forced wins or blocks).
+
+    With THREAT_EVAL, every node whose position holds a connect_n - 1 window is
+    first checked for threats on the cells the next pushes land on
+    (_scan_threats). A win on the next move, or two opponent threats that one
+    move cannot both stop, is scored exactly right there, leaves included, and
+    moves that uncover an opponent threat are tried last.
+    """
+
+    # Half-width of the aspiration window around the previous iteration's score,
+    # in evaluation units
+    ASPIRATION_WINDOW: ClassVar[int]
+    WEIGHTS_NAME: ClassVar[str]
+    THREAT_EVAL: ClassVar[bool] = False
+
+    def __init__(
+        self,
+        player_piece: str,
+        search_depth: int,
+        transposition_table: Optional[TranspositionTable] = None,
+        time_budget: Optional[float] = None,
+        root_workers: int = 1,
+        parallel_min_nodes: int = 0,
+        weights: Optional[EvalWeights] = None,
+        seed: Optional[int] = None,
+        geometry: Optional[BoardGeometry] = None,
+    ):
+        super().__init__(player_piece, seed, geometry)
+        self.weights = (
+            weights if weights is not None else get_eval_weights(self.WEIGHTS_NAME)
+        )
+        self.cell_weights = cell_weights_for(self.weights, self.geometry)
+        self.opponent_piece = PLAYER_O if self.player_piece == PLAYER_X else PLAYER_X
+        self.search_depth = search_depth
+        # Per-instance by default; pass a shared table to reuse results across games
+        self.transposition_table = (
+            transposition_table
+            if transposition_table is not None
+            else TranspositionTable()
+        )
+        # Think-time budget in seconds. When set, get_move deepens iteratively up to
+        # search_depth and returns the best move of the last depth that completed.
+        self.time_budget = time_budget
+        self.completed_depth = 0
+        self._deadline: Optional[float] = None
+        self._nodes_searched = 0
+        # Root moves are split across root_workers processes (see root_split.py) for
+        # depths expected to search at least parallel_min_nodes nodes; 1 = always serial
+        self.root_workers = root_workers
+        self.parallel_min_nodes = parallel_min_nodes
+        self._depth_nodes: Dict[int, int] = {}
+        # False keeps valid_moves() order (TT move still first); for benchmarks
+        self.move_ordering = True
+        # Threat-space checks at every node (see _scan_threats); for benchmarks too
+        self.threat_eval = self.THREAT_EVAL
+        self._root_depth = 0
+        self._killers: List[List[Optional[Move]]] = []
+        cell_count = self.tables.cell_count
+        self._history: List[List[int]] = [[0] * cell_count, [0] * cell_count]
+        self._reset_stats()
+        # Leaf scores are kept up to date move by move instead of rescanning every window
+        self._evaluator = WindowEvaluator(
+            self.player_piece, self._evaluate_counts, self.cell_weights, self.geometry
+        )
+
+    def _evaluate_counts(
+        self, ai_count: int, opponent_count: int, empty_count: int
+    ) -> int:
+        return score_window(
+            self.weights, ai_count, opponent_count, empty_count, self.tables.connect_n
+        )
+
+    @abstractmethod
+    def _fallback_move(self, valid_moves: List[Move]) -> Move:
+        """The move to play when the search returns none; valid_moves is never empty."""
+
+    def _reset_stats(self, source: str = MOVE_SOURCE_SEARCH):
+        """Zeroes the counters reported by get_move(..., return_stats=True)."""
+        self._move_source = source
+        self._nodes_searched = 0
+        self._leaf_evaluations = 0
+        self._tt_hits = 0
+        self._tt_misses = 0
+        self._cutoffs_by_ply = [0] * (self.search_depth + 1)
+        self._depth_seconds: List[float] = []
+        self._principal_variation: Tuple[Move, ...] = ()
+        self._root_score: Optional[float] = None
+        self._aspiration_researches = 0
+        self.completed_depth = 0
+
+    def _search_stats(self, elapsed_seconds: float) -> SearchStats:
+        cutoffs = list(self._cutoffs_by_ply)
+        while cutoffs and not cutoffs[-1]:
+            cutoffs.pop()
+        return SearchStats(
+            source=self._move_source,
+            elapsed_seconds=elapsed_seconds,
+            nodes=self._nodes_searched,
+            leaf_evaluations=self._leaf_evaluations,
+            tt_hits=self._tt_hits,
+            tt_misses=self._tt_misses,
+            cutoffs_by_ply=tuple(cutoffs),
+            completed_depth=self.completed_depth,
+            depth_seconds=tuple(self._depth_seconds),
+            principal_variation=self._principal_variation,
+            score=self._root_score,
+        )
+
+    def _add_stats(self, stats: SearchStats):
+        """Folds counters gathered elsewhere (a root-split worker) into this search."""
+        self._nodes_searched += stats.nodes
+        self._leaf_evaluations += stats.leaf_evaluations
+        self._tt_hits += stats.tt_hits
+        self._tt_misses += stats.tt_misses
+        for ply, cutoffs in enumerate(
+            stats.cutoffs_by_ply[: len(self._cutoffs_by_ply)]
+        ):
+            self._cutoffs_by_ply[ply] += cutoffs
+
+    def _principal_variation_from(
+        self, position: BitBoard, first_move: Move
+    ) -> Tuple[Move, ...]:
+        """first_move followed by the best moves stored in the transposition table."""
+        position = position.copy()
+        variation = [first_move]
+        player, opponent = self.player_piece, self.opponent_piece
+        position.make_move(*first_move, player)
+        maximizing_player = False
+        side_key = self.tables.zobrist_side_key
+        while len(variation) < self.completed_depth and not (
+            position.check_win(player) or position.is_full()
+        ):
+            player, opponent = opponent, player
+            key = position.zobrist_hash ^ (0 if maximizing_player else side_key)
+            # Peeked, so the walk does not count as TT probes
+            entry = self.transposition_table.peek(key)
+            if entry is None or entry.best_move is None:
+                break
+            if not position.is_valid_move(*entry.best_move):
+                break
+            variation.append(entry.best_move)
+            position.make_move(*entry.best_move, player)
+            maximizing_player = not maximizing_player
+        return tuple(variation)
+
+    def _reset_ordering(self):
+        """Forgets killers and history; called once per move, kept across deepening."""
+        self._killers = [[None, None] for _ in range(self.search_depth + 1)]
+        cell_count = self.tables.cell_count
+        self._history = [[0] * cell_count, [0] * cell_count]
+
+    def _scan_threats(
+        self, position: BitBoard, mover: str, ply: int
+    ) -> Tuple[Optional[float], Tuple[Move, ...]]:
+        """
+        One pass over the landing cells of every row (left_fill and right_fill,
+        where the next L and R push go) and the cells just behind them.
+
+        Returns (score, exposing). score is exact, or None if the threats decide
+        nothing yet: a win for mover on this move, or a loss on the next one when
+        the opponent can complete a window on two different landing cells, or on
+        a landing cell whose block uncovers another. exposing lists the moves
+        that uncover an opponent win behind the cell they fill.
+        """
+        evaluator = self._evaluator
+        if mover == self.player_piece:
+            own_counts, other_counts = evaluator.ai_counts, evaluator.opponent_counts
+        else:
+            own_counts, other_counts = evaluator.opponent_counts, evaluator.ai_counts
+        completes = _completes_window
+        cell_windows = self.tables.cell_windows
+        threat = self.tables.connect_n - 1
+        must_block = 0
+        unstoppable = False
+        exposing: List[Move] = []
+        for row_idx in range(len(position.left_fill)):
+            left, right = position.left_fill[row_idx], position.right_fill[row_idx]
+            if left > right:
+                continue  # Row full
+            row_windows = cell_windows[row_idx]
+            if completes(row_windows[left], own_counts, other_counts, threat) or (
+                right != left
+                and completes(row_windows[right], own_counts, other_counts, threat)
+            ):
+                return MATE_SCORE - ply - 1, ()
+            left_threat = completes(row_windows[left], other_counts, own_counts, threat)
+            right_threat = right != left and completes(
+                row_windows[right], other_counts, own_counts, threat
+            )
+            must_block += left_threat + right_threat
+            if left == right:
+                continue
+            # Filling a landing cell makes the next one inward playable
+            if completes(row_windows[left + 1], other_counts, own_counts, threat):
+                exposing.append((row_idx, "L"))
+                unstoppable |= left_threat
+            if completes(row_windows[right - 1], other_counts, own_counts, threat):
+                exposing.append((row_idx, "R"))
+                unstoppable |= right_threat
+        if must_block > 1 or unstoppable:
+            return -(MATE_SCORE - ply - 2), ()
+        return None, tuple(exposing)
+
+    def _order_moves(
+        self,
+        position: BitBoard,
+        player: str,
+        ply: int,
+        tt_move: Optional[Move],
+        exposing: Sequence[Move] = (),
+    ) -> List[Move]:
+        """
+        Valid moves for player, best candidates first. Needs the evaluator in sync.
+        Moves in exposing (from _scan_threats) go last unless they block a threat.
+        """
+        moves = position.valid_moves()
+        if not self.move_ordering:
+            if tt_move in moves:
+                moves.remove(tt_move)
+                moves.insert(0, tt_move)
+            return moves
+
+        evaluator = self._evaluator
+        if player == self.player_piece:
+            own_counts, other_counts = evaluator.ai_counts, evaluator.opponent_counts
+        else:
+            own_counts, other_counts = evaluator.opponent_counts, evaluator.ai_counts
+        killers = self._killers[ply] if 0 <= ply < len(self._killers) else ()
+        history = self._history[0 if player == PLAYER_X else 1]
+        left_fill, right_fill = position.left_fill, position.right_fill
+        cell_windows = self.tables.cell_windows
+        cols = self.tables.cols
+        threat = self.tables.connect_n - 1
+
+        scored = []
+        for move in moves:
+            if move == tt_move:
+                scored.append((ORDER_TT_MOVE, move))
+                continue
+            row_idx, side = move
+            col_idx = left_fill[row_idx] if side == "L" else right_fill[row_idx]
+            score = 0
+            for index in cell_windows[row_idx][col_idx]:
+                own, other = own_counts[index], other_counts[index]
+                if own == threat and not other:
+                    score = ORDER_WIN
+                    break
+                if other == threat and not own:
+                    score = ORDER_BLOCK
+            if not score:
+                if move in exposing:
+                    score = ORDER_EXPOSES_THREAT
+                elif move in killers:
+                    score = ORDER_KILLER - killers.index(move)
+                else:
+                    score = history[row_idx * cols + col_idx]
+            scored.append((score, move))
+        # Stable, so equal scores keep valid_moves() order
+        scored.sort(key=lambda entry: entry[0], reverse=True)
+        return [move for _, move in scored]
+
+    def _record_cutoff(
+        self, move: Move, row_idx: int, col_idx: int, player: str, depth: int
+    ):
+        ply = self._root_depth - depth
+        if 0 <= ply < len(self._cutoffs_by_ply):
+            self._cutoffs_by_ply[ply] += 1
+        if 0 <= ply < len(self._killers):
+            killers = self._killers[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
+        self._history[0 if player == PLAYER_X else 1][
+            row_idx * self.tables.cols + col_idx
+        ] += (depth * depth)
+
+    def _check_deadline(self):
+        # Polling the clock on every node is measurable; every 256 nodes is plenty
+        self._nodes_searched += 1
+        if (
+            self._deadline is not None
+            and not self._nodes_searched & 0xFF
+            and time.monotonic() >= self._deadline
+        ):
+            raise SearchTimeout()
+
+    def negamax(
+        self,
+        position: BitBoard,
+        depth: int,
+        alpha: float,
+        beta: float,
+        ply: int,
+    ) -> float:
+        """
+        Score of position for the side to move (the bot on even plies), searched
+        depth plies deeper with fail-soft alpha-beta and principal variation search.
+        """
+        self._check_deadline()
+        if ply & 1:
+            mover, previous_mover = self.opponent_piece, self.player_piece
+        else:
+            mover, previous_mover = self.player_piece, self.opponent_piece
+        # Only the side that just moved can have completed a line
+        if position.check_win(previous_mover):
+            return -(MATE_SCORE - ply)
+        if position.is_full():
+            return 0
+        exposing: Tuple[Move, ...] = ()
+        if self.threat_eval and self._evaluator.threat_windows:
+            threat_score, exposing = self._scan_threats(position, mover, ply)
+            if threat_score is not None:
+                return threat_score
+        if depth == 0:
+            self._leaf_evaluations += 1
+            return -self._evaluator.score if ply & 1 else self._evaluator.score
+
+        # Mate-distance pruning: nothing here beats a win on the next move or
+        # loses faster than the opponent's next move
+        alpha = max(alpha, -(MATE_SCORE - ply))
+        beta = min(beta, MATE_SCORE - ply - 1)
+        if alpha >= beta:
+            return alpha
+
+        # Transposition table: the side to move is folded into the key
+        tt_key = position.zobrist_hash ^ (
+            self.tables.zobrist_side_key if ply & 1 else 0
+        )
+        tt_entry = self.transposition_table.probe(tt_key)
+        tt_move = None
+        if tt_entry is not None:
+            tt_move = tt_entry.best_move
+            if tt_entry.depth >= depth:
+                tt_score = _score_from_tt(tt_entry.score, ply)
+                if tt_entry.flag == TT_EXACT:
+                    return tt_score
+                if tt_entry.flag == TT_LOWER_BOUND:
+                    alpha = max(alpha, tt_score)
+                else:
+                    beta = min(beta, tt_score)
+                if alpha >= beta:
+                    return tt_score
+        alpha_orig = alpha
+
+        evaluator = self._evaluator
+        best_score = -math.inf
+        best_move = None
+        for move in self._order_moves(position, mover, ply, tt_move, exposing):
+            placed = position.make_move(*move, mover)
+            evaluator.place(placed.row, placed.col, mover)
+            if best_move is None:
+                score = -self.negamax(position, depth - 1, -beta, -alpha, ply + 1)
+            else:
+                # Principal variation search: prove the move is no better than alpha
+                # with a null window, and only search it properly if that fails
+                score = -self.negamax(position, depth - 1, -alpha - 1, -alpha, ply + 1)
+                if alpha < score < beta:
+                    score = -self.negamax(position, depth - 1, -beta, -alpha, ply + 1)
+            evaluator.remove(placed.row, placed.col, mover)
+            position.undo_move(placed)
+            if score > best_score:
+                best_score, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        self._record_cutoff(move, placed.row, placed.col, mover, depth)
+                        break
+
+        if best_score <= alpha_orig:
+            tt_flag = TT_UPPER_BOUND
+        elif best_score >= beta:
+            tt_flag = TT_LOWER_BOUND
+        else:
+            tt_flag = TT_EXACT
+        self.transposition_table.store(
+            tt_key, depth, _score_to_tt(best_score, ply), tt_flag, best_move
+        )
+        return best_score
+
+    def _choose_move(self, board: GameLogicBoard) -> Optional[Move]:
+        # Convert once at the boundary; the whole search runs on the bitboard form
+        position = BitBoard.from_board(board, self.geometry)
+        self._reset_stats(MOVE_SOURCE_FORCED)
+        valid_moves = position.valid_moves()
+        if not valid_moves:
+            return None
+        if len(valid_moves) == 1:
+            return valid_moves[0]
+
+        # 1. Check for AI's immediate winning move
+        winning_moves = find_winning_moves(position, self.player_piece)
+        if winning_moves:
+            return self.rng.choice(winning_moves)
+
+        # 2. Check to block opponent's immediate winning move
+        # For each spot the opponent could play to win, AI plays there first.
+        opponent_winning_moves = find_winning_moves(position, self.opponent_piece)
+        if opponent_winning_moves:
+            return self.rng.choice(opponent_winning_moves)
+
+        # 3. If no immediate win/loss, use Minimax
+        self._move_source = MOVE_SOURCE_SEARCH
+        table = self.transposition_table
+        if self.seed is not None and table.shared_name is None:
+            # Start every move from an empty table so the stats depend only on the board
+            table.clear()
+        hits_before, misses_before = table.hits, table.misses
+        table.new_search()
+        self._depth_nodes = {}
+        self._reset_ordering()
+        self._evaluator.reset(position)
+        exposing: Tuple[Move, ...] = ()
+        if self.threat_eval and self._evaluator.threat_windows:
+            _, exposing = self._scan_threats(position, self.player_piece, 0)
+        root_moves = self._order_moves(position, self.player_piece, 0, None, exposing)
+        if self.time_budget is None:
+            best_move, _ = self._search_depth(position, root_moves, self.search_depth)
+        else:
+            best_move = self._iterative_deepening(position, root_moves)
+        self._tt_hits += table.hits - hits_before
+        self._tt_misses += table.misses - misses_before
+        if best_move:
+            self._principal_variation = self._principal_variation_from(
+                position, best_move
+            )
+        return best_move if best_move else self._fallback_move(valid_moves)
+
+    def _search_root(
+        self,
+        position: BitBoard,
+        root_moves: List[Move],
+        depth: int,
+        alpha: float = -math.inf,
+        beta: float = math.inf,
+    ) -> Tuple[List[Move], float]:
+        """
+        Searches root_moves in the given order and returns every move sharing the
+        best score (in that order) with the score. After the first move, each one
+        is first tested with a null window one below the best score so far: scores
+        are integers, so only a move that ties or beats it is searched in full and
+        ties come back exact. A score outside (alpha, beta) is only a bound.
+        """
+        best_score = -math.inf
+        best_moves: List[Move] = []
+        # A timed-out search unwinds without unmaking, so work on a private copy
+        position = position.copy()
+        self._evaluator.reset(position)
+        self._root_depth = depth
+
+        for move_action in root_moves:
+            placed = position.make_move(
+                *move_action, self.player_piece
+            )  # AI makes this move
+            self._evaluator.place(placed.row, placed.col, self.player_piece)
+            if not best_moves:
+                score = -self.negamax(position, depth - 1, -beta, -alpha, 1)
+            else:
+                floor = max(alpha, best_score - 1)
+                score = -self.negamax(position, depth - 1, -floor - 1, -floor, 1)
+                if floor < score < beta:
+                    score = -self.negamax(position, depth - 1, -beta, -floor, 1)
+            self._evaluator.remove(placed.row, placed.col, self.player_piece)
+            position.undo_move(placed)
+            if score > best_score:
+                best_score = score
+                best_moves = [move_action]
+            elif score == best_score:
+                best_moves.append(move_action)
+            if best_score >= beta:
+                break  # Fails high; the caller widens the window
+        return best_moves, best_score
+
+    def _estimated_nodes(self, depth: int, root_move_count: int) -> float:
+        """
+        Expected size of a depth search: the last depth's node count times the
+        growth seen between the two before it, or alpha-beta's best case
+        b^(depth/2) when nothing has been measured yet.
+        """
+        previous = self._depth_nodes.get(depth - 1)
+        if not previous:
+            return root_move_count ** math.ceil(depth / 2)
+        before = self._depth_nodes.get(depth - 2)
+        growth = previous / before if before else root_move_count
+        return previous * growth
+
+    def _search_window(
+        self,
+        position: BitBoard,
+        root_moves: List[Move],
+        depth: int,
+        alpha: float,
+        beta: float,
+    ) -> Tuple[List[Move], float]:
+        """_search_root, split across worker processes when the search is big enough."""
+        if (
+            self.root_workers > 1
+            and len(root_moves) > 1
+            and self._estimated_nodes(depth, len(root_moves)) >= self.parallel_min_nodes
+        ):
+            best_moves, best_score, worker_stats = split_search_root(
+                self, position, root_moves, depth, self.root_workers, alpha, beta
+            )
+            self._add_stats(worker_stats)
+            return best_moves, best_score
+        return self._search_root(position, root_moves, depth, alpha, beta)
+
+    def _search_depth(
+        self,
+        position: BitBoard,
+        root_moves: List[Move],
+        depth: int,
+        expected_score: Optional[float] = None,
+    ) -> Tuple[Optional[Move], float]:
+        """
+        One full-depth root search. Given an expected_score it starts inside an
+        aspiration window of ASPIRATION_WINDOW either side of it; a result outside
+        the window is searched again with that side widened fourfold, and opened
+        up completely after ASPIRATION_MAX_WIDENINGS tries.
+        """
+        started = time.perf_counter()
+        nodes_before = self._nodes_searched
+        alpha, beta = -math.inf, math.inf
+        window = self.ASPIRATION_WINDOW
+        if expected_score is not None and not is_mate_score(expected_score):
+            alpha, beta = expected_score - window, expected_score + window
+        widenings = 0
+        while True:
+            best_moves, best_score = self._search_window(
+                position, root_moves, depth, alpha, beta
+            )
+            failed_low = best_score <= alpha and alpha != -math.inf
+            failed_high = best_score >= beta and beta != math.inf
+            if not (failed_low or failed_high):
+                break
+            self._aspiration_researches += 1
+            widenings += 1
+            window *= 4
+            if failed_low:
+                alpha = (
+                    best_score - window
+                    if widenings < ASPIRATION_MAX_WIDENINGS
+                    else -math.inf
+                )
+            else:
+                beta = (
+                    best_score + window
+                    if widenings < ASPIRATION_MAX_WIDENINGS
+                    else math.inf
+                )
+        self._depth_nodes[depth] = self._nodes_searched - nodes_before
+        self._depth_seconds.append(time.perf_counter() - started)
+        self.completed_depth = depth
+        self._root_score = best_score if best_moves else None
+        # The only random choice in the search: between exactly tied root moves
+        best_move = self.rng.choice(best_moves) if best_moves else None
+        return best_move, best_score
+
+    def _iterative_deepening(
+        self, position: BitBoard, root_moves: List[Move]
+    ) -> Optional[Move]:
+        """
+        Searches depth 1, 2, ... up to search_depth until the time budget runs out.
+        Each iteration tries the previous iteration's best move first; the rest of
+        the principal variation comes back out of the transposition table.
+
+        The aspiration window is centred on the score from two iterations back:
+        the side to move at the horizon alternates with the depth, and the window
+        heuristics swing by whole threats between odd and even depths.
+        """
+        self._deadline = time.monotonic() + self.time_budget
+        self.completed_depth = 0
+        best_move = None
+        scores: List[float] = []
+        try:
+            for depth in range(1, self.search_depth + 1):
+                if best_move is not None:
+                    root_moves.remove(best_move)
+                    root_moves.insert(0, best_move)
+                best_move, best_score = self._search_depth(
+                    position,
+                    root_moves,
+                    depth,
+                    scores[-2] if len(scores) >= 2 else None,
+                )
+                scores.append(best_score)
+                if is_mate_score(best_score):
+                    break  # Forced result found; deeper search cannot change it
+        except SearchTimeout:
+            logger.debug(
+                f"{type(self).__name__} ({self.player_piece}): time budget hit, "
+                f"using depth {self.completed_depth} result {best_move}"
+            )
+        finally:
+            self._deadline = None
+        return best_move
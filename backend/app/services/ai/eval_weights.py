@@ -0,0 +1,192 @@
+# backend/app/services/ai/eval_weights.py
+"""
+Evaluation weights of the search bots, kept as data.
+
+Each difficulty's weights are one EvalWeights record in a JSON file shipped in
+app/data (eval_weights.json); the self-play tuner (selfplay.py) writes files in
+the same format. A missing or malformed file falls back to the built-in
+DEFAULT_EVAL_WEIGHTS, which match the shipped file.
+"""
+import json
+import os
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from app.services.game_logic import BoardGeometry, DEFAULT_GEOMETRY
+from app.core.constants import (
+    AI_DIFFICULTY_HARD,
+    AI_DIFFICULTY_MEDIUM,
+    CONNECT_N,
+    ROWS,
+)
+
+from app.core.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_WEIGHTS_PATH: str = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "data",
+    "eval_weights.json",
+)
+
+
+class EvalWeights(NamedTuple):
+    """
+    Score of one window for the AI, by what it holds (three/two/one meaning
+    connect_n - 1/2/3 pieces), plus a bonus per piece in the center rows.
+    Opponent terms are added as they are, so they are normally negative.
+    """
+
+    win: int  # connect_n of the AI's pieces; the opponent's score -win
+    three: int  # and one empty cell
+    open_two: int  # and two empty cells
+    blocked_two: int  # one empty cell and one opponent piece
+    open_one: int  # and three empty cells
+    opponent_three: int
+    opponent_open_two: int
+    opponent_blocked_two: int
+    opponent_open_one: int
+    center_row: int  # Per piece in the middle three rows (the opponent's count against)
+
+
+def center_rows(rows: int) -> Tuple[int, ...]:
+    """
+    The middle three rows of a board with rows rows, or middle four for an even
+    count: the set must map onto itself when the rows are reversed, since
+    canonical hashes treat a row-flipped position as the same one.
+    """
+    return tuple(r for r in range((rows - 1) // 2 - 1, rows // 2 + 2) if 0 <= r < rows)
+
+
+# Rows 2, 3, 4 for a 7-row board
+CENTER_ROWS: Tuple[int, ...] = center_rows(ROWS)
+
+DEFAULT_EVAL_WEIGHTS: Dict[str, EvalWeights] = {
+    AI_DIFFICULTY_MEDIUM: EvalWeights(
+        win=100000,
+        three=1000,
+        open_two=100,
+        blocked_two=0,
+        open_one=0,
+        opponent_three=-5000,
+        opponent_open_two=-50,
+        opponent_blocked_two=0,
+        opponent_open_one=0,
+        center_row=0,
+    ),
+    AI_DIFFICULTY_HARD: EvalWeights(
+        win=10000000,
+        three=50000,
+        open_two=5000,
+        blocked_two=200,
+        open_one=500,
+        opponent_three=-250000,  # Critical block
+        opponent_open_two=-25000,
+        opponent_blocked_two=-1000,
+        opponent_open_one=-250,
+        center_row=5,
+    ),
+}
+
+
+class EvalWeightsError(Exception):
+    """The weights file is missing, unreadable or lacks a field."""
+
+
+def score_window(
+    weights: EvalWeights,
+    ai_count: int,
+    opponent_count: int,
+    empty_count: int,
+    connect_n: int = CONNECT_N,
+) -> int:
+    """Score of one window of connect_n cells for the AI under weights."""
+    if ai_count == connect_n:
+        return weights.win
+    if opponent_count == connect_n:
+        return -weights.win
+
+    score = 0
+    if ai_count == connect_n - 1 and empty_count == 1:
+        score += weights.three
+    elif ai_count == connect_n - 2 and empty_count == 2:
+        score += weights.open_two
+    elif ai_count == connect_n - 2 and empty_count == 1:
+        score += weights.blocked_two
+    elif ai_count == connect_n - 3 and empty_count == 3:
+        score += weights.open_one
+
+    if opponent_count == connect_n - 1 and empty_count == 1:
+        score += weights.opponent_three
+    elif opponent_count == connect_n - 2 and empty_count == 2:
+        score += weights.opponent_open_two
+    elif opponent_count == connect_n - 2 and empty_count == 1:
+        score += weights.opponent_blocked_two
+    elif opponent_count == connect_n - 3 and empty_count == 3:
+        score += weights.opponent_open_one
+    return score
+
+
+def cell_weights_for(
+    weights: EvalWeights, geometry: BoardGeometry = DEFAULT_GEOMETRY
+) -> Optional[List[List[int]]]:
+    """Per-cell piece bonus for WindowEvaluator, or None when there is none."""
+    if not weights.center_row:
+        return None
+    rows = center_rows(geometry.rows)
+    return [
+        [weights.center_row if r in rows else 0 for _ in range(geometry.cols)]
+        for r in range(geometry.rows)
+    ]
+
+
+def weights_from_dict(values: Dict[str, int]) -> EvalWeights:
+    missing = [field for field in EvalWeights._fields if field not in values]
+    if missing:
+        raise EvalWeightsError(f"missing weights: {', '.join(missing)}")
+    return EvalWeights(**{field: int(values[field]) for field in EvalWeights._fields})
+
+
+def read_weights_file(path: str) -> Dict[str, EvalWeights]:
+    """{difficulty: EvalWeights} from a JSON file of {difficulty: {field: value}}."""
+    try:
+        with open(path) as weights_file:
+            data = json.load(weights_file)
+    except (OSError, ValueError) as e:
+        raise EvalWeightsError(f"cannot read {path} ({e})") from e
+    if not isinstance(data, dict):
+        raise EvalWeightsError(f"{path} does not hold a JSON object")
+    return {name: weights_from_dict(values) for name, values in data.items()}
+
+
+def write_weights_file(path: str, weights: Dict[str, EvalWeights]):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as weights_file:
+        json.dump(
+            {name: w._asdict() for name, w in weights.items()}, weights_file, indent=2
+        )
+        weights_file.write("\n")
+
+
+# Weights per path per process, read on first use
+_loaded: Dict[str, Dict[str, EvalWeights]] = {}
+
+
+def get_eval_weights(name: str, path: str = DEFAULT_WEIGHTS_PATH) -> EvalWeights:
+    """
+    The weights stored under name (a difficulty) in path; the built-in defaults
+    if the file or the entry is missing.
+    """
+    weights = _loaded.get(path)
+    if weights is None:
+        try:
+            weights = read_weights_file(path)
+        except EvalWeightsError as e:
+            logger.warning(
+                f"Evaluation weights unavailable ({e}); using built-in defaults."
+            )
+            weights = {}
+        _loaded[path] = weights
+    if name in weights:
+        return weights[name]
+    return DEFAULT_EVAL_WEIGHTS[name]
@@ -0,0 +1,404 @@
+# backend/app/services/ai/mcts_bot.py
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .base_bot import (
+    MOVE_SOURCE_FORCED,
+    MOVE_SOURCE_SEARCH,
+    BaseBot,
+    GameLogicBoard,
+    SearchStats,
+)
+from .engine import find_winning_moves
+from app.services.game_logic import BitBoard, BoardGeometry, BoardTables
+from app.core.constants import PLAYER_O, PLAYER_X
+
+from app.core.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+Move = Tuple[int, str]
+
+# Playout policies
+MCTS_POLICY_RANDOM: str = "random"  # Uniformly random legal moves
+MCTS_POLICY_GREEDY: str = "greedy"  # Win if possible, else block, else random
+
+# --- Vectorised playout tables ---
+# Playouts track, per board, how many pieces each player has in every window of
+# the geometry. Every cell's window list is padded to the same length with a
+# sentinel window (index len(windows)) whose counts are kept at zero, so it never
+# reads as complete. Cell index rows * cols is the landing cell of an illegal option.
+_X, _O = 0, 1
+
+
+class _PlayoutTables:
+    """The NumPy index tables of batch_playouts for one geometry."""
+
+    __slots__ = (
+        "cols",
+        "connect_n",
+        "sentinel_cell",
+        "sentinel_window",
+        "cell_window_index",
+        "flat_window_masks",
+        "option_rows",
+        "option_is_left",
+    )
+
+    def __init__(self, tables: BoardTables):
+        rows, cols = tables.rows, tables.cols
+        cell_windows = tables.cell_windows
+        self.cols = cols
+        self.connect_n = tables.connect_n
+        self.sentinel_cell = rows * cols
+        self.sentinel_window = len(tables.windows)
+        max_cell_windows = max(
+            len(cell_windows[r][c]) for r in range(rows) for c in range(cols)
+        )
+        self.cell_window_index: np.ndarray = np.array(
+            [
+                list(cell_windows[r][c])
+                + [self.sentinel_window] * (max_cell_windows - len(cell_windows[r][c]))
+                for r in range(rows)
+                for c in range(cols)
+            ]
+            + [[self.sentinel_window] * max_cell_windows],
+            dtype=np.intp,
+        )
+        self.flat_window_masks: List[int] = [
+            sum(1 << (r * cols + c) for r, c in window) for window in tables.windows
+        ]
+        # Move option k is (row k // 2, "L" if k is even else "R")
+        self.option_rows: np.ndarray = np.repeat(np.arange(rows), 2)
+        self.option_is_left: np.ndarray = np.tile(np.array([True, False]), rows)
+
+
+# Per geometry per process, built on first use
+_playout_tables: Dict[BoardGeometry, _PlayoutTables] = {}
+
+
+def _playout_tables_for(tables: BoardTables) -> _PlayoutTables:
+    playout_tables = _playout_tables.get(tables.geometry)
+    if playout_tables is None:
+        playout_tables = _playout_tables[tables.geometry] = _PlayoutTables(tables)
+    return playout_tables
+
+
+def _window_counts(
+    board: GameLogicBoard, piece: str, playout_tables: _PlayoutTables
+) -> np.ndarray:
+    cols = playout_tables.cols
+    owned = 0
+    for r in range(len(board)):
+        for c in range(cols):
+            if board[r][c] == piece:
+                owned |= 1 << (r * cols + c)
+    return np.array(
+        [(owned & mask).bit_count() for mask in playout_tables.flat_window_masks] + [0],
+        dtype=np.int8,
+    )
+
+
+def batch_playouts(
+    position: BitBoard,
+    to_move: str,
+    count: int,
+    rng: np.random.Generator,
+    policy: str = MCTS_POLICY_RANDOM,
+) -> Tuple[int, int, int]:
+    """
+    Plays count games to the end from position at once and returns
+    (x_wins, o_wins, draws). All boards start with the same number of empty
+    cells and move in lock step, so each ply is one vectorised step over the
+    boards still running. Assumes position was reached by play (no gaps
+    inside a row), which every stored board is.
+    """
+    tables = _playout_tables_for(position.tables)
+    cell_window_index = tables.cell_window_index
+    option_rows, option_is_left = tables.option_rows, tables.option_is_left
+    sentinel_window = tables.sentinel_window
+    threat = tables.connect_n - 1
+    board = position.to_board()
+    counts = np.empty((2, count, sentinel_window + 1), dtype=np.int8)
+    counts[_X] = _window_counts(board, PLAYER_X, tables)
+    counts[_O] = _window_counts(board, PLAYER_O, tables)
+    left = np.tile(np.array(position.left_fill, dtype=np.intp), (count, 1))
+    right = np.tile(np.array(position.right_fill, dtype=np.intp), (count, 1))
+    winners = np.full(count, -1, dtype=np.int8)
+    running = np.arange(count)
+    piece = _X if to_move == PLAYER_X else _O
+    empty_cells = sum(row.count(None) for row in board)
+
+    for _ in range(empty_cells):
+        if running.size == 0:
+            break
+        run_left, run_right = left[running], right[running]
+        valid = (run_left <= run_right)[:, option_rows]
+        landing_cols = np.where(
+            option_is_left, run_left[:, option_rows], run_right[:, option_rows]
+        )
+        landing = np.where(
+            valid, option_rows * tables.cols + landing_cols, tables.sentinel_cell
+        )
+
+        scores = rng.random(landing.shape)
+        if policy == MCTS_POLICY_GREEDY:
+            # A landing cell completes a window holding connect_n - 1 of a player's pieces
+            landing_windows = cell_window_index[landing]
+            batch_index = running[:, None, None]
+            scores += 4.0 * (counts[piece][batch_index, landing_windows] == threat).any(
+                axis=2
+            )
+            scores += 2.0 * (
+                counts[1 - piece][batch_index, landing_windows] == threat
+            ).any(axis=2)
+        scores[~valid] = -1.0
+        choice = scores.argmax(axis=1)
+
+        chosen_rows = option_rows[choice]
+        chosen_windows = cell_window_index[landing[np.arange(running.size), choice]]
+        piece_counts = counts[piece]
+        piece_counts[running[:, None], chosen_windows] += 1
+        piece_counts[:, sentinel_window] = 0
+        goes_left = option_is_left[choice]
+        left[running[goes_left], chosen_rows[goes_left]] += 1
+        right[running[~goes_left], chosen_rows[~goes_left]] -= 1
+
+        won = (piece_counts[running[:, None], chosen_windows] == threat + 1).any(axis=1)
+        winners[running[won]] = piece
+        running = running[~won]
+        piece = 1 - piece
+
+    x_wins = int((winners == _X).sum())
+    o_wins = int((winners == _O).sum())
+    return x_wins, o_wins, count - x_wins - o_wins
+
+
+def load_scaled_time_budget(
+    time_budget: float, pending: int, max_workers: int, min_time_budget: float
+) -> float:
+    """
+    Think time for one more search when pending searches are already queued on
+    max_workers workers: the full budget while a worker is free, otherwise a
+    share proportional to the queue, never below min_time_budget.
+    """
+    queued = pending + 1
+    if queued <= max_workers:
+        return time_budget
+    return max(min_time_budget, time_budget * max_workers / queued)
+
+
+class _Node:
+    __slots__ = (
+        "parent",
+        "move",
+        "mover",
+        "children",
+        "untried",
+        "visits",
+        "wins",
+        "winner",
+    )
+
+    def __init__(self, parent, move, mover, untried, winner=None):
+        self.parent: Optional["_Node"] = parent
+        self.move: Optional[Move] = move
+        self.mover: str = mover  # Player whose move led here; wins are counted for them
+        self.children: List["_Node"] = []
+        self.untried: List[Move] = untried
+        self.visits = 0
+        self.wins = 0.0
+        self.winner: Optional[str] = winner  # Set on terminal nodes ("" for a draw)
+
+
+class MCTSAIBot(BaseBot):
+    """
+    Monte Carlo Tree Search (UCT) bot.
+
+    Each iteration walks the tree by UCB1, expands one move and scores the new
+    node with batch_size playouts run together in NumPy (batch_playouts), so the
+    per-iteration Python overhead is paid once per batch rather than per game.
+    The search stops at time_budget seconds or max_iterations iterations,
+    whichever comes first, and plays the most visited root move. Being an
+    anytime search, a shorter budget just means a weaker move.
+    """
+
+    def __init__(
+        self,
+        player_piece: str,
+        time_budget: Optional[float] = 1.0,
+        max_iterations: Optional[int] = None,
+        batch_size: int = 32,
+        exploration: float = math.sqrt(2),
+        playout_policy: str = MCTS_POLICY_GREEDY,
+        seed: Optional[int] = None,
+        geometry: Optional[BoardGeometry] = None,
+    ):
+        super().__init__(player_piece, seed, geometry)
+        if time_budget is None and max_iterations is None:
+            raise ValueError("MCTSAIBot needs a time_budget or max_iterations")
+        if playout_policy not in (MCTS_POLICY_RANDOM, MCTS_POLICY_GREEDY):
+            raise ValueError(f"Unknown playout policy: {playout_policy}")
+        self.opponent_piece = PLAYER_O if self.player_piece == PLAYER_X else PLAYER_X
+        self.time_budget = time_budget
+        self.max_iterations = max_iterations
+        self.batch_size = batch_size
+        self.exploration = exploration
+        self.playout_policy = playout_policy
+        self.iterations = 0
+        self.playouts = 0
+        self._move_source = MOVE_SOURCE_SEARCH
+        self._principal_variation: Tuple[Move, ...] = ()
+
+    def _other(self, player: str) -> str:
+        return PLAYER_O if player == PLAYER_X else PLAYER_X
+
+    def _choose_move(self, board: GameLogicBoard) -> Optional[Move]:
+        position = BitBoard.from_board(board, self.geometry)
+        self.iterations = 0
+        self.playouts = 0
+        self._move_source = MOVE_SOURCE_FORCED
+        self._principal_variation = ()
+        valid_moves = position.valid_moves()
+        if not valid_moves:
+            return None
+        if len(valid_moves) == 1:
+            return valid_moves[0]
+
+        # Forced moves need no sampling
+        winning_moves = find_winning_moves(position, self.player_piece)
+        if winning_moves:
+            return self.rng.choice(winning_moves)
+        blocking_moves = find_winning_moves(position, self.opponent_piece)
+        if blocking_moves:
+            return self.rng.choice(blocking_moves)
+
+        self._move_source = MOVE_SOURCE_SEARCH
+        root = self._search(position)
+        best = max(root.children, key=lambda child: child.visits)
+        self._principal_variation = self._most_visited_line(root)
+        logger.debug(
+            f"MCTSAI ({self.player_piece}): {self.iterations} iterations, "
+            f"{self.playouts} playouts, chose {best.move} "
+            f"({best.wins / best.visits:.2f} over {best.visits})"
+        )
+        return best.move
+
+    def _search(self, position: BitBoard) -> _Node:
+        rng = np.random.default_rng(self.rng.getrandbits(64))
+        untried = position.valid_moves()
+        self.rng.shuffle(untried)
+        root = _Node(None, None, self.opponent_piece, untried)
+        deadline = (
+            time.monotonic() + self.time_budget
+            if self.time_budget is not None
+            else None
+        )
+        self.iterations = 0
+        self.playouts = 0
+
+        while True:
+            if (
+                self.max_iterations is not None
+                and self.iterations >= self.max_iterations
+            ):
+                break
+            if (
+                deadline is not None
+                and self.iterations
+                and time.monotonic() >= deadline
+            ):
+                break
+            self.iterations += 1
+
+            # 1. Selection
+            node = root
+            current = position.copy()
+            to_move = self.player_piece
+            while not node.untried and node.children and node.winner is None:
+                node = self._select_child(node)
+                current.apply_move(*node.move, to_move)
+                to_move = self._other(to_move)
+
+            # 2. Expansion
+            if node.untried and node.winner is None:
+                move = node.untried.pop()
+                current.apply_move(*move, to_move)
+                winner = None
+                if current.check_win(to_move):
+                    winner = to_move
+                elif current.is_full():
+                    winner = ""
+                moves = [] if winner is not None else current.valid_moves()
+                self.rng.shuffle(moves)
+                child = _Node(node, move, to_move, moves, winner)
+                node.children.append(child)
+                node = child
+                to_move = self._other(to_move)
+
+            # 3. Simulation
+            if node.winner is not None:
+                x_wins = self.batch_size if node.winner == PLAYER_X else 0
+                o_wins = self.batch_size if node.winner == PLAYER_O else 0
+                draws = self.batch_size - x_wins - o_wins
+            else:
+                x_wins, o_wins, draws = batch_playouts(
+                    current, to_move, self.batch_size, rng, self.playout_policy
+                )
+            self.playouts += self.batch_size
+
+            # 4. Backpropagation
+            while node is not None:
+                node.visits += self.batch_size
+                node.wins += (
+                    x_wins if node.mover == PLAYER_X else o_wins
+                ) + 0.5 * draws
+                node = node.parent
+        return root
+
+    def _most_visited_line(self, root: _Node) -> Tuple[Move, ...]:
+        line = []
+        node = root
+        while node.children:
+            node = max(node.children, key=lambda child: child.visits)
+            line.append(node.move)
+        return tuple(line)
+
+    def _search_stats(self, elapsed_seconds: float) -> SearchStats:
+        # A tree node is expanded per iteration and every playout ends in a leaf score
+        return SearchStats(
+            source=self._move_source,
+            elapsed_seconds=elapsed_seconds,
+            nodes=self.iterations,
+            leaf_evaluations=self.playouts,
+            principal_variation=self._principal_variation,
+        )
+
+    def _select_child(self, node: _Node) -> _Node:
+        log_visits = math.log(node.visits)
+        exploration = self.exploration
+        return max(
+            node.children,
+            key=lambda child: child.wins / child.visits
+            + exploration * math.sqrt(log_visits / child.visits),
+        )
+
+
+if __name__ == "__main__":
+    from app.services.game_logic import print_board, create_board, apply_move
+
+    test_board = create_board()
+    apply_move(test_board, 3, "L", PLAYER_X)
+    apply_move(test_board, 3, "R", PLAYER_O)
+    apply_move(test_board, 2, "L", PLAYER_X)
+    print_board(test_board)
+
+    mcts_bot_o = MCTSAIBot(PLAYER_O, time_budget=1.0)
+    chosen_move = mcts_bot_o.get_move(test_board)
+    logger.info(
+        f"MCTSAI ({PLAYER_O}) suggests move: {chosen_move} after "
+        f"{mcts_bot_o.iterations} iterations / {mcts_bot_o.playouts} playouts"
+    )
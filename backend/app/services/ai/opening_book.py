@@ -0,0 +1,260 @@
+# backend/app/services/ai/opening_book.py
+"""
+Opening book for HardAIBot, built offline and shipped as a small binary file.
+
+Every position reachable in the first few plies is searched deeply once, ahead
+of time, and only the chosen move is kept. Positions are keyed by their
+canonical Zobrist hash (game_logic.canonical_hash: the smallest hash over the
+left/right mirror and the row reversal), so a whole symmetry class shares one
+entry.
+
+File layout (little-endian):
+    header  4s magic, B version, B plies, H search depth, I entry count
+    entries Q canonical Zobrist key, B move code (row * 2 + 0 for L / 1 for R),
+            sorted by key
+
+Build it with:
+    python -m app.services.ai.opening_book --plies 3 --depth 7
+"""
+import argparse
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from app.services.game_logic import (
+    DEFAULT_BOARD_TABLES,
+    BitBoard,
+    canonical_hash,
+    transform_move,
+)
+from app.core.constants import PLAYER_O, PLAYER_X
+
+from app.core.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+Move = Tuple[int, str]
+
+BOOK_MAGIC: bytes = b"SSOB"
+BOOK_VERSION: int = 2  # 2: keys fold row reversal as well as the mirror
+_HEADER = struct.Struct("<4sBBHI")
+_ENTRY = struct.Struct("<QB")
+
+DEFAULT_BOOK_PATH: str = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "data",
+    "opening_book.bin",
+)
+
+
+class OpeningBookError(Exception):
+    """The book file is missing, truncated or not an opening book."""
+
+
+def encode_move(move: Move) -> int:
+    row, side = move
+    return row * 2 + (0 if side == "L" else 1)
+
+
+def decode_move(code: int) -> Move:
+    return code // 2, "L" if code % 2 == 0 else "R"
+
+
+def side_to_move(position: BitBoard) -> str:
+    """X always moves first, so equal piece counts mean X is to move."""
+    return (
+        PLAYER_X
+        if position.x_bits.bit_count() == position.o_bits.bit_count()
+        else PLAYER_O
+    )
+
+
+def canonical_key(position: BitBoard) -> Tuple[int, int]:
+    """Returns (key, transform); see game_logic.canonical_hash."""
+    return canonical_hash(position)
+
+
+class OpeningBook:
+    """
+    In-memory view of a book file: canonical key -> move code.
+
+    The file is only read on the first lookup, so processes that never play a
+    HARD game never pay for it, and a missing file just means an empty book.
+    """
+
+    def __init__(self, path: str = DEFAULT_BOOK_PATH):
+        self.path = path
+        self.plies = 0
+        self.search_depth = 0
+        self._entries: Optional[Dict[int, int]] = None
+
+    def __reduce__(self):
+        # Bots are pickled into executor workers on every move; send only the path
+        # and let each worker load its own copy once.
+        return (get_opening_book, (self.path,))
+
+    def _load(self) -> Dict[int, int]:
+        if self._entries is None:
+            try:
+                self._entries = self._read(self.path)
+                logger.info(
+                    f"Loaded opening book {self.path}: {len(self._entries)} positions, "
+                    f"{self.plies} plies, depth {self.search_depth}"
+                )
+            except (OSError, OpeningBookError) as e:
+                logger.warning(f"Opening book unavailable ({e}); searching every move.")
+                self._entries = {}
+        return self._entries
+
+    def _read(self, path: str) -> Dict[int, int]:
+        with open(path, "rb") as book_file:
+            data = book_file.read()
+        if len(data) < _HEADER.size:
+            raise OpeningBookError(f"{path} is truncated")
+        magic, version, plies, depth, count = _HEADER.unpack_from(data, 0)
+        if magic != BOOK_MAGIC or version != BOOK_VERSION:
+            raise OpeningBookError(
+                f"{path} is not a version {BOOK_VERSION} opening book"
+            )
+        if len(data) != _HEADER.size + count * _ENTRY.size:
+            raise OpeningBookError(f"{path} is truncated")
+        self.plies, self.search_depth = plies, depth
+        return dict(_ENTRY.iter_unpack(data[_HEADER.size :]))
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def lookup(self, position: BitBoard, player: str) -> Optional[Move]:
+        """The book move for player in position, or None if it is not in the book."""
+        if position.tables is not DEFAULT_BOARD_TABLES:
+            return None  # Books are built on the default geometry only
+        entries = self._load()
+        if not entries or side_to_move(position) != player:
+            return None
+        key, transform = canonical_key(position)
+        code = entries.get(key)
+        if code is None:
+            return None
+        move = transform_move(decode_move(code), transform)
+        # A Zobrist collision with a position outside the book must never yield an
+        # illegal move
+        return move if position.is_valid_move(*move) else None
+
+
+def write_book(path: str, entries: Dict[int, int], plies: int, search_depth: int):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as book_file:
+        book_file.write(
+            _HEADER.pack(BOOK_MAGIC, BOOK_VERSION, plies, search_depth, len(entries))
+        )
+        for key in sorted(entries):
+            book_file.write(_ENTRY.pack(key, entries[key]))
+
+
+# One book per path per process, shared by every HardAIBot
+_books: Dict[str, OpeningBook] = {}
+
+
+def get_opening_book(path: str = DEFAULT_BOOK_PATH) -> OpeningBook:
+    book = _books.get(path)
+    if book is None:
+        book = OpeningBook(path)
+        _books[path] = book
+    return book
+
+
+def release_opening_book(path: str = DEFAULT_BOOK_PATH) -> bool:
+    """Forgets the loaded book for path; the next get_opening_book reads it again."""
+    return _books.pop(path, None) is not None
+
+
+# --- Offline builder ---
+
+
+def book_positions(plies: int) -> List[BitBoard]:
+    """Every position reachable in fewer than plies moves, one per symmetry class."""
+    seen = set()
+    frontier = [BitBoard()]
+    positions = []
+    for _ in range(plies):
+        next_frontier = []
+        for position in frontier:
+            key, _ = canonical_key(position)
+            if key in seen:
+                continue
+            seen.add(key)
+            positions.append(position)
+            if position.check_win(PLAYER_X) or position.check_win(PLAYER_O):
+                continue
+            player = side_to_move(position)
+            for row, side in position.valid_moves():
+                child = position.copy()
+                child.apply_move(row, side, player)
+                next_frontier.append(child)
+        frontier = next_frontier
+    return positions
+
+
+def _search_book_move(args: Tuple[BitBoard, int, int]) -> Tuple[int, Optional[int]]:
+    from app.services.ai.hard_bot import HardAIBot
+
+    position, search_depth, seed = args
+    key, transform = canonical_key(position)
+    searched = position.transformed(transform)
+    # Seeded, so tie-breaks do not depend on which worker ran the search
+    bot = HardAIBot(side_to_move(searched), search_depth=search_depth, seed=seed)
+    move = bot.get_move(searched.to_board())
+    return key, encode_move(move) if move else None
+
+
+def build_book(
+    plies: int, search_depth: int, workers: int = 1, seed: int = 0
+) -> Dict[int, int]:
+    """Searches every book position (in its canonical orientation) to search_depth."""
+    positions = [
+        position
+        for position in book_positions(plies)
+        if not (position.check_win(PLAYER_X) or position.check_win(PLAYER_O))
+    ]
+    logger.info(
+        f"Building opening book: {len(positions)} positions at depth {search_depth}"
+    )
+    entries: Dict[int, int] = {}
+    started = time.monotonic()
+    jobs = [(position, search_depth, seed) for position in positions]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for done, (key, code) in enumerate(pool.map(_search_book_move, jobs), 1):
+            if code is not None:
+                entries[key] = code
+            if done % 10 == 0 or done == len(jobs):
+                logger.info(
+                    f"{done}/{len(jobs)} positions searched ({time.monotonic() - started:.0f}s)"
+                )
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the HardAIBot opening book.")
+    parser.add_argument(
+        "--plies",
+        type=int,
+        default=3,
+        help="Cover positions with fewer than this many pieces",
+    )
+    parser.add_argument(
+        "--depth", type=int, default=7, help="Search depth per book position"
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=DEFAULT_BOOK_PATH)
+    args = parser.parse_args()
+
+    entries = build_book(args.plies, args.depth, args.workers, args.seed)
+    write_book(args.output, entries, args.plies, args.depth)
+    logger.info(f"Wrote {len(entries)} positions to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# backend/app/services/ai/root_split.py
+"""
+Parallel root splitting for SearchBot.
+
+The root moves are dealt round-robin to worker processes. Each worker runs an
+ordinary _search_root over its share and returns the moves tied for its best
+score; the caller keeps the highest score and merges the tied moves back into
+the original root order. Inside the window every score that reaches the
+running best is exact, so this finds the same tied moves the serial search
+would, at the cost of less pruning across shares.
+"""
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .base_bot import SearchStats, SearchTimeout
+from app.services.game_logic import BitBoard
+
+from app.core.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+Move = Tuple[int, str]
+
+# One pool per worker count per process, created on first use
+_pools: Dict[int, ProcessPoolExecutor] = {}
+
+
+def get_root_search_pool(workers: int) -> ProcessPoolExecutor:
+    pool = _pools.get(workers)
+    if pool is None:
+        logger.info(f"Starting root search pool with {workers} workers")
+        pool = ProcessPoolExecutor(max_workers=workers)
+        _pools[workers] = pool
+    return pool
+
+
+def shutdown_root_search_pools():
+    for pool in _pools.values():
+        pool.shutdown(wait=False, cancel_futures=True)
+    _pools.clear()
+
+
+def _search_share(
+    bot,
+    position: BitBoard,
+    moves: List[Move],
+    depth: int,
+    deadline: Optional[float],
+    alpha: float,
+    beta: float,
+) -> Tuple[List[Move], float, SearchStats]:
+    """Worker entry point: (best moves, their score, search counters) for one share."""
+    # time.monotonic() is system-wide, so the caller's deadline holds here as well
+    bot._deadline = deadline
+    bot._reset_stats()
+    table = bot.transposition_table
+    hits_before, misses_before = table.hits, table.misses
+    best_moves, best_score = bot._search_root(position, moves, depth, alpha, beta)
+    bot._tt_hits = table.hits - hits_before
+    bot._tt_misses = table.misses - misses_before
+    return best_moves, best_score, bot._search_stats(0.0)
+
+
+def split_search_root(
+    bot,
+    position: BitBoard,
+    root_moves: List[Move],
+    depth: int,
+    workers: int,
+    alpha: float = -math.inf,
+    beta: float = math.inf,
+) -> Tuple[List[Move], float, SearchStats]:
+    """
+    Searches root_moves to depth across workers processes, inside (alpha, beta).
+    Returns (best moves in root order, score, the shares' counters summed);
+    raises SearchTimeout if any share runs past the bot's deadline.
+    """
+    workers = min(workers, len(root_moves))
+    pool = get_root_search_pool(workers)
+    futures = [
+        pool.submit(
+            _search_share,
+            bot,
+            position,
+            root_moves[i::workers],
+            depth,
+            bot._deadline,
+            alpha,
+            beta,
+        )
+        for i in range(workers)
+    ]
+    try:
+        results = [future.result() for future in futures]
+    except SearchTimeout:
+        for future in futures:
+            future.cancel()
+        raise
+
+    best_moves: List[Move] = []
+    best_score = -math.inf
+    for moves, score, _ in results:
+        if not moves:
+            continue
+        if score > best_score:
+            best_moves, best_score = list(moves), score
+        elif score == best_score:
+            best_moves.extend(moves)
+    best_moves.sort(key=root_moves.index)
+    return best_moves, best_score, _sum_stats([stats for _, _, stats in results])
+
+
+def _sum_stats(shares: List[SearchStats]) -> SearchStats:
+    cutoffs = [0] * max((len(stats.cutoffs_by_ply) for stats in shares), default=0)
+    for stats in shares:
+        for ply, count in enumerate(stats.cutoffs_by_ply):
+            cutoffs[ply] += count
+    return SearchStats(
+        nodes=sum(stats.nodes for stats in shares),
+        leaf_evaluations=sum(stats.leaf_evaluations for stats in shares),
+        tt_hits=sum(stats.tt_hits for stats in shares),
+        tt_misses=sum(stats.tt_misses for stats in shares),
+        cutoffs_by_ply=tuple(cutoffs),
+    )
@@ -0,0 +1,493 @@
+# backend/app/services/ai/selfplay.py
+"""
+Headless self-play: bot-vs-bot matches for tuning evaluation weights and depths.
+
+Games run straight on the bitboard in worker processes, with no database,
+WebSocket or executor involved. Every random opening is played twice with the
+colours swapped, and the search bots play without the opening book or the
+endgame solver, so results measure the search and its weights.
+
+    # Strength of one configuration against another, with a 95% interval
+    python -m app.services.ai.selfplay match --depth 2 --opponent-depth 3 --games 400
+
+    # SPSA over the weights of one difficulty; writes a weights file
+    python -m app.services.ai.selfplay tune --depth 2 --iterations 100 --output tuned.json
+
+    # Cheapest depth (and weights file) still scoring --target against a reference
+    python -m app.services.ai.selfplay sweep --depths 2 3 --opponent-depth 4 --target 0.45
+"""
+import argparse
+import math
+import random
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .engine import SearchBot
+from .eval_weights import (
+    DEFAULT_WEIGHTS_PATH,
+    EvalWeights,
+    EvalWeightsError,
+    get_eval_weights,
+    read_weights_file,
+    write_weights_file,
+)
+from .hard_bot import HardAIBot
+from .medium_bot import MediumAIBot
+from app.services.game_logic import BitBoard
+from app.core.constants import PLAYER_O, PLAYER_X
+
+from app.core.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+Move = Tuple[int, str]
+
+SELFPLAY_BOTS: Dict[str, type] = {"medium": MediumAIBot, "hard": HardAIBot}
+
+# Random plies before the bots take over; enough to keep paired games apart
+SELFPLAY_OPENING_PLIES: int = 4
+# Normal quantile of the reported intervals (95%)
+SELFPLAY_CONFIDENCE_Z: float = 1.96
+# Elo is reported within this distance of a perfect or nil score
+_ELO_SCORE_LIMIT: float = 1e-3
+
+# SPSA gain sequences a_k = a / (k + 1 + A)^alpha and c_k = c / (k + 1)^gamma,
+# with the usual exponents; A is a tenth of the iterations
+SPSA_ALPHA: float = 0.602
+SPSA_GAMMA: float = 0.101
+
+
+class PlayerConfig(NamedTuple):
+    bot: str = "hard"  # Key of SELFPLAY_BOTS
+    depth: int = 3
+    weights: Optional[EvalWeights] = None  # None: the stored weights of the bot
+
+    def make_bot(self, piece: str, seed: Optional[int] = None) -> SearchBot:
+        bot = SELFPLAY_BOTS[self.bot](
+            piece, search_depth=self.depth, weights=self.weights, seed=seed
+        )
+        if isinstance(bot, HardAIBot):
+            bot.endgame_max_empty_cells = 0
+        return bot
+
+    def describe(self) -> str:
+        return f"{self.bot} depth {self.depth}" + (
+            " (custom weights)" if self.weights else ""
+        )
+
+
+class GameResult(NamedTuple):
+    outcome: int  # 1 / 0 / -1: win, draw or loss for the first configuration
+    nodes: int  # Searched by the first configuration
+    moves: int  # Played by the first configuration
+    seconds: float  # Thinking time of the first configuration
+
+
+class MatchResult(NamedTuple):
+    """Results of the first configuration of a match, with its search effort."""
+
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    nodes: int = 0
+    moves: int = 0
+    seconds: float = 0.0
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    @property
+    def score(self) -> float:
+        """Points per game: 1 a win, 0.5 a draw."""
+        return (self.wins + 0.5 * self.draws) / self.games if self.games else 0.5
+
+    def score_interval(self, z: float = SELFPLAY_CONFIDENCE_Z) -> Tuple[float, float]:
+        """Normal-approximation interval of score, from the per-game variance."""
+        if not self.games:
+            return 0.0, 1.0
+        score = self.score
+        variance = (
+            self.wins * (1 - score) ** 2
+            + self.draws * (0.5 - score) ** 2
+            + self.losses * score**2
+        ) / self.games
+        margin = z * math.sqrt(variance / self.games)
+        return max(0.0, score - margin), min(1.0, score + margin)
+
+    @property
+    def elo(self) -> float:
+        return elo_from_score(self.score)
+
+    def elo_interval(self, z: float = SELFPLAY_CONFIDENCE_Z) -> Tuple[float, float]:
+        low, high = self.score_interval(z)
+        return elo_from_score(low), elo_from_score(high)
+
+    @property
+    def nodes_per_move(self) -> float:
+        return self.nodes / self.moves if self.moves else 0.0
+
+    def add(self, game: GameResult) -> "MatchResult":
+        return MatchResult(
+            self.wins + (game.outcome > 0),
+            self.draws + (game.outcome == 0),
+            self.losses + (game.outcome < 0),
+            self.nodes + game.nodes,
+            self.moves + game.moves,
+            self.seconds + game.seconds,
+        )
+
+    def summary(self) -> str:
+        low, high = self.score_interval()
+        elo_low, elo_high = self.elo_interval()
+        return (
+            f"+{self.wins} ={self.draws} -{self.losses}: score {self.score:.3f} "
+            f"[{low:.3f}, {high:.3f}], Elo {self.elo:+.0f} [{elo_low:+.0f}, {elo_high:+.0f}], "
+            f"{self.nodes_per_move:.0f} nodes/move"
+        )
+
+
+def elo_from_score(score: float) -> float:
+    """Logistic Elo difference for an expected score, clamped short of 0 and 1."""
+    score = min(max(score, _ELO_SCORE_LIMIT), 1 - _ELO_SCORE_LIMIT)
+    return 400 * math.log10(score / (1 - score))
+
+
+def random_opening(rng: random.Random, plies: int) -> List[Move]:
+    """plies random moves from the empty board that do not end the game."""
+    while True:
+        position = BitBoard()
+        player = PLAYER_X
+        moves: List[Move] = []
+        for _ in range(plies):
+            move = rng.choice(position.valid_moves())
+            position.apply_move(*move, player)
+            moves.append(move)
+            if position.check_win(player):
+                break
+            player = PLAYER_O if player == PLAYER_X else PLAYER_X
+        else:
+            return moves
+
+
+def play_game(
+    first: PlayerConfig,
+    second: PlayerConfig,
+    opening: Sequence[Move],
+    first_piece: str,
+    seed: Optional[int] = None,
+) -> GameResult:
+    """One game from opening, first playing first_piece; X moves first."""
+    pieces = {
+        first_piece: first,
+        (PLAYER_O if first_piece == PLAYER_X else PLAYER_X): second,
+    }
+    bots = {piece: config.make_bot(piece, seed) for piece, config in pieces.items()}
+    position = BitBoard()
+    player = PLAYER_X
+    for move in opening:
+        position.apply_move(*move, player)
+        player = PLAYER_O if player == PLAYER_X else PLAYER_X
+
+    nodes = moves = 0
+    seconds = 0.0
+    outcome = 0
+    while not position.is_full():
+        move, stats = bots[player].get_move(position.to_board(), return_stats=True)
+        if move is None:
+            break
+        if player == first_piece:
+            nodes += stats.nodes
+            moves += 1
+            seconds += stats.elapsed_seconds
+        position.apply_move(*move, player)
+        if position.check_win(player):
+            outcome = 1 if player == first_piece else -1
+            break
+        player = PLAYER_O if player == PLAYER_X else PLAYER_X
+    return GameResult(outcome, nodes, moves, seconds)
+
+
+def play_pair(
+    first: PlayerConfig, second: PlayerConfig, opening: Sequence[Move], seed: int
+) -> Tuple[GameResult, GameResult]:
+    """
+    Worker entry point: the opening played once from each side. Every bot gets
+    seed, so the games are reproducible and swapping first and second replays
+    the same two games.
+    """
+    as_x = play_game(first, second, opening, PLAYER_X, seed)
+    as_o = play_game(first, second, opening, PLAYER_O, seed)
+    return as_x, as_o
+
+
+def run_match(
+    first: PlayerConfig,
+    second: PlayerConfig,
+    games: int,
+    seed: int = 0,
+    workers: int = 1,
+    opening_plies: int = SELFPLAY_OPENING_PLIES,
+    pool: Optional[Executor] = None,
+) -> MatchResult:
+    """
+    games (rounded up to pairs) of first against second, spread over workers
+    processes, or over pool when given. Same seed, same openings.
+    """
+    rng = random.Random(seed)
+    pairs = [
+        (random_opening(rng, opening_plies), seed * 1000003 + index)
+        for index in range((games + 1) // 2)
+    ]
+    result = MatchResult()
+    if pool is None and workers <= 1:
+        for opening, game_seed in pairs:
+            for game in play_pair(first, second, opening, game_seed):
+                result = result.add(game)
+        return result
+
+    owned_pool = pool is None
+    if owned_pool:
+        pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [
+            pool.submit(play_pair, first, second, opening, game_seed)
+            for opening, game_seed in pairs
+        ]
+        for future in futures:
+            for game in future.result():
+                result = result.add(game)
+    finally:
+        if owned_pool:
+            pool.shutdown()
+    return result
+
+
+# --- Weight search ---
+
+
+def tunable_parameters(weights: EvalWeights) -> List[str]:
+    """Fields SPSA can move: every non-zero weight except win, which must dominate."""
+    return [
+        field
+        for field in EvalWeights._fields
+        if field != "win" and getattr(weights, field)
+    ]
+
+
+def _with_log_offsets(
+    weights: EvalWeights, parameters: Sequence[str], offsets: Sequence[float]
+) -> EvalWeights:
+    # Parameters move on a log scale: each keeps its sign and steps are relative
+    changes = {
+        field: int(round(getattr(weights, field) * math.exp(offset)))
+        for field, offset in zip(parameters, offsets)
+    }
+    return weights._replace(**changes)
+
+
+def spsa_tune(
+    config: PlayerConfig,
+    iterations: int,
+    games_per_iteration: int,
+    parameters: Optional[Sequence[str]] = None,
+    learning_rate: float = 0.5,
+    perturbation: float = 0.2,
+    seed: int = 0,
+    workers: int = 1,
+    progress: Optional[Callable[[int, EvalWeights, MatchResult], None]] = None,
+) -> EvalWeights:
+    """
+    Simultaneous perturbation stochastic approximation over config's weights.
+
+    Each iteration perturbs every parameter by +-c_k (relative, on a log scale),
+    plays the two perturbed weight sets against each other and steps along the
+    estimated gradient of the score. Returns the final weights; progress is
+    called after every iteration with them and the iteration's match.
+    """
+    base = (
+        config.weights
+        if config.weights is not None
+        else get_eval_weights(SELFPLAY_BOTS[config.bot].WEIGHTS_NAME)
+    )
+    parameters = (
+        list(parameters) if parameters is not None else tunable_parameters(base)
+    )
+    theta = [0.0] * len(parameters)  # Log offsets from base
+    rng = random.Random(seed)
+    stability = iterations / 10
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for k in range(iterations):
+            a_k = learning_rate / (k + 1 + stability) ** SPSA_ALPHA
+            c_k = perturbation / (k + 1) ** SPSA_GAMMA
+            delta = [rng.choice((-1, 1)) for _ in parameters]
+            plus = _with_log_offsets(
+                base, parameters, [t + c_k * d for t, d in zip(theta, delta)]
+            )
+            minus = _with_log_offsets(
+                base, parameters, [t - c_k * d for t, d in zip(theta, delta)]
+            )
+            match = run_match(
+                config._replace(weights=plus),
+                config._replace(weights=minus),
+                games_per_iteration,
+                seed=seed + k + 1,
+                workers=workers,
+                pool=pool,
+            )
+            # score(plus) - score(minus) = 2 * score - 1
+            difference = 2 * match.score - 1
+            theta = [t + a_k * difference / (2 * c_k * d) for t, d in zip(theta, delta)]
+            if progress is not None:
+                progress(k, _with_log_offsets(base, parameters, theta), match)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return _with_log_offsets(base, parameters, theta)
+
+
+def cheapest_config(
+    candidates: Sequence[PlayerConfig],
+    reference: PlayerConfig,
+    target_score: float,
+    games: int,
+    seed: int = 0,
+    workers: int = 1,
+) -> Tuple[Optional[PlayerConfig], List[Tuple[PlayerConfig, MatchResult]]]:
+    """
+    Plays every candidate against reference and returns the one searching the
+    fewest nodes per move among those scoring at least target_score (None if
+    none does), with every candidate's result.
+    """
+    results = [
+        (candidate, run_match(candidate, reference, games, seed=seed, workers=workers))
+        for candidate in candidates
+    ]
+    holding = [
+        (result.nodes_per_move, index)
+        for index, (_, result) in enumerate(results)
+        if result.score >= target_score
+    ]
+    if not holding:
+        return None, results
+    return results[min(holding)[1]][0], results
+
+
+# --- Command line ---
+
+
+def _weights_from_file(path: Optional[str], bot: str) -> Optional[EvalWeights]:
+    if path is None:
+        return None
+    return read_weights_file(path)[SELFPLAY_BOTS[bot].WEIGHTS_NAME]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bot-vs-bot self-play for tuning.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name in ("match", "tune", "sweep"):
+        command = commands.add_parser(name)
+        command.add_argument("--bot", choices=sorted(SELFPLAY_BOTS), default="hard")
+        command.add_argument("--games", type=int, default=200, help="Games per match")
+        command.add_argument("--workers", type=int, default=1)
+        command.add_argument("--seed", type=int, default=0)
+        if name != "tune":
+            command.add_argument("--opponent-depth", type=int, default=3)
+            command.add_argument(
+                "--opponent-weights", help="Weights file for the opponent"
+            )
+    commands.choices["match"].add_argument("--depth", type=int, default=3)
+    commands.choices["match"].add_argument(
+        "--weights", help="Weights file (default: stored)"
+    )
+    tune = commands.choices["tune"]
+    tune.add_argument("--depth", type=int, default=2)
+    tune.add_argument("--weights", help="Starting weights file (default: stored)")
+    tune.add_argument("--iterations", type=int, default=100)
+    tune.add_argument("--output", required=True, help="Weights file to write")
+    sweep = commands.choices["sweep"]
+    sweep.add_argument("--depths", type=int, nargs="+", default=[1, 2, 3])
+    sweep.add_argument(
+        "--weights", nargs="*", default=[], help="Candidate weights files"
+    )
+    sweep.add_argument("--target", type=float, default=0.45, help="Score to hold")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.command == "match":
+        first = PlayerConfig(
+            args.bot, args.depth, _weights_from_file(args.weights, args.bot)
+        )
+        second = PlayerConfig(
+            args.bot,
+            args.opponent_depth,
+            _weights_from_file(args.opponent_weights, args.bot),
+        )
+        result = run_match(first, second, args.games, args.seed, args.workers)
+        logger.info(f"{first.describe()} vs {second.describe()}: {result.summary()}")
+
+    elif args.command == "tune":
+        config = PlayerConfig(
+            args.bot, args.depth, _weights_from_file(args.weights, args.bot)
+        )
+
+        def report(iteration: int, weights: EvalWeights, match: MatchResult):
+            logger.info(f"iteration {iteration + 1}: plus vs minus {match.summary()}")
+
+        tuned = spsa_tune(
+            config,
+            args.iterations,
+            args.games,
+            seed=args.seed,
+            workers=args.workers,
+            progress=report,
+        )
+        try:
+            stored = read_weights_file(DEFAULT_WEIGHTS_PATH)
+        except EvalWeightsError:
+            stored = {}
+        stored[SELFPLAY_BOTS[args.bot].WEIGHTS_NAME] = tuned
+        write_weights_file(args.output, stored)
+        logger.info(f"Tuned weights written to {args.output}: {tuned}")
+        # Tuned against the starting weights as a check
+        result = run_match(
+            config._replace(weights=tuned),
+            config,
+            args.games,
+            args.seed + 1,
+            args.workers,
+        )
+        logger.info(f"tuned vs starting weights: {result.summary()}")
+
+    else:
+        reference = PlayerConfig(
+            args.bot,
+            args.opponent_depth,
+            _weights_from_file(args.opponent_weights, args.bot),
+        )
+        weight_sets = [("stored weights", None)] + [
+            (path, _weights_from_file(path, args.bot)) for path in args.weights
+        ]
+        labels = {}
+        for depth in sorted(args.depths):
+            for label, weights in weight_sets:
+                labels[
+                    PlayerConfig(args.bot, depth, weights)
+                ] = f"depth {depth}, {label}"
+        best, results = cheapest_config(
+            list(labels), reference, args.target, args.games, args.seed, args.workers
+        )
+        for candidate, result in results:
+            logger.info(
+                f"{labels[candidate]} vs {reference.describe()}: {result.summary()}"
+            )
+        logger.info(
+            f"Cheapest holding {args.target:.2f}: {labels[best] if best else 'none'}"
+        )
+    logger.info(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
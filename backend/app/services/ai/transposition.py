@@ -0,0 +1,124 @@
+# backend/app/services/ai/transposition.py
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from app.core.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+# Bound types for stored scores
+TT_EXACT: int = 0
+TT_LOWER_BOUND: int = 1  # Search failed high: true score >= stored score
+TT_UPPER_BOUND: int = 2  # Search failed low: true score <= stored score
+
+DEFAULT_TT_SIZE: int = 1 << 18  # Slots; must be a power of two
+
+
+class TTEntry(NamedTuple):
+    key: int
+    depth: int
+    score: float
+    flag: int
+    best_move: Optional[Tuple[int, str]]
+    generation: int
+
+
+class TranspositionTable:
+    """
+    Fixed-size, Zobrist-keyed table of search results.
+
+    Each key maps to one slot (key & mask). On collision the incoming entry
+    replaces the stored one if the stored entry is from an older search
+    generation or was searched to the same or a shallower depth, so deep
+    results from the current search survive while stale ones age out.
+    """
+
+    def __init__(self, size: int = DEFAULT_TT_SIZE):
+        if size <= 0 or size & (size - 1):
+            raise ValueError(
+                f"Transposition table size must be a power of two, got {size}"
+            )
+        self.size = size
+        self._mask = size - 1
+        self._slots: List[Optional[TTEntry]] = [None] * size
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.shared_name: Optional[str] = None
+
+    def __reduce__(self):
+        # Shipping a populated table to a worker process costs more than refilling it,
+        # so only the configuration is pickled. Shared tables re-attach by name to the
+        # receiving process's own copy.
+        if self.shared_name is not None:
+            return (get_shared_transposition_table, (self.shared_name, self.size))
+        return (TranspositionTable, (self.size,))
+
+    def new_search(self):
+        """Marks the start of a new root search so older entries become replaceable."""
+        self.generation += 1
+
+    def probe(self, key: int) -> Optional[TTEntry]:
+        entry = self._slots[key & self._mask]
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def peek(self, key: int) -> Optional[TTEntry]:
+        """probe() without counting a hit or miss, for reading the table outside a search."""
+        entry = self._slots[key & self._mask]
+        if entry is not None and entry.key == key:
+            return entry
+        return None
+
+    def store(
+        self,
+        key: int,
+        depth: int,
+        score: float,
+        flag: int,
+        best_move: Optional[Tuple[int, str]],
+    ):
+        index = key & self._mask
+        current = self._slots[index]
+        if (
+            current is None
+            or current.key == key
+            or current.generation != self.generation
+            or depth >= current.depth
+        ):
+            self._slots[index] = TTEntry(
+                key, depth, score, flag, best_move, self.generation
+            )
+
+    def clear(self):
+        self._slots = [None] * self.size
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return sum(1 for entry in self._slots if entry is not None)
+
+
+# Tables shared across games, keyed by whatever identifies a compatible search
+# (bot class and piece: stored scores are from that bot's perspective).
+_shared_tables: Dict[str, TranspositionTable] = {}
+
+
+def get_shared_transposition_table(
+    name: str, size: int = DEFAULT_TT_SIZE
+) -> TranspositionTable:
+    """Returns the process-wide table registered under name, creating it on first use."""
+    table = _shared_tables.get(name)
+    if table is None:
+        logger.info(f"Creating shared transposition table '{name}' with {size} slots")
+        table = TranspositionTable(size)
+        table.shared_name = name
+        _shared_tables[name] = table
+    return table
+
+
+def release_shared_transposition_table(name: str) -> bool:
+    """Forgets the table registered under name; returns whether there was one."""
+    return _shared_tables.pop(name, None) is not None
@@ -0,0 +1,165 @@
+# backend/app/services/ai/window_eval.py
+from typing import Callable, List, Optional, Sequence
+
+from app.services.game_logic import BitBoard, BoardGeometry, board_tables
+from app.core.constants import PLAYER_O, PLAYER_X
+
+# (ai_count, opponent_count, empty_count) -> score of one window for the AI
+WindowScore = Callable[[int, int, int], int]
+
+
+class WindowEvaluator:
+    """
+    Incremental window evaluation from one player's perspective.
+
+    Keeps the AI's and the opponent's piece count for every window of the
+    geometry's BoardTables and the running sum of the per-window scores.
+    place()/remove() only touch the windows through the changed cell
+    (cell_windows), so reading score at a leaf costs nothing, instead of
+    rescanning all windows.
+
+    window_score is tabulated once per (ai_count, opponent_count) pair; the
+    optional cell_weights[r][c] adds a per-piece bonus (and the same penalty
+    for opponent pieces).
+
+    threat_windows counts the windows one empty cell short of a line for either
+    side (connect_n - 1 pieces of one player and none of the other), so the
+    search can skip looking for threats in the many positions that have none.
+    """
+
+    def __init__(
+        self,
+        player_piece: str,
+        window_score: WindowScore,
+        cell_weights: Optional[Sequence[Sequence[int]]] = None,
+        geometry: Optional[BoardGeometry] = None,
+    ):
+        self.player_piece = player_piece
+        self.opponent_piece = PLAYER_O if player_piece == PLAYER_X else PLAYER_X
+        tables = board_tables(geometry)
+        connect_n = tables.connect_n
+        window_count = len(tables.windows)
+        self._window_masks = tables.window_masks
+        self._cell_windows = tables.cell_windows
+        self._table: List[List[int]] = [
+            [
+                window_score(ai, opp, connect_n - ai - opp)
+                if ai + opp <= connect_n
+                else 0
+                for opp in range(connect_n + 1)
+            ]
+            for ai in range(connect_n + 1)
+        ]
+        self._cell_weights = (
+            [list(row) for row in cell_weights]
+            if cell_weights is not None
+            else [[0] * tables.cols for _ in range(tables.rows)]
+        )
+        self.ai_counts: List[int] = [0] * window_count
+        self.opponent_counts: List[int] = [0] * window_count
+        self.score = self._table[0][0] * window_count
+        self._threat_table: List[List[int]] = [
+            [
+                1 if (ai, opp) in ((connect_n - 1, 0), (0, connect_n - 1)) else 0
+                for opp in range(connect_n + 1)
+            ]
+            for ai in range(connect_n + 1)
+        ]
+        self.threat_windows = 0
+
+    def reset(self, position: BitBoard):
+        """Recomputes every window count and the score for position from scratch."""
+        ai_bits = position.bits_for(self.player_piece)
+        opponent_bits = position.bits_for(self.opponent_piece)
+        table = self._table
+        threat_table = self._threat_table
+        score = 0
+        threat_windows = 0
+        for index, mask in enumerate(self._window_masks):
+            ai_count = (ai_bits & mask).bit_count()
+            opponent_count = (opponent_bits & mask).bit_count()
+            self.ai_counts[index] = ai_count
+            self.opponent_counts[index] = opponent_count
+            score += table[ai_count][opponent_count]
+            threat_windows += threat_table[ai_count][opponent_count]
+        board = position.to_board()
+        for r in range(len(board)):
+            for c in range(len(board[r])):
+                if board[r][c] == self.player_piece:
+                    score += self._cell_weights[r][c]
+                elif board[r][c] == self.opponent_piece:
+                    score -= self._cell_weights[r][c]
+        self.score = score
+        self.threat_windows = threat_windows
+
+    def place(self, row_idx: int, col_idx: int, player: str):
+        """Accounts for a piece placed at (row_idx, col_idx)."""
+        table = self._table
+        threat_table = self._threat_table
+        ai_counts = self.ai_counts
+        opponent_counts = self.opponent_counts
+        score = self.score
+        threat_windows = self.threat_windows
+        cell_windows = self._cell_windows[row_idx][col_idx]
+        if player == self.player_piece:
+            for index in cell_windows:
+                ai_count = ai_counts[index]
+                opponent_count = opponent_counts[index]
+                score += (
+                    table[ai_count + 1][opponent_count]
+                    - table[ai_count][opponent_count]
+                )
+                threat_windows -= threat_table[ai_count][opponent_count]
+                threat_windows += threat_table[ai_count + 1][opponent_count]
+                ai_counts[index] = ai_count + 1
+            score += self._cell_weights[row_idx][col_idx]
+        else:
+            for index in cell_windows:
+                ai_count = ai_counts[index]
+                opponent_count = opponent_counts[index]
+                score += (
+                    table[ai_count][opponent_count + 1]
+                    - table[ai_count][opponent_count]
+                )
+                threat_windows -= threat_table[ai_count][opponent_count]
+                threat_windows += threat_table[ai_count][opponent_count + 1]
+                opponent_counts[index] = opponent_count + 1
+            score -= self._cell_weights[row_idx][col_idx]
+        self.score = score
+        self.threat_windows = threat_windows
+
+    def remove(self, row_idx: int, col_idx: int, player: str):
+        """Undoes place(row_idx, col_idx, player)."""
+        table = self._table
+        threat_table = self._threat_table
+        ai_counts = self.ai_counts
+        opponent_counts = self.opponent_counts
+        score = self.score
+        threat_windows = self.threat_windows
+        cell_windows = self._cell_windows[row_idx][col_idx]
+        if player == self.player_piece:
+            for index in cell_windows:
+                ai_count = ai_counts[index]
+                opponent_count = opponent_counts[index]
+                score += (
+                    table[ai_count - 1][opponent_count]
+                    - table[ai_count][opponent_count]
+                )
+                threat_windows -= threat_table[ai_count][opponent_count]
+                threat_windows += threat_table[ai_count - 1][opponent_count]
+                ai_counts[index] = ai_count - 1
+            score -= self._cell_weights[row_idx][col_idx]
+        else:
+            for index in cell_windows:
+                ai_count = ai_counts[index]
+                opponent_count = opponent_counts[index]
+                score += (
+                    table[ai_count][opponent_count - 1]
+                    - table[ai_count][opponent_count]
+                )
+                threat_windows -= threat_table[ai_count][opponent_count]
+                threat_windows += threat_table[ai_count][opponent_count - 1]
+                opponent_counts[index] = opponent_count - 1
+            score += self._cell_weights[row_idx][col_idx]
+        self.score = score
+        self.threat_windows = threat_windows
@@ -0,0 +1,281 @@
+# backend/app/services/ai_executor.py
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.ai.base_bot import BaseBot, GameLogicBoard, SearchStats
+
+from app.core.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+AI_EXECUTOR_MODE_AUTO: str = "auto"
+AI_EXECUTOR_MODE_PROCESS: str = "process"
+AI_EXECUTOR_MODE_THREAD: str = "thread"
+
+
+class AIExecutorError(Exception):
+    """Base class for errors raised while computing an AI move off the event loop."""
+
+
+class AIExecutorOverloadedError(AIExecutorError):
+    """Too many searches are already queued; the caller should degrade gracefully."""
+
+
+class AIMoveTimeoutError(AIExecutorError):
+    """The search did not finish within the per-request timeout."""
+
+
+class AIMoveCancelledError(AIExecutorError):
+    """The search was cancelled because its game ended or the player left."""
+
+
+def _run_bot_search(
+    bot: BaseBot, board: GameLogicBoard
+) -> Tuple[Optional[Tuple[int, str]], SearchStats]:
+    """Worker entry point. Returns the move and what the search did."""
+    return bot.get_move(board, return_stats=True)
+
+
+def record_search_stats(game_id: str, bot: BaseBot, stats: SearchStats):
+    """Logs one move's SearchStats and feeds the per-bot search metrics."""
+    bot_name = type(bot).__name__
+    logger.info(f"Game {game_id}: {bot_name} ({bot.player_piece}) {stats.summary()}")
+    prefix = f"ai_search.{bot_name}"
+    metrics.increment(f"{prefix}.moves.{stats.source}")
+    metrics.observe(f"{prefix}.elapsed_seconds", stats.elapsed_seconds)
+    if not stats.nodes:
+        return
+    metrics.observe(f"{prefix}.nodes", stats.nodes)
+    metrics.observe(f"{prefix}.nodes_per_second", stats.nodes_per_second)
+    if stats.completed_depth:
+        metrics.observe(f"{prefix}.completed_depth", stats.completed_depth)
+    if stats.tt_hits or stats.tt_misses:
+        metrics.observe(f"{prefix}.tt_hit_rate", stats.tt_hit_rate)
+
+
+def resolve_executor_mode(mode: str) -> str:
+    """Threads only pay off when searches can run without holding the GIL."""
+    if mode != AI_EXECUTOR_MODE_AUTO:
+        return mode
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    return AI_EXECUTOR_MODE_PROCESS if gil_enabled else AI_EXECUTOR_MODE_THREAD
+
+
+class AIExecutor:
+    """
+    Runs bot searches in a worker pool so a long search never stalls the event loop.
+
+    - Requests are tracked per game so they can be cancelled when the game ends or
+      the player leaves (cancel_game).
+    - Each request has a timeout (AIMoveTimeoutError).
+    - At most max_pending requests may be queued or running; beyond that requests
+      are rejected (AIExecutorOverloadedError) instead of piling up.
+    - In process mode each worker is its own single-process pool (a lane) and a
+      game sticks to the lane it was first given, so the shared transposition
+      tables its bots re-attach to by name stay warm from move to move. A search
+      whose lane is busy goes to the idlest lane instead of queueing behind it.
+    Pending count, rejections, timeouts, queue wait and search time are reported
+    through app.core.metrics under "ai_executor.*".
+    """
+
+    def __init__(
+        self,
+        mode: str = AI_EXECUTOR_MODE_AUTO,
+        max_workers: Optional[int] = None,
+        max_pending: int = 32,
+        default_timeout: float = 10.0,
+    ):
+        self.mode = resolve_executor_mode(mode)
+        if self.mode not in (AI_EXECUTOR_MODE_PROCESS, AI_EXECUTOR_MODE_THREAD):
+            raise ValueError(f"Unknown AI executor mode: {mode}")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.default_timeout = default_timeout
+        self._pool: Optional[Executor] = None
+        self._lanes: List[Optional[Executor]] = [None] * self.max_workers
+        self._lane_pending: List[int] = [0] * self.max_workers
+        self._lane_by_game: Dict[str, int] = {}
+        self._pending = 0
+        self._futures_by_game: Dict[str, Set[asyncio.Future]] = {}
+        self._cancelled_futures: Set[asyncio.Future] = set()
+
+    @classmethod
+    def from_settings(cls) -> "AIExecutor":
+        return cls(
+            mode=settings.AI_EXECUTOR_MODE,
+            max_workers=settings.AI_EXECUTOR_MAX_WORKERS or None,
+            max_pending=settings.AI_EXECUTOR_MAX_PENDING,
+            default_timeout=settings.AI_MOVE_TIMEOUT_SECONDS,
+        )
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def has_idle_worker(self, affinity: str) -> bool:
+        """Whether a search for affinity's game would start now instead of queueing."""
+        if self._pending >= self.max_workers:
+            return False
+        if self.mode == AI_EXECUTOR_MODE_THREAD:
+            return True
+        lane = self._lane_by_game.get(affinity)
+        return lane is None or self._lane_pending[lane] == 0
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            logger.info(
+                f"Starting AI executor: mode={self.mode}, workers={self.max_workers}, max_pending={self.max_pending}"
+            )
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="ai-search"
+            )
+        return self._pool
+
+    def _get_lane_pool(self, lane: int) -> Executor:
+        if self._lanes[lane] is None:
+            if not any(self._lanes):
+                logger.info(
+                    f"Starting AI executor: mode={self.mode}, workers={self.max_workers}, max_pending={self.max_pending}"
+                )
+            # spawn: forking a process that is running an event loop is not safe
+            self._lanes[lane] = ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._lanes[lane]
+
+    def _pick_lane(self, affinity: str) -> int:
+        """affinity's own lane while it is idle, otherwise the idlest lane."""
+        games_per_lane = [0] * self.max_workers
+        for assigned in self._lane_by_game.values():
+            games_per_lane[assigned] += 1
+        idlest = min(
+            range(self.max_workers),
+            key=lambda lane: (self._lane_pending[lane], games_per_lane[lane]),
+        )
+        own = self._lane_by_game.get(affinity)
+        if own is None:
+            self._lane_by_game[affinity] = idlest
+            return idlest
+        if self._lane_pending[idlest] < self._lane_pending[own]:
+            return idlest
+        return own
+
+    def _set_pending(self, value: int):
+        self._pending = value
+        metrics.set_gauge("ai_executor.pending", value)
+
+    async def compute_move(
+        self,
+        game_id: str,
+        bot: BaseBot,
+        board: GameLogicBoard,
+        timeout: Optional[float] = None,
+        affinity: Optional[str] = None,
+    ) -> Optional[Tuple[int, str]]:
+        """
+        Runs bot.get_move(board) in the pool and awaits the result. In process
+        mode the search runs on the lane of affinity (default: game_id).
+        """
+        move, _ = await self.compute_move_with_stats(
+            game_id, bot, board, timeout, affinity
+        )
+        return move
+
+    async def compute_move_with_stats(
+        self,
+        game_id: str,
+        bot: BaseBot,
+        board: GameLogicBoard,
+        timeout: Optional[float] = None,
+        affinity: Optional[str] = None,
+    ) -> Tuple[Optional[Tuple[int, str]], SearchStats]:
+        """compute_move, also returning the search's SearchStats."""
+        if self._pending >= self.max_pending:
+            metrics.increment("ai_executor.rejected")
+            raise AIExecutorOverloadedError(
+                f"{self._pending} AI searches already pending (limit {self.max_pending})"
+            )
+
+        self._set_pending(self._pending + 1)
+        metrics.increment("ai_executor.submitted")
+        submitted_at = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        lane = None
+        if self.mode == AI_EXECUTOR_MODE_THREAD:
+            pool = self._get_pool()
+        else:
+            lane = self._pick_lane(affinity if affinity is not None else game_id)
+            self._lane_pending[lane] += 1
+            pool = self._get_lane_pool(lane)
+        future = loop.run_in_executor(pool, _run_bot_search, bot, board)
+        self._futures_by_game.setdefault(game_id, set()).add(future)
+        try:
+            move, stats = await asyncio.wait_for(
+                future, timeout if timeout is not None else self.default_timeout
+            )
+        except asyncio.TimeoutError:
+            metrics.increment("ai_executor.timeouts")
+            raise AIMoveTimeoutError(f"AI search for game {game_id} timed out")
+        except asyncio.CancelledError:
+            if future in self._cancelled_futures:
+                metrics.increment("ai_executor.cancelled")
+                raise AIMoveCancelledError(
+                    f"AI search for game {game_id} was cancelled"
+                )
+            raise
+        finally:
+            self._set_pending(self._pending - 1)
+            if lane is not None:
+                self._lane_pending[lane] -= 1
+            self._cancelled_futures.discard(future)
+            game_futures = self._futures_by_game.get(game_id)
+            if game_futures is not None:
+                game_futures.discard(future)
+                if not game_futures:
+                    del self._futures_by_game[game_id]
+
+        total_seconds = time.perf_counter() - submitted_at
+        search_seconds = stats.elapsed_seconds
+        metrics.increment("ai_executor.completed")
+        metrics.observe("ai_executor.search_seconds", search_seconds)
+        metrics.observe(
+            "ai_executor.queue_wait_seconds", max(0.0, total_seconds - search_seconds)
+        )
+        return move, stats
+
+    def cancel_game(self, game_id: str) -> int:
+        """Cancels every pending search for game_id. Returns how many were cancelled."""
+        futures = self._futures_by_game.get(game_id, set())
+        for future in futures:
+            # A search already running in a worker process cannot be interrupted;
+            # its result is simply discarded.
+            self._cancelled_futures.add(future)
+            future.cancel()
+        if futures:
+            logger.info(f"Cancelled {len(futures)} AI search(es) for game {game_id}")
+        return len(futures)
+
+    def release_game(self, game_id: str):
+        """Forgets game_id's lane once the game is over."""
+        self._lane_by_game.pop(game_id, None)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        for lane, pool in enumerate(self._lanes):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+                self._lanes[lane] = None
+        self._lane_by_game.clear()
+
+
+# Singleton executor shared by the PvE and AvA managers
+ai_executor = AIExecutor.from_settings()
@@ -2,6 +2,7 @@
 
 import asyncio
 import uuid
+from typing import List, Tuple
 from fastapi import WebSocketDisconnect
 from sqlalchemy.orm import Session
 
@@ -11,44 +12,24 @@ from app.websockets.connection_manager import manager
 from app.services.game_logic import (
     Board as GameLogicBoard,
     apply_move,
-    check_win,
     check_draw,
+    find_winning_line,
     create_board as service_create_board,
 )
 from app.services.ai.easy_bot import EasyAIBot
-from app.services.ai.medium_bot import MediumAIBot
-from app.services.ai.hard_bot import HardAIBot
+from app.services.bot_registry import bot_registry, difficulty_from
+from app.services.move_cache import compute_move_cached
+from app.services.ai_executor import (
+    AIExecutorError,
+    AIMoveCancelledError,
+    record_search_stats,
+)
 from app.core import constants  # Import our new constants
 
 from app.core.logging_config import setup_logger
 
 logger = setup_logger(__name__)
 
-# Helper function to instantiate AI bot
-def _get_ai_bot_instance(ai_player_token: str, ai_player_piece: str):
-    """Instantiates an AI bot based on its token and piece."""
-    # Token example: "AI_EASY_PLAYER_1", "AI_MEDIUM_PLAYER_2"
-    # Remove prefixes/suffixes to get difficulty string
-    difficulty_str_part = (
-        ai_player_token.replace(constants.AI_PLAYER_TOKEN_PREFIX, "")
-        .replace(constants.AI_PLAYER_TOKEN_PLAYER1_SUFFIX, "")
-        .replace(constants.AI_PLAYER_TOKEN_PLAYER2_SUFFIX, "")
-    )
-
-    if constants.AI_DIFFICULTY_EASY in difficulty_str_part:
-        return EasyAIBot(player_piece=ai_player_piece)
-    elif constants.AI_DIFFICULTY_MEDIUM in difficulty_str_part:
-        return MediumAIBot(
-            player_piece=ai_player_piece, search_depth=2
-        )  # Search depth could be a constant or config
-    elif constants.AI_DIFFICULTY_HARD in difficulty_str_part:
-        return HardAIBot(
-            player_piece=ai_player_piece, search_depth=3
-        )  # Search depth could be a constant or config
-
-    logger.error(f"ERROR AvA: Could not determine AI type for token {ai_player_token}")
-    return None
-
 
 # Helper function to handle game over scenario in AvA loop
 async def _handle_ava_game_over(
@@ -59,6 +40,7 @@ async def _handle_ava_game_over(
     status: str,
     winner_token: str | None,
     winning_piece: str | None,
+    winning_line: List[Tuple[int, int]] | None = None,
 ):
     """Updates DB and broadcasts GAME_OVER for AvA."""
     crud_game.update_game_state(
@@ -74,6 +56,9 @@ async def _handle_ava_game_over(
         "status": status,
         "winner_token": winner_token,
         "winning_player_piece": winning_piece,
+        "winning_line": (
+            [list(cell) for cell in winning_line] if winning_line else None
+        ),
     }
     await manager.broadcast_to_game(
         {"type": constants.WS_MSG_TYPE_GAME_OVER, "payload": game_over_payload},
@@ -81,18 +66,24 @@ async def _handle_ava_game_over(
     )
 
 
-async def run_ai_vs_ai_game(game_id_uuid: uuid.UUID):  # Removed initial_db_session
+async def run_ai_vs_ai_game(game_id_uuid: uuid.UUID, headless: bool = False):
     """
     Manages an AI vs AI game, making moves for each AI until the game ends.
     Uses a new DB session for its operations.
+    Each ply is revealed no sooner than AI_AVA_MIN_REVEAL_SECONDS after it started
+    (the search overlaps that delay); headless games run with no delay at all.
     """
     db: Session = SessionLocal()
     active_game_id_str = str(game_id_uuid)
-    logger.info(f"AI vs AI Game Loop Started for: {active_game_id_str}")
+    min_reveal_seconds = 0.0 if headless else constants.AI_AVA_MIN_REVEAL_SECONDS
+    loop = asyncio.get_running_loop()
+    logger.info(
+        f"AI vs AI Game Loop Started for: {active_game_id_str} (headless={headless})"
+    )
 
     try:
         while True:
-            await asyncio.sleep(1.0)  # Delay for spectating
+            reveal_at = loop.time() + min_reveal_seconds
 
             current_game_state = crud_game.get_game(db, game_id=game_id_uuid)
             if (
@@ -117,16 +108,25 @@ async def run_ai_vs_ai_game(game_id_uuid: uuid.UUID):  # Removed initial_db_sess
                 else constants.PLAYER_O
             )
 
-            ai_bot_instance = _get_ai_bot_instance(ai_player_token, ai_player_piece)
+            geometry = crud_game.game_geometry(current_game_state)
+
+            # One bot per seat for the whole game, built on its first turn
+            ai_bot_instance = bot_registry.get_bot(
+                active_game_id_str,
+                ai_player_piece,
+                ai_player_token,
+                seed=current_game_state.ai_seed,
+                geometry=geometry,
+            )
             if not ai_bot_instance:
-                # Error already logged in _get_ai_bot_instance
+                # Error already logged by the bot registry
                 # Consider a more graceful game end, e.g., technical forfeit
                 await _handle_ava_game_over(
                     db,
                     game_id_uuid,
                     active_game_id_str,
                     current_game_state.board_state.get(
-                        "board", service_create_board()
+                        "board", service_create_board(geometry)
                     ),  # Pass current board
                     constants.GAME_STATUS_ERROR_AI_STUCK,  # Or a more specific error status
                     None,
@@ -138,15 +138,29 @@ async def run_ai_vs_ai_game(game_id_uuid: uuid.UUID):  # Removed initial_db_sess
                 f"AvA Game {active_game_id_str}: AI Turn for {ai_player_token} ({ai_player_piece}) thinking..."
             )
             current_board: GameLogicBoard = current_game_state.board_state.get(
-                "board", service_create_board()
+                "board", service_create_board(geometry)
             )
 
-            # Create a copy for the AI to modify if its `get_move` modifies the board
-            # board_for_ai = [row[:] for row in current_board] # If AI mutates board
-            # ai_move_tuple = ai_bot_instance.get_move(board_for_ai)
-            ai_move_tuple = ai_bot_instance.get_move(
-                current_board
-            )  # Assuming get_move is pure or operates on a copy
+            # The search runs in the AI executor so the event loop stays responsive
+            try:
+                ai_move_tuple, search_stats = await compute_move_cached(
+                    active_game_id_str,
+                    ai_bot_instance,
+                    difficulty_from(ai_player_token),
+                    current_board,
+                )
+                record_search_stats(active_game_id_str, ai_bot_instance, search_stats)
+            except AIMoveCancelledError:
+                logger.info(f"AvA Game {active_game_id_str}: AI search cancelled.")
+                break
+            except AIExecutorError as e:
+                # Overloaded or too slow: fall back to the cheap bot so the game keeps moving
+                logger.warning(
+                    f"AvA Game {active_game_id_str}: AI search failed ({e}); using fallback move."
+                )
+                ai_move_tuple = EasyAIBot(
+                    player_piece=ai_player_piece, geometry=geometry
+                ).get_move(current_board)
 
             if not ai_move_tuple:
                 logger.error(f"AvA ERROR: AI {ai_player_token} could not find a move.")
@@ -176,6 +190,9 @@ async def run_ai_vs_ai_game(game_id_uuid: uuid.UUID):  # Removed initial_db_sess
             logger.info(
                 f"AvA Game {active_game_id_str}: AI {ai_player_token} chose r{ai_row},s{ai_side}"
             )
+            remaining_reveal_delay = reveal_at - loop.time()
+            if remaining_reveal_delay > 0:
+                await asyncio.sleep(remaining_reveal_delay)  # Delay for spectating
 
             # It's crucial that apply_move operates on a fresh copy or the DB state's board,
             # not a mutated one from the AI if the AI mutates its input.
@@ -213,7 +230,10 @@ async def run_ai_vs_ai_game(game_id_uuid: uuid.UUID):  # Removed initial_db_sess
                 else current_game_state.player2_token
             )
 
-            if check_win(board_after_ai_move, ai_player_piece, ai_placed_coords):
+            winning_line = find_winning_line(
+                board_after_ai_move, ai_player_piece, ai_placed_coords, geometry
+            )
+            if winning_line:
                 current_turn_status = constants.get_win_status(ai_player_piece)
                 winner_for_turn = ai_player_token
                 is_game_over_this_turn = True
@@ -247,6 +267,7 @@ async def run_ai_vs_ai_game(game_id_uuid: uuid.UUID):  # Removed initial_db_sess
                         if winner_for_turn != constants.DRAW_WINNER_TOKEN_VALUE
                         else None
                     ),
+                    winning_line=winning_line,
                 )
                 break
             else:
@@ -306,6 +327,7 @@ async def run_ai_vs_ai_game(game_id_uuid: uuid.UUID):  # Removed initial_db_sess
                 f"AvA Game {active_game_id_str}: Failed to broadcast critical error: {broadcast_err}"
             )
     finally:
+        bot_registry.release_game(active_game_id_str)
         logger.info(
             f"AvA Game {active_game_id_str}: Closing DB session in run_ai_vs_ai_game."
         )
@@ -0,0 +1,273 @@
+# backend/app/services/bot_registry.py
+import random
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from app.services.ai.base_bot import BaseBot
+from app.services.ai.easy_bot import EasyAIBot
+from app.services.ai.medium_bot import MediumAIBot
+from app.services.ai.hard_bot import HardAIBot
+from app.services.ai.mcts_bot import MCTSAIBot, load_scaled_time_budget
+from app.services.ai.opening_book import (
+    DEFAULT_BOOK_PATH,
+    get_opening_book,
+    release_opening_book,
+)
+from app.services.ai.transposition import (
+    get_shared_transposition_table,
+    release_shared_transposition_table,
+)
+from app.services.ai_executor import ai_executor
+from app.services.game_logic import DEFAULT_GEOMETRY, BoardGeometry
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core import constants
+
+from app.core.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+BOT_ROLE_MOVE: str = "move"
+BOT_ROLE_PONDER: str = "ponder"
+
+_RESOURCE_OPENING_BOOK: str = "opening_book"
+_RESOURCE_TT_PREFIX: str = "tt:"
+
+
+def difficulty_from(text: str) -> Optional[str]:
+    """The AI difficulty named in a game mode ("PVE_HARD") or AI token ("AI_EASY_PLAYER_1")."""
+    text_upper = text.upper()
+    for difficulty in constants.AI_DIFFICULTIES:
+        if difficulty in text_upper:
+            return difficulty
+    return None
+
+
+def new_ai_seed() -> int:
+    """A fresh seed for a game's bots, to be stored with the game."""
+    return random.getrandbits(constants.AI_SEED_BITS)
+
+
+class BotRegistry:
+    """
+    Live bots by (game, seat, role) and the process-wide resources they share.
+
+    A seat's bot is built on its game's first AI turn and reused on every later
+    turn, so the difficulty is parsed once and per-bot state survives between
+    moves. Bots of a seeded game get its seed and stop at fixed limits instead
+    of on the clock, so the game replays move for move. Bots are built with the
+    game's board geometry. Resources shared between games (the opening book,
+    the shared transposition tables) are pooled by name and tracked per game;
+    when a game is released its bots are dropped, and so is any pooled resource
+    that no other live game still uses. Transposition tables are pooled per
+    geometry; the opening book only serves the default geometry.
+    """
+
+    def __init__(self):
+        self._bots: Dict[Tuple[str, str, str], BaseBot] = {}
+        self._resources: Dict[str, Any] = {}
+        self._resource_games: Dict[str, Set[str]] = {}
+        self._releasers: Dict[str, Callable[[], Any]] = {}
+
+    @property
+    def bot_count(self) -> int:
+        return len(self._bots)
+
+    @property
+    def resource_names(self) -> Set[str]:
+        return set(self._resources)
+
+    def get_bot(
+        self,
+        game_id: str,
+        seat: str,
+        difficulty_text: str,
+        seed: Optional[int] = None,
+        geometry: Optional[BoardGeometry] = None,
+    ) -> Optional[BaseBot]:
+        """The bot playing seat (its piece) in game_id, built on first use."""
+        bot = self._get(game_id, seat, BOT_ROLE_MOVE, difficulty_text, seed, geometry)
+        if isinstance(bot, MCTSAIBot) and seed is None:
+            # Anytime search: when moves are queueing up, think less instead of queueing longer
+            bot.time_budget = load_scaled_time_budget(
+                constants.AI_MCTS_TIME_BUDGET_SECONDS,
+                ai_executor.pending,
+                ai_executor.max_workers,
+                constants.AI_MCTS_MIN_TIME_BUDGET_SECONDS,
+            )
+        return bot
+
+    def get_ponder_bot(
+        self,
+        game_id: str,
+        seat: str,
+        difficulty_text: str,
+        seed: Optional[int] = None,
+        geometry: Optional[BoardGeometry] = None,
+    ) -> Optional[BaseBot]:
+        """
+        The bot pondering for seat during the opponent's turn. Only unseeded HARD
+        ponders: a seeded game's moves must not depend on how far pondering got.
+        """
+        return self._get(
+            game_id, seat, BOT_ROLE_PONDER, difficulty_text, seed, geometry
+        )
+
+    def _get(
+        self,
+        game_id: str,
+        seat: str,
+        role: str,
+        difficulty_text: str,
+        seed: Optional[int],
+        geometry: Optional[BoardGeometry],
+    ) -> Optional[BaseBot]:
+        key = (game_id, seat, role)
+        bot = self._bots.get(key)
+        if bot is None:
+            bot = self._create_bot(
+                game_id, seat, role, difficulty_from(difficulty_text), seed, geometry
+            )
+            if bot is None:
+                return None
+            self._bots[key] = bot
+            metrics.set_gauge("bot_registry.bots", len(self._bots))
+        return bot
+
+    def _create_bot(
+        self,
+        game_id: str,
+        seat: str,
+        role: str,
+        difficulty: Optional[str],
+        seed: Optional[int],
+        geometry: Optional[BoardGeometry],
+    ) -> Optional[BaseBot]:
+        geometry = geometry or DEFAULT_GEOMETRY
+        table_name = f"{difficulty}_{seat}"
+        if geometry != DEFAULT_GEOMETRY:
+            # Hashes of different geometries would share entries
+            table_name += "_{}x{}c{}".format(*geometry)
+        if role == BOT_ROLE_PONDER:
+            if difficulty != constants.AI_DIFFICULTY_HARD or seed is not None:
+                return None
+            return HardAIBot(
+                player_piece=seat,
+                search_depth=constants.AI_HARD_MAX_SEARCH_DEPTH,
+                time_budget=constants.AI_HARD_PONDER_TIME_BUDGET_SECONDS,
+                # Same table as the live bot; the executor runs both in the game's
+                # worker, so pondering warms it in process mode too
+                transposition_table=self._shared_table(game_id, table_name),
+                opening_book=self._opening_book(game_id, geometry),
+                seed=seed,
+                geometry=geometry,
+            )
+        if difficulty == constants.AI_DIFFICULTY_EASY:
+            return EasyAIBot(player_piece=seat, seed=seed, geometry=geometry)
+        if difficulty == constants.AI_DIFFICULTY_MEDIUM:
+            return MediumAIBot(
+                player_piece=seat,
+                search_depth=constants.AI_MEDIUM_SEARCH_DEPTH,
+                seed=seed,
+                geometry=geometry,
+            )
+        if difficulty == constants.AI_DIFFICULTY_HARD and seed is not None:
+            # Fixed depth, a table of its own and one process, so a replay matches
+            return HardAIBot(
+                player_piece=seat,
+                search_depth=constants.AI_HARD_SEEDED_SEARCH_DEPTH,
+                opening_book=self._opening_book(game_id, geometry),
+                seed=seed,
+                geometry=geometry,
+            )
+        if difficulty == constants.AI_DIFFICULTY_HARD:
+            return HardAIBot(
+                player_piece=seat,
+                # Deepen until the think budget runs out so move latency stays flat
+                search_depth=constants.AI_HARD_MAX_SEARCH_DEPTH,
+                time_budget=constants.AI_HARD_TIME_BUDGET_SECONDS,
+                transposition_table=self._shared_table(game_id, table_name),
+                opening_book=self._opening_book(game_id, geometry),
+                root_workers=settings.AI_ROOT_SEARCH_WORKERS,
+                parallel_min_nodes=settings.AI_ROOT_SEARCH_MIN_NODES,
+                seed=seed,
+                geometry=geometry,
+            )
+        if difficulty == constants.AI_DIFFICULTY_MCTS:
+            if seed is not None:
+                return MCTSAIBot(
+                    player_piece=seat,
+                    time_budget=None,
+                    max_iterations=constants.AI_MCTS_SEEDED_MAX_ITERATIONS,
+                    batch_size=constants.AI_MCTS_BATCH_SIZE,
+                    seed=seed,
+                    geometry=geometry,
+                )
+            return MCTSAIBot(
+                player_piece=seat,
+                time_budget=constants.AI_MCTS_TIME_BUDGET_SECONDS,
+                batch_size=constants.AI_MCTS_BATCH_SIZE,
+                seed=seed,
+                geometry=geometry,
+            )
+        logger.error(f"Bot registry: no AI difficulty for game {game_id} seat {seat}")
+        return None
+
+    # --- Pooled resources ---
+
+    def _acquire(
+        self,
+        game_id: str,
+        name: str,
+        factory: Callable[[], Any],
+        releaser: Callable[[], Any],
+    ) -> Any:
+        resource = self._resources.get(name)
+        if resource is None:
+            resource = factory()
+            self._resources[name] = resource
+            self._releasers[name] = releaser
+            metrics.set_gauge("bot_registry.resources", len(self._resources))
+        self._resource_games.setdefault(name, set()).add(game_id)
+        return resource
+
+    def _shared_table(self, game_id: str, table_name: str):
+        return self._acquire(
+            game_id,
+            f"{_RESOURCE_TT_PREFIX}{table_name}",
+            lambda: get_shared_transposition_table(table_name),
+            lambda: release_shared_transposition_table(table_name),
+        )
+
+    def _opening_book(self, game_id: str, geometry: BoardGeometry):
+        if geometry != DEFAULT_GEOMETRY:
+            return None
+        return self._acquire(
+            game_id,
+            _RESOURCE_OPENING_BOOK,
+            get_opening_book,
+            lambda: release_opening_book(DEFAULT_BOOK_PATH),
+        )
+
+    def release_game(self, game_id: str) -> int:
+        """Drops game_id's bots and any resource only it was using. Returns bots dropped."""
+        ai_executor.release_game(game_id)
+        keys = [key for key in self._bots if key[0] == game_id]
+        for key in keys:
+            del self._bots[key]
+        for name in list(self._resource_games):
+            games = self._resource_games[name]
+            games.discard(game_id)
+            if not games:
+                del self._resource_games[name]
+                del self._resources[name]
+                self._releasers.pop(name)()
+                logger.info(f"Bot registry: released {name}, no live game uses it")
+        if keys:
+            logger.info(f"Bot registry: released {len(keys)} bot(s) of game {game_id}")
+        metrics.set_gauge("bot_registry.bots", len(self._bots))
+        metrics.set_gauge("bot_registry.resources", len(self._resources))
+        return len(keys)
+
+
+# Singleton used by the PvE and AvA managers
+bot_registry = BotRegistry()
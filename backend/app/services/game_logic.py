@@ -1,6 +1,17 @@
-from typing import List, Optional, Tuple
+import random
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from app.core.constants import (
+    BOARD_MAX_COLS,
+    BOARD_MAX_ROWS,
+    CONNECT_N,
+    COLS,
+    EMPTY_CELL,
+    PLAYER_O,
+    PLAYER_X,
+    ROWS,
+)
 
-from app.core.constants import EMPTY_CELL, PLAYER_O, PLAYER_X, ROWS, COLS, CONNECT_N
 # Constants for the game board
 
 
@@ -13,34 +24,54 @@ from app.core.logging_config import setup_logger
 
 logger = setup_logger(__name__)
 
-def create_board() -> Board:
-    """Creates a new empty game board."""
-    return [[EMPTY_CELL for _ in range(COLS)] for _ in range(ROWS)]
+
+class BoardGeometry(NamedTuple):
+    """Board size and winning line length of a game (see BOARD_VARIANTS in constants)."""
+
+    rows: int
+    cols: int
+    connect_n: int
+
+
+DEFAULT_GEOMETRY: BoardGeometry = BoardGeometry(ROWS, COLS, CONNECT_N)
+
+
+def geometry_of(board: Board, connect_n: int = CONNECT_N) -> BoardGeometry:
+    """The geometry of a list-of-lists board: its own size, and connect_n."""
+    return BoardGeometry(len(board), len(board[0]) if board else 0, connect_n)
+
+
+def create_board(geometry: Optional[BoardGeometry] = None) -> Board:
+    """Creates a new empty game board (of the default geometry unless one is given)."""
+    rows, cols, _ = geometry if geometry is not None else DEFAULT_GEOMETRY
+    return [[EMPTY_CELL for _ in range(cols)] for _ in range(rows)]
 
 def print_board(board: Board):
     """Helper function to print the board to the console (for debugging)."""
-    logger.debug("\n  " + " ".join(str(i) for i in range(COLS)))
+    cols = len(board[0]) if board else 0
+    logger.debug("\n  " + " ".join(str(i) for i in range(cols)))
     for r_idx, row in enumerate(board):
         display_row = [cell if cell is not None else "_" for cell in row]
         logger.debug(f"{r_idx} [" + " ".join(display_row) + "]")
-    logger.debug("-" * (COLS * 2 + 5))
+    logger.debug("-" * (cols * 2 + 5))
+
 
 def is_valid_move(board: Board, row_idx: int, side: str) -> bool:
     """
     Checks if a piece can be placed in the given row from the given side ('L' or 'R').
     """
-    if not (0 <= row_idx < ROWS):
+    if not (0 <= row_idx < len(board)):
         return False
     if side not in ["L", "R"]:
         return False
     target_row = board[row_idx]
     if side == "L":
-        for col_idx in range(COLS):
+        for col_idx in range(len(target_row)):
             if target_row[col_idx] == EMPTY_CELL:
                 return True
         return False
     elif side == "R":
-        for col_idx in range(COLS - 1, -1, -1):
+        for col_idx in range(len(target_row) - 1, -1, -1):
             if target_row[col_idx] == EMPTY_CELL:
                 return True
         return False
@@ -56,51 +87,151 @@ def apply_move(board: Board, row_idx: int, side: str, player: str) -> Optional[T
     target_row = board[row_idx]
     placed_coords: Optional[Tuple[int, int]] = None
     if side == "L":
-        for col_idx in range(COLS):
+        for col_idx in range(len(target_row)):
             if target_row[col_idx] == EMPTY_CELL:
                 target_row[col_idx] = player
                 placed_coords = (row_idx, col_idx)
                 break
     elif side == "R":
-        for col_idx in range(COLS - 1, -1, -1):
+        for col_idx in range(len(target_row) - 1, -1, -1):
             if target_row[col_idx] == EMPTY_CELL:
                 target_row[col_idx] = player
                 placed_coords = (row_idx, col_idx)
                 break
     return placed_coords
 
-def check_win(board: Board, player: str, last_move_coords: Optional[Tuple[int, int]] = None) -> bool:
+
+def undo_move(board: Board, placed_coords: Tuple[int, int]):
+    """Reverts apply_move given the (row, col) it returned."""
+    row_idx, col_idx = placed_coords
+    board[row_idx][col_idx] = EMPTY_CELL
+
+
+# (row step, col step) for horizontal, vertical, positive (\) and negative (/) lines
+LINE_DIRECTIONS: Tuple[Tuple[int, int], ...] = ((0, 1), (1, 0), (1, 1), (-1, 1))
+
+WinningLine = List[Tuple[int, int]]
+
+
+# --- Winning-window index ---
+# Every run of connect_n cells that can form a win, built once per geometry.
+# Evaluation, win detection and the bitboard masks below are all derived from it.
+Window = Tuple[Tuple[int, int], ...]
+
+
+def _build_windows(geometry: BoardGeometry) -> Tuple[Window, ...]:
+    """All connect_n windows, grouped by direction in LINE_DIRECTIONS order."""
+    rows, cols, connect_n = geometry
+    windows = []
+    for dr, dc in LINE_DIRECTIONS:
+        for r in range(rows):
+            for c in range(cols):
+                end_r, end_c = r + dr * (connect_n - 1), c + dc * (connect_n - 1)
+                if 0 <= end_r < rows and 0 <= end_c < cols:
+                    windows.append(
+                        tuple((r + dr * i, c + dc * i) for i in range(connect_n))
+                    )
+    return tuple(windows)
+
+
+def _build_cell_windows(
+    geometry: BoardGeometry, windows: Tuple[Window, ...]
+) -> Tuple[Tuple[Tuple[int, ...], ...], ...]:
+    """[r][c] holds the indices into windows of every window containing (r, c)."""
+    membership: List[List[List[int]]] = [
+        [[] for _ in range(geometry.cols)] for _ in range(geometry.rows)
+    ]
+    for index, window in enumerate(windows):
+        for r, c in window:
+            membership[r][c].append(index)
+    return tuple(tuple(tuple(cell) for cell in row) for row in membership)
+
+
+def _run_through(
+    board: Board, player: str, row_idx: int, col_idx: int, dr: int, dc: int
+) -> WinningLine:
+    """The player's contiguous run along (dr, dc) through (row_idx, col_idx)."""
+    rows, cols = len(board), len(board[0])
+    line = [(row_idx, col_idx)]
+    r, c = row_idx - dr, col_idx - dc
+    while 0 <= r < rows and 0 <= c < cols and board[r][c] == player:
+        line.insert(0, (r, c))
+        r, c = r - dr, c - dc
+    r, c = row_idx + dr, col_idx + dc
+    while 0 <= r < rows and 0 <= c < cols and board[r][c] == player:
+        line.append((r, c))
+        r, c = r + dr, c + dc
+    return line
+
+
+def _find_winning_line_through(
+    board: Board, player: str, row_idx: int, col_idx: int, connect_n: int
+) -> Optional[WinningLine]:
     """
-    Checks if the given player has won.
-    If last_move_coords is provided, it ideally would optimize by checking only lines involving that piece.
-    For simplicity in this initial version, we will check the whole board.
-    A more optimized version could be implemented later if performance becomes an issue.
+    Walks only the four lines through (row_idx, col_idx) and returns the player's
+    contiguous run through that cell if it is at least connect_n long.
     """
-    # Check horizontal wins
-    for r in range(ROWS):
-        for c in range(COLS - CONNECT_N + 1):
-            if all(board[r][c + i] == player for i in range(CONNECT_N)):
-                return True
-
-    # Check vertical wins
-    for c in range(COLS):
-        for r in range(ROWS - CONNECT_N + 1):
-            if all(board[r + i][c] == player for i in range(CONNECT_N)):
-                return True
+    for dr, dc in LINE_DIRECTIONS:
+        line = _run_through(board, player, row_idx, col_idx, dr, dc)
+        if len(line) >= connect_n:
+            return line
+    return None
 
-    # Check positive diagonal wins (\)
-    for r in range(ROWS - CONNECT_N + 1):
-        for c in range(COLS - CONNECT_N + 1):
-            if all(board[r + i][c + i] == player for i in range(CONNECT_N)):
-                return True
 
-    # Check negative diagonal wins (/)
-    for r in range(CONNECT_N - 1, ROWS):
-        for c in range(COLS - CONNECT_N + 1):
-            if all(board[r - i][c + i] == player for i in range(CONNECT_N)):
-                return True
-                
-    return False
+def _find_winning_line_full_scan(
+    board: Board, player: str, windows: Tuple[Window, ...]
+) -> Optional[WinningLine]:
+    """
+    Scans every horizontal, vertical and diagonal window on the board and returns
+    the whole run holding the first one found, as _find_winning_line_through does.
+    """
+    for window in windows:
+        if all(board[r][c] == player for r, c in window):
+            (r0, c0), (r1, c1) = window[0], window[1]
+            return _run_through(board, player, r0, c0, r1 - r0, c1 - c0)
+    return None
+
+
+def find_winning_line(
+    board: Board,
+    player: str,
+    last_move_coords: Optional[Tuple[int, int]] = None,
+    geometry: Optional[BoardGeometry] = None,
+) -> Optional[WinningLine]:
+    """
+    Returns the cells of the player's winning line, or None if the player has not won.
+    If last_move_coords is provided (and holds the player's piece), only the four
+    lines through that cell are walked; this is exact as long as the player had not
+    already won before that move. Otherwise the whole board is scanned.
+    Without a geometry the board's own size and CONNECT_N are assumed.
+    """
+    if geometry is None:
+        geometry = geometry_of(board)
+    if last_move_coords is not None:
+        row_idx, col_idx = last_move_coords
+        if (
+            0 <= row_idx < geometry.rows
+            and 0 <= col_idx < geometry.cols
+            and board[row_idx][col_idx] == player
+        ):
+            return _find_winning_line_through(
+                board, player, row_idx, col_idx, geometry.connect_n
+            )
+    return _find_winning_line_full_scan(board, player, board_tables(geometry).windows)
+
+
+def check_win(
+    board: Board,
+    player: str,
+    last_move_coords: Optional[Tuple[int, int]] = None,
+    geometry: Optional[BoardGeometry] = None,
+) -> bool:
+    """
+    Checks if the given player has won.
+    If last_move_coords is provided, only lines through that piece are checked
+    (see find_winning_line); without it the whole board is scanned.
+    """
+    return find_winning_line(board, player, last_move_coords, geometry) is not None
 
 def check_draw(board: Board) -> bool:
     """
@@ -108,13 +239,500 @@ def check_draw(board: Board) -> bool:
     This function assumes check_win would be called first for both players.
     A draw occurs if all cells are filled and no one has won.
     """
-    for r in range(ROWS):
-        for c in range(COLS):
-            if board[r][c] == EMPTY_CELL:
+    for row in board:
+        for cell in row:
+            if cell == EMPTY_CELL:
                 return False # Found an empty cell, so not a draw
     return True # All cells are filled
 
 
+def mirror_side(side: str) -> str:
+    """Push side seen in the left/right mirror image."""
+    return "R" if side == "L" else "L"
+
+
+# --- Board symmetries ---
+# Every row plays alike and so do both push sides, so a position is equivalent to
+# its left/right mirror (column c <-> cols - 1 - c, L <-> R pushes), to its row
+# reversal (row r <-> rows - 1 - r) and to both at once (a half turn). Transforms
+# are bit flags; each one is its own inverse.
+SYMMETRY_IDENTITY: int = 0
+SYMMETRY_MIRROR: int = 1
+SYMMETRY_FLIP_ROWS: int = 2
+SYMMETRY_ROTATE: int = SYMMETRY_MIRROR | SYMMETRY_FLIP_ROWS
+SYMMETRIES: Tuple[int, ...] = (
+    SYMMETRY_IDENTITY,
+    SYMMETRY_MIRROR,
+    SYMMETRY_FLIP_ROWS,
+    SYMMETRY_ROTATE,
+)
+
+
+def transform_cell(
+    row_idx: int, col_idx: int, transform: int, geometry: Optional[BoardGeometry] = None
+) -> Tuple[int, int]:
+    """(row, col) after transform: SYMMETRY_IDENTITY, _MIRROR, _FLIP_ROWS or _ROTATE."""
+    rows, cols, _ = geometry if geometry is not None else DEFAULT_GEOMETRY
+    if transform & SYMMETRY_FLIP_ROWS:
+        row_idx = rows - 1 - row_idx
+    if transform & SYMMETRY_MIRROR:
+        col_idx = cols - 1 - col_idx
+    return row_idx, col_idx
+
+
+def transform_move(
+    move: Tuple[int, str], transform: int, geometry: Optional[BoardGeometry] = None
+) -> Tuple[int, str]:
+    """
+    move as it reads after transform. Transforms are self-inverse, so the same
+    call maps a move found on the canonical form back onto the original board.
+    """
+    row_idx, side = move
+    if transform & SYMMETRY_FLIP_ROWS:
+        rows = geometry.rows if geometry is not None else ROWS
+        row_idx = rows - 1 - row_idx
+    if transform & SYMMETRY_MIRROR:
+        side = mirror_side(side)
+    return row_idx, side
+
+
+def transform_board(board: Board, transform: int) -> Board:
+    """Copy of board under SYMMETRY_IDENTITY, _MIRROR, _FLIP_ROWS or _ROTATE."""
+    geometry = geometry_of(board)
+    transformed = create_board(geometry)
+    for r in range(geometry.rows):
+        for c in range(geometry.cols):
+            image_r, image_c = transform_cell(r, c, transform, geometry)
+            transformed[image_r][image_c] = board[r][c]
+    return transformed
+
+
+# --- Bitboard layout ---
+# Cell (r, c) maps to bit r * row_stride + c, with row_stride = cols + 1. Every
+# row carries one extra guard bit that is never set, so horizontal and diagonal
+# shifts cannot wrap from the end of one row into the start of the next.
+#
+# Zobrist keys are one random 64-bit value per (player, bit index). A fixed seed
+# keeps hashes stable across processes so tables can be shared between workers.
+ZOBRIST_SEED: int = 0x51DE57AC
+
+
+class BoardTables:
+    """
+    Everything derived from one BoardGeometry: its winning windows (windows,
+    cell_windows, window_masks), the bitboard layout (row_stride,
+    bit_directions, full_board_mask), Zobrist keys and the bit maps of the
+    SYMMETRIES. Built once per geometry by board_tables() and shared by every
+    position and search on it, so the hot paths read ready-made tables whatever
+    the geometry, just as with the module-level ones of the default geometry.
+    """
+
+    __slots__ = (
+        "geometry",
+        "rows",
+        "cols",
+        "connect_n",
+        "cell_count",
+        "windows",
+        "cell_windows",
+        "row_stride",
+        "bit_directions",
+        "window_masks",
+        "full_board_mask",
+        "zobrist_keys",
+        "zobrist_side_key",
+        "symmetry_bit_index",
+    )
+
+    def __init__(self, geometry: BoardGeometry):
+        rows, cols, connect_n = geometry
+        self.geometry = geometry
+        self.rows = rows
+        self.cols = cols
+        self.connect_n = connect_n
+        self.cell_count = rows * cols
+        self.windows: Tuple[Window, ...] = _build_windows(geometry)
+        self.cell_windows: Tuple[
+            Tuple[Tuple[int, ...], ...], ...
+        ] = _build_cell_windows(geometry, self.windows)
+        stride = cols + 1
+        self.row_stride = stride
+        # Shift distances for horizontal, vertical, positive (\) and negative (/) diagonals
+        self.bit_directions: Tuple[int, ...] = (1, stride, stride + 1, stride - 1)
+        # One bitmask per entry of windows, in the same order
+        self.window_masks: List[int] = [
+            sum(self.cell_bit(r, c) for r, c in window) for window in self.windows
+        ]
+        self.full_board_mask: int = sum(
+            self.cell_bit(r, c) for r in range(rows) for c in range(cols)
+        )
+        zobrist_rng = random.Random(ZOBRIST_SEED)
+        self.zobrist_keys: Dict[str, List[int]] = {
+            player: [zobrist_rng.getrandbits(64) for _ in range(rows * stride)]
+            for player in (PLAYER_X, PLAYER_O)
+        }
+        # XORed in by searches when the side to move needs to be part of the key
+        self.zobrist_side_key: int = zobrist_rng.getrandbits(64)
+        # [transform][bit index] -> bit index of the cell's image; guard bits map to themselves
+        table = []
+        for transform in SYMMETRIES:
+            images = list(range(rows * stride))
+            for r in range(rows):
+                for c in range(cols):
+                    image_r, image_c = transform_cell(r, c, transform, geometry)
+                    images[r * stride + c] = image_r * stride + image_c
+            table.append(tuple(images))
+        self.symmetry_bit_index: Tuple[Tuple[int, ...], ...] = tuple(table)
+
+    def __reduce__(self):
+        # Pickled by geometry: a worker process rebuilds (or reuses) its own copy
+        return board_tables, (self.geometry,)
+
+    def cell_bit(self, row_idx: int, col_idx: int) -> int:
+        """Returns the single-bit mask for the cell at (row_idx, col_idx)."""
+        return 1 << (row_idx * self.row_stride + col_idx)
+
+
+# Tables per geometry per process, built on first use
+_board_tables: Dict[BoardGeometry, BoardTables] = {}
+
+
+def board_tables(geometry: Optional[BoardGeometry] = None) -> BoardTables:
+    """The tables of geometry (the default geometry if None), built on first use."""
+    if geometry is None:
+        geometry = DEFAULT_GEOMETRY
+    tables = _board_tables.get(geometry)
+    if tables is None:
+        rows, cols, connect_n = geometry
+        if not (
+            1 <= rows <= BOARD_MAX_ROWS and 1 <= cols <= BOARD_MAX_COLS
+        ) or not 1 < connect_n <= max(rows, cols):
+            raise ValueError(f"Invalid board geometry: {geometry}")
+        tables = _board_tables[geometry] = BoardTables(BoardGeometry(*geometry))
+    return tables
+
+
+# The default geometry's tables, also under the module-level names they have always had
+DEFAULT_BOARD_TABLES: BoardTables = board_tables(DEFAULT_GEOMETRY)
+WINDOWS: Tuple[Window, ...] = DEFAULT_BOARD_TABLES.windows
+# CELL_WINDOWS[r][c] holds the indices into WINDOWS of every window containing (r, c)
+CELL_WINDOWS: Tuple[
+    Tuple[Tuple[int, ...], ...], ...
+] = DEFAULT_BOARD_TABLES.cell_windows
+BIT_ROW_STRIDE: int = DEFAULT_BOARD_TABLES.row_stride
+BIT_DIRECTIONS: Tuple[int, ...] = DEFAULT_BOARD_TABLES.bit_directions
+WINDOW_MASKS: List[int] = DEFAULT_BOARD_TABLES.window_masks
+FULL_BOARD_MASK: int = DEFAULT_BOARD_TABLES.full_board_mask
+ZOBRIST_KEYS: Dict[str, List[int]] = DEFAULT_BOARD_TABLES.zobrist_keys
+ZOBRIST_SIDE_KEY: int = DEFAULT_BOARD_TABLES.zobrist_side_key
+
+
+def cell_bit(row_idx: int, col_idx: int) -> int:
+    """Returns the single-bit mask for the cell at (row_idx, col_idx) on the default geometry."""
+    return 1 << (row_idx * BIT_ROW_STRIDE + col_idx)
+
+
+def bits_have_connect_n(bits: int, tables: BoardTables = DEFAULT_BOARD_TABLES) -> bool:
+    """Shift-and-mask check for connect_n set bits in a line in any direction."""
+    connect_n = tables.connect_n
+    for shift in tables.bit_directions:
+        line = bits
+        for i in range(1, connect_n):
+            line &= bits >> (shift * i)
+            if not line:
+                break
+        if line:
+            return True
+    return False
+
+
+class PlacedMove(NamedTuple):
+    """What BitBoard.make_move changed, so that undo_move can put it back."""
+
+    row: int
+    col: int
+    side: str
+    player: str
+    previous_fill: int  # The row's left or right frontier before the move
+
+
+class BitBoard:
+    """
+    Integer-bitboard position: one bitboard per player plus a per-row fill frontier.
+
+    left_fill[r] is the column a left push into row r lands in and right_fill[r]
+    the column a right push lands in; the row is full once left_fill[r] > right_fill[r].
+    zobrist_hash is kept up to date incrementally as pieces are placed.
+    tables are the BoardTables of the position's geometry (the default one
+    unless given). Use from_board()/to_board() to convert at the API boundary,
+    where the List[List[Optional[str]]] form is still what gets stored and broadcast.
+    """
+
+    __slots__ = (
+        "x_bits",
+        "o_bits",
+        "left_fill",
+        "right_fill",
+        "zobrist_hash",
+        "tables",
+    )
+
+    def __init__(self, geometry: Optional[BoardGeometry] = None):
+        tables = board_tables(geometry)
+        self.tables: BoardTables = tables
+        self.x_bits: int = 0
+        self.o_bits: int = 0
+        self.zobrist_hash: int = 0
+        self.left_fill: List[int] = [0] * tables.rows
+        self.right_fill: List[int] = [tables.cols - 1] * tables.rows
+
+    @property
+    def geometry(self) -> BoardGeometry:
+        return self.tables.geometry
+
+    @classmethod
+    def from_board(
+        cls, board: Board, geometry: Optional[BoardGeometry] = None
+    ) -> "BitBoard":
+        """
+        Builds a BitBoard from the list-of-lists board form. Without a geometry
+        the board's own size and CONNECT_N are assumed.
+        """
+        position = cls(geometry if geometry is not None else geometry_of(board))
+        tables = position.tables
+        stride = tables.row_stride
+        for r in range(tables.rows):
+            row = board[r]
+            for c in range(tables.cols):
+                if row[c] == PLAYER_X:
+                    position.x_bits |= 1 << (r * stride + c)
+                elif row[c] == PLAYER_O:
+                    position.o_bits |= 1 << (r * stride + c)
+                else:
+                    continue
+                position.zobrist_hash ^= tables.zobrist_keys[row[c]][r * stride + c]
+            left = 0
+            while left < tables.cols and row[left] != EMPTY_CELL:
+                left += 1
+            right = tables.cols - 1
+            while right >= 0 and row[right] != EMPTY_CELL:
+                right -= 1
+            position.left_fill[r] = left
+            position.right_fill[r] = right
+        return position
+
+    def to_board(self) -> Board:
+        """Converts back to the list-of-lists board form."""
+        tables = self.tables
+        board = create_board(tables.geometry)
+        for r in range(tables.rows):
+            for c in range(tables.cols):
+                bit = tables.cell_bit(r, c)
+                if self.x_bits & bit:
+                    board[r][c] = PLAYER_X
+                elif self.o_bits & bit:
+                    board[r][c] = PLAYER_O
+        return board
+
+    def copy(self) -> "BitBoard":
+        clone = BitBoard.__new__(BitBoard)
+        clone.tables = self.tables
+        clone.x_bits = self.x_bits
+        clone.o_bits = self.o_bits
+        clone.zobrist_hash = self.zobrist_hash
+        clone.left_fill = self.left_fill[:]
+        clone.right_fill = self.right_fill[:]
+        return clone
+
+    def bits_for(self, player: str) -> int:
+        return self.x_bits if player == PLAYER_X else self.o_bits
+
+    def is_valid_move(self, row_idx: int, side: str) -> bool:
+        """O(1) equivalent of the module-level is_valid_move."""
+        if not (0 <= row_idx < len(self.left_fill)) or side not in ("L", "R"):
+            return False
+        return self.left_fill[row_idx] <= self.right_fill[row_idx]
+
+    def valid_moves(self) -> List[Tuple[int, str]]:
+        """All legal (row, side) moves, in the same order the bots have always generated them."""
+        left_fill, right_fill = self.left_fill, self.right_fill
+        moves = []
+        for r in range(len(left_fill)):
+            if left_fill[r] <= right_fill[r]:
+                moves.append((r, "L"))
+                moves.append((r, "R"))
+        return moves
+
+    def apply_move(
+        self, row_idx: int, side: str, player: str
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Places the player's piece from the given side.
+        Returns the (row, col) of the placed piece, or None if the move is invalid.
+        """
+        if not self.is_valid_move(row_idx, side):
+            return None
+        tables = self.tables
+        left = self.left_fill[row_idx]
+        right = self.right_fill[row_idx]
+        col_idx = left if side == "L" else right
+        bit_index = row_idx * tables.row_stride + col_idx
+        if player == PLAYER_X:
+            self.x_bits |= 1 << bit_index
+        else:
+            self.o_bits |= 1 << bit_index
+        self.zobrist_hash ^= tables.zobrist_keys[player][bit_index]
+
+        # Advance the frontier past any cells that are already occupied. For boards
+        # built by play this is a single step; hand-made boards may contain gaps.
+        occupied = self.x_bits | self.o_bits
+        if side == "L":
+            left = col_idx + 1
+            while left <= right and occupied & tables.cell_bit(row_idx, left):
+                left += 1
+            self.left_fill[row_idx] = left
+        else:
+            right = col_idx - 1
+            while right >= left and occupied & tables.cell_bit(row_idx, right):
+                right -= 1
+            self.right_fill[row_idx] = right
+        return (row_idx, col_idx)
+
+    def make_move(self, row_idx: int, side: str, player: str) -> Optional[PlacedMove]:
+        """
+        In-place counterpart of apply_move for searches: returns the record that
+        undo_move needs, or None if the row is full. row_idx and side are assumed
+        to come from valid_moves(), so they are not range-checked here.
+        """
+        left = self.left_fill[row_idx]
+        right = self.right_fill[row_idx]
+        if left > right:
+            return None
+        tables = self.tables
+        col_idx = left if side == "L" else right
+        bit_index = row_idx * tables.row_stride + col_idx
+        if player == PLAYER_X:
+            self.x_bits |= 1 << bit_index
+        else:
+            self.o_bits |= 1 << bit_index
+        self.zobrist_hash ^= tables.zobrist_keys[player][bit_index]
+
+        # Same frontier walk as apply_move, so hand-made boards with gaps stay correct
+        occupied = self.x_bits | self.o_bits
+        if side == "L":
+            fill = col_idx + 1
+            while fill <= right and occupied >> (bit_index + fill - col_idx) & 1:
+                fill += 1
+            self.left_fill[row_idx] = fill
+        else:
+            fill = col_idx - 1
+            while fill >= left and occupied >> (bit_index + fill - col_idx) & 1:
+                fill -= 1
+            self.right_fill[row_idx] = fill
+        return PlacedMove(row_idx, col_idx, side, player, col_idx)
+
+    def undo_move(self, move: PlacedMove):
+        """Takes back the move make_move returned, restoring hash and frontier."""
+        tables = self.tables
+        bit_index = move.row * tables.row_stride + move.col
+        if move.player == PLAYER_X:
+            self.x_bits &= ~(1 << bit_index)
+        else:
+            self.o_bits &= ~(1 << bit_index)
+        self.zobrist_hash ^= tables.zobrist_keys[move.player][bit_index]
+        if move.side == "L":
+            self.left_fill[move.row] = move.previous_fill
+        else:
+            self.right_fill[move.row] = move.previous_fill
+
+    def mirrored(self) -> "BitBoard":
+        """
+        The left/right mirror image (column c <-> cols - 1 - c). A move (row, side)
+        here corresponds to (row, mirror_side(side)) in the mirrored position.
+        """
+        return self.transformed(SYMMETRY_MIRROR)
+
+    def transformed(self, transform: int) -> "BitBoard":
+        """
+        The position under one of the SYMMETRIES. A move here corresponds to
+        transform_move(move, transform) in the result.
+        """
+        tables = self.tables
+        image = BitBoard(tables.geometry)
+        bit_map = tables.symmetry_bit_index[transform]
+        for player in (PLAYER_X, PLAYER_O):
+            keys = tables.zobrist_keys[player]
+            bits = self.bits_for(player)
+            image_bits = 0
+            while bits:
+                low = bits & -bits
+                image_index = bit_map[low.bit_length() - 1]
+                image_bits |= 1 << image_index
+                image.zobrist_hash ^= keys[image_index]
+                bits ^= low
+            if player == PLAYER_X:
+                image.x_bits = image_bits
+            else:
+                image.o_bits = image_bits
+        rows, cols = tables.rows, tables.cols
+        for r in range(rows):
+            image_r = rows - 1 - r if transform & SYMMETRY_FLIP_ROWS else r
+            if transform & SYMMETRY_MIRROR:
+                image.left_fill[image_r] = cols - 1 - self.right_fill[r]
+                image.right_fill[image_r] = cols - 1 - self.left_fill[r]
+            else:
+                image.left_fill[image_r] = self.left_fill[r]
+                image.right_fill[image_r] = self.right_fill[r]
+        return image
+
+    def symmetry_hashes(self) -> Tuple[int, ...]:
+        """zobrist_hash of the position under each of the SYMMETRIES, in that order."""
+        tables = self.tables
+        bit_index_maps = tables.symmetry_bit_index
+        hashes = [0] * len(SYMMETRIES)
+        for player in (PLAYER_X, PLAYER_O):
+            keys = tables.zobrist_keys[player]
+            bits = self.bits_for(player)
+            while bits:
+                low = bits & -bits
+                bit_index = low.bit_length() - 1
+                for transform in SYMMETRIES:
+                    hashes[transform] ^= keys[bit_index_maps[transform][bit_index]]
+                bits ^= low
+        return tuple(hashes)
+
+    def check_win(self, player: str) -> bool:
+        return bits_have_connect_n(self.bits_for(player), self.tables)
+
+    def is_full(self) -> bool:
+        return (self.x_bits | self.o_bits) == self.tables.full_board_mask
+
+
+def canonical_hash(position: BitBoard) -> Tuple[int, int]:
+    """
+    (key, transform): the smallest Zobrist hash over the position's symmetry class
+    and the transform that reaches it. Every position of the class gets the same
+    key, so tables keyed on it hold one entry per class.
+    """
+    hashes = position.symmetry_hashes()
+    transform = min(SYMMETRIES, key=hashes.__getitem__)
+    return hashes[transform], transform
+
+
+def canonical_position(position: BitBoard) -> Tuple[BitBoard, int]:
+    """The canonical member of position's symmetry class and the transform to it."""
+    _, transform = canonical_hash(position)
+    return position.transformed(transform), transform
+
+
+def canonicalize_board(
+    board: Board, geometry: Optional[BoardGeometry] = None
+) -> Tuple[Board, int]:
+    """canonical_position for the list-of-lists form: (canonical board, transform)."""
+    position, transform = canonical_position(BitBoard.from_board(board, geometry))
+    return position.to_board(), transform
+
+
 if __name__ == '__main__':
     # --- Existing Test Cases from Step 1.1 ---
     game_board = create_board()
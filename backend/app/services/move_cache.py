@@ -0,0 +1,373 @@
+# backend/app/services/move_cache.py
+import sqlite3
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core import constants
+from app.services.ai.base_bot import (
+    MOVE_SOURCE_CACHE,
+    MOVE_SOURCE_ENDGAME,
+    MOVE_SOURCE_SEARCH,
+    BaseBot,
+    GameLogicBoard,
+    SearchStats,
+)
+from app.services.ai.opening_book import decode_move, encode_move
+from app.services.ai_executor import ai_executor
+from app.services.game_logic import (
+    DEFAULT_GEOMETRY,
+    BitBoard,
+    BoardGeometry,
+    canonical_hash,
+    transform_move,
+)
+
+from app.core.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+Move = Tuple[int, str]
+# (canonical Zobrist hash, side to move, difficulty, search depth); the difficulty
+# is tagged with the board geometry for any geometry but the default one
+MoveCacheKey = Tuple[int, str, str, int]
+
+# Only searched results are worth keeping: forced and book moves are cheaper to
+# redo than to look up, and rule-based or Monte Carlo bots are meant to vary
+CACHEABLE_SOURCES: Tuple[str, ...] = (MOVE_SOURCE_SEARCH, MOVE_SOURCE_ENDGAME)
+
+
+class MoveCacheEntry(NamedTuple):
+    move: Move  # In the canonical orientation of the key
+    score: Optional[float]
+    completed_depth: int
+    stored_at: float  # time.time(), so entries from a shared store age the same everywhere
+
+
+class MoveCacheStore(ABC):
+    """Backing store shared by several processes, consulted on a local miss."""
+
+    @abstractmethod
+    def get(self, key: MoveCacheKey) -> Optional[MoveCacheEntry]:
+        pass
+
+    @abstractmethod
+    def put(self, key: MoveCacheKey, entry: MoveCacheEntry):
+        pass
+
+
+class SQLiteMoveCacheStore(MoveCacheStore):
+    """
+    Shared store in a SQLite file, for several server workers on one host.
+
+    Each process opens its own connection on first use. A failing store is
+    logged and treated as a miss: the cache must never cost a move.
+    """
+
+    PRUNE_EVERY_PUTS: int = 1000
+
+    def __init__(self, path: str, ttl_seconds: float):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._connection: Optional[sqlite3.Connection] = None
+        self._puts = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(
+                self.path, timeout=1.0, isolation_level=None
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS move_cache ("
+                "key TEXT PRIMARY KEY, move INTEGER, score REAL, depth INTEGER, stored_at REAL)"
+            )
+        return self._connection
+
+    @staticmethod
+    def _text_key(key: MoveCacheKey) -> str:
+        # SQLite integers are signed 64-bit; the hash is unsigned, so keys are text
+        position_hash, player, difficulty, depth = key
+        return f"{position_hash:016x}:{player}:{difficulty}:{depth}"
+
+    def get(self, key: MoveCacheKey) -> Optional[MoveCacheEntry]:
+        try:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT move, score, depth, stored_at FROM move_cache WHERE key = ?",
+                    (self._text_key(key),),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Move cache store {self.path} unavailable ({e})")
+            return None
+        if row is None:
+            return None
+        code, score, depth, stored_at = row
+        return MoveCacheEntry(decode_move(code), score, depth, stored_at)
+
+    def put(self, key: MoveCacheKey, entry: MoveCacheEntry):
+        try:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO move_cache VALUES (?, ?, ?, ?, ?)",
+                (
+                    self._text_key(key),
+                    encode_move(entry.move),
+                    entry.score,
+                    entry.completed_depth,
+                    entry.stored_at,
+                ),
+            )
+            self._puts += 1
+            if self._puts % self.PRUNE_EVERY_PUTS == 0:
+                connection.execute(
+                    "DELETE FROM move_cache WHERE stored_at < ?",
+                    (time.time() - self.ttl_seconds,),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Move cache store {self.path} unavailable ({e})")
+
+
+class MoveCache:
+    """
+    Process-wide LRU cache of searched AI moves, shared by every game.
+
+    Keyed on (canonical position hash, side to move, difficulty, search depth).
+    Only results that completed the key's depth are stored or served, so a
+    time-budgeted search that stopped short never stands in for a full one.
+    A position, its left/right mirror and its row reversal share one entry (see
+    game_logic.canonical_hash) and the move is mapped back on lookup. Entries
+    expire ttl_seconds after they were stored; beyond max_entries the least
+    recently used entry is dropped. An optional MoveCacheStore lets several
+    processes fill and read one cache.
+
+    Hits, misses, evictions, size and an estimate of the memory held are
+    reported through app.core.metrics under "move_cache.*".
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        store: Optional[MoveCacheStore] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.store = store
+        self._clock = clock
+        self._entries: "OrderedDict[MoveCacheKey, MoveCacheEntry]" = OrderedDict()
+        self._entry_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls) -> "MoveCache":
+        store = None
+        if settings.AI_MOVE_CACHE_STORE_PATH:
+            store = SQLiteMoveCacheStore(
+                settings.AI_MOVE_CACHE_STORE_PATH, settings.AI_MOVE_CACHE_TTL_SECONDS
+            )
+        return cls(
+            max_entries=settings.AI_MOVE_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.AI_MOVE_CACHE_TTL_SECONDS,
+            store=store,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def memory_bytes(self) -> int:
+        """Rough size of the cached keys and entries plus the dict holding them."""
+        return sys.getsizeof(self._entries) + self._entry_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key_for(
+        position: BitBoard, player: str, difficulty: str, depth: int
+    ) -> Tuple[MoveCacheKey, int]:
+        """(key, transform): the key describes position under transform."""
+        position_hash, transform = canonical_hash(position)
+        geometry = position.geometry
+        if geometry != DEFAULT_GEOMETRY:
+            # Positions of different geometries can share a hash
+            rows, cols, connect_n = geometry
+            difficulty = f"{difficulty}@{rows}x{cols}/{connect_n}"
+        return (position_hash, player, difficulty, depth), transform
+
+    @staticmethod
+    def _size_of(key: MoveCacheKey, entry: MoveCacheEntry) -> int:
+        return sys.getsizeof(key) + sys.getsizeof(entry) + sys.getsizeof(entry.move)
+
+    def _insert(self, key: MoveCacheKey, entry: MoveCacheEntry):
+        self._remove(key)
+        self._entries[key] = entry
+        self._entry_bytes += self._size_of(key, entry)
+        while len(self._entries) > self.max_entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            metrics.increment("move_cache.evictions")
+
+    def _remove(self, key: MoveCacheKey):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._entry_bytes -= self._size_of(key, entry)
+
+    def _expired(self, entry: MoveCacheEntry) -> bool:
+        return self._clock() - entry.stored_at > self.ttl_seconds
+
+    def _find(self, key: MoveCacheKey) -> Optional[MoveCacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if not self._expired(entry):
+                self._entries.move_to_end(key)
+                return entry
+            self._remove(key)
+            metrics.increment("move_cache.expirations")
+        if self.store is not None:
+            entry = self.store.get(key)
+            if entry is not None and not self._expired(entry):
+                metrics.increment("move_cache.store_hits")
+                self._insert(key, entry)
+                return entry
+        return None
+
+    def lookup(
+        self,
+        board: GameLogicBoard,
+        player: str,
+        difficulty: str,
+        depth: int,
+        geometry: Optional[BoardGeometry] = None,
+    ) -> Optional[Tuple[Move, MoveCacheEntry]]:
+        """The cached move for player on board (in board's orientation), or None."""
+        if not self.enabled:
+            return None
+        position = BitBoard.from_board(board, geometry)
+        key, transform = self.key_for(position, player, difficulty, depth)
+        entry = self._find(key)
+        move = None
+        if entry is not None and entry.completed_depth >= depth:
+            move = transform_move(entry.move, transform, position.geometry)
+            # A Zobrist collision must never yield an illegal move
+            if not position.is_valid_move(*move):
+                move = None
+        if move is None:
+            self.misses += 1
+            metrics.increment("move_cache.misses")
+        else:
+            self.hits += 1
+            metrics.increment("move_cache.hits")
+        self._report()
+        return (move, entry) if move is not None else None
+
+    def store_move(
+        self,
+        board: GameLogicBoard,
+        player: str,
+        difficulty: str,
+        depth: int,
+        move: Move,
+        stats: SearchStats,
+        geometry: Optional[BoardGeometry] = None,
+    ):
+        """
+        Caches a searched move that completed depth; a deeper unexpired result
+        for the key is kept.
+        """
+        if not self.enabled or stats.source not in CACHEABLE_SOURCES:
+            return
+        completed_depth = stats.completed_depth
+        if stats.source == MOVE_SOURCE_ENDGAME:
+            # Solved to the end of the game, which is as deep as any depth asks
+            completed_depth = max(completed_depth, depth)
+        if completed_depth < depth:
+            return
+        position = BitBoard.from_board(board, geometry)
+        key, transform = self.key_for(position, player, difficulty, depth)
+        current = self._entries.get(key)
+        if (
+            current is not None
+            and not self._expired(current)
+            and current.completed_depth > completed_depth
+        ):
+            return
+        entry = MoveCacheEntry(
+            transform_move(move, transform, position.geometry),
+            stats.score,
+            completed_depth,
+            self._clock(),
+        )
+        self._insert(key, entry)
+        if self.store is not None:
+            self.store.put(key, entry)
+        self._report()
+
+    def clear(self):
+        self._entries.clear()
+        self._entry_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._report()
+
+    def _report(self):
+        metrics.set_gauge("move_cache.entries", len(self._entries))
+        metrics.set_gauge("move_cache.memory_bytes", self.memory_bytes)
+        metrics.set_gauge("move_cache.hit_rate", self.hit_rate)
+
+
+async def compute_move_cached(
+    game_id: str, bot: BaseBot, difficulty: Optional[str], board: GameLogicBoard
+) -> Tuple[Optional[Move], SearchStats]:
+    """
+    ai_executor.compute_move_with_stats behind move_cache, for the difficulties in
+    AI_MOVE_CACHE_DIFFICULTIES and unseeded bots. A hit skips the executor
+    entirely and reports SearchStats with source "cache". Raises what
+    compute_move_with_stats raises.
+    """
+    depth = getattr(bot, "search_depth", None)
+    if (
+        difficulty not in constants.AI_MOVE_CACHE_DIFFICULTIES
+        or depth is None
+        # A seeded game replays its own bots' moves, not another game's
+        or bot.seed is not None
+    ):
+        return await ai_executor.compute_move_with_stats(game_id, bot, board)
+
+    started = time.perf_counter()
+    cached = move_cache.lookup(board, bot.player_piece, difficulty, depth, bot.geometry)
+    if cached is not None:
+        move, entry = cached
+        return move, SearchStats(
+            source=MOVE_SOURCE_CACHE,
+            elapsed_seconds=time.perf_counter() - started,
+            completed_depth=entry.completed_depth,
+            principal_variation=(move,),
+            score=entry.score,
+        )
+
+    move, stats = await ai_executor.compute_move_with_stats(game_id, bot, board)
+    if move is not None:
+        move_cache.store_move(
+            board, bot.player_piece, difficulty, depth, move, stats, bot.geometry
+        )
+    return move, stats
+
+
+# Singleton cache shared by every game in this process
+move_cache = MoveCache.from_settings()
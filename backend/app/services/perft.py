@@ -0,0 +1,322 @@
+# backend/app/services/perft.py
+"""
+Perft: counts the move sequences of exactly depth plies from a position, using
+nothing but the move generation, move application and win detection of one
+board backend, so rule changes and speed-ups of those functions can be checked
+against known counts and timed on their own, apart from any bot search.
+
+A game that is won or drawn has no moves, as in chess perft: a sequence that
+ends the game before depth plies is not counted in nodes (only in wins/draws).
+A row with one empty cell has two moves, L and R, landing on the same cell;
+both are counted, since both are legal moves.
+
+    python -m app.services.perft --position start --depths 1 2 3 4
+    python -m app.services.perft --position midgame --depths 4 --divide
+"""
+import argparse
+import sys
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from app.services.game_logic import (
+    BitBoard,
+    Board,
+    BoardGeometry,
+    DEFAULT_GEOMETRY,
+    apply_move,
+    check_draw,
+    check_win,
+    create_board,
+    is_valid_move,
+    undo_move,
+)
+from app.core.constants import BOARD_VARIANTS, PLAYER_O, PLAYER_X
+
+from app.core.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+Move = Tuple[int, str]
+
+PERFT_BACKEND_LIST: str = "list"  # The list-of-lists functions (the API's rules)
+PERFT_BACKEND_BITBOARD: str = "bitboard"  # BitBoard, as the bots search it
+PERFT_BACKENDS: Tuple[str, ...] = (PERFT_BACKEND_LIST, PERFT_BACKEND_BITBOARD)
+
+
+class PerftPosition(NamedTuple):
+    """A start position: moves played from the empty board, X first."""
+
+    geometry: BoardGeometry
+    moves: Tuple[Move, ...]
+
+
+# Reference positions; the known counts for them live in tests/test_perft.py
+PERFT_POSITIONS: Dict[str, PerftPosition] = {
+    "start": PerftPosition(DEFAULT_GEOMETRY, ()),
+    # Threats on both sides, so wins show up from depth 1
+    "midgame": PerftPosition(
+        DEFAULT_GEOMETRY,
+        (
+            (3, "L"),
+            (3, "R"),
+            (3, "L"),
+            (2, "L"),
+            (3, "L"),
+            (4, "R"),
+            (2, "L"),
+            (4, "R"),
+            (1, "L"),
+            (4, "R"),
+        ),
+    ),
+    # Six empty cells left, so draws show up too
+    "endgame": PerftPosition(
+        BoardGeometry(*BOARD_VARIANTS["COMPACT"]),
+        (
+            (4, "R"),
+            (2, "L"),
+            (5, "R"),
+            (2, "R"),
+            (5, "R"),
+            (5, "R"),
+            (5, "L"),
+            (4, "L"),
+            (0, "L"),
+            (3, "R"),
+            (1, "R"),
+            (5, "L"),
+            (0, "L"),
+            (1, "L"),
+            (0, "R"),
+            (2, "R"),
+            (3, "R"),
+            (1, "R"),
+            (3, "L"),
+            (4, "L"),
+            (0, "R"),
+            (4, "R"),
+            (1, "R"),
+            (0, "L"),
+            (5, "R"),
+            (1, "R"),
+            (3, "L"),
+            (2, "L"),
+            (1, "L"),
+            (3, "L"),
+            (1, "L"),
+            (0, "R"),
+            (2, "L"),
+            (5, "R"),
+            (4, "R"),
+            (2, "L"),
+        ),
+    ),
+    "large": PerftPosition(
+        BoardGeometry(*BOARD_VARIANTS["LARGE"]), ((4, "L"), (4, "R"))
+    ),
+}
+
+
+class PerftResult(NamedTuple):
+    nodes: int  # Positions reached after exactly depth plies
+    wins: int  # Moves that won the game, at any ply up to depth
+    draws: int  # Moves that filled the board without a win
+
+
+class PerftTiming(NamedTuple):
+    backend: str
+    depth: int
+    result: PerftResult
+    seconds: float
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.result.nodes / self.seconds if self.seconds else 0.0
+
+
+def _other(player: str) -> str:
+    return PLAYER_O if player == PLAYER_X else PLAYER_X
+
+
+def position_board(position: PerftPosition) -> Tuple[Board, str]:
+    """(board, side to move) after position's moves."""
+    board = create_board(position.geometry)
+    player = PLAYER_X
+    for row_idx, side in position.moves:
+        if apply_move(board, row_idx, side, player) is None:
+            raise ValueError(f"illegal move {row_idx}{side} in perft position")
+        player = _other(player)
+    return board, player
+
+
+def _list_moves(board: Board) -> List[Move]:
+    return [
+        (row_idx, side)
+        for row_idx in range(len(board))
+        for side in ("L", "R")
+        if is_valid_move(board, row_idx, side)
+    ]
+
+
+def _perft_list(
+    board: Board, player: str, depth: int, geometry: BoardGeometry, counts: List[int]
+) -> int:
+    if depth == 0:
+        return 1
+    nodes = 0
+    opponent = _other(player)
+    for row_idx, side in _list_moves(board):
+        placed = apply_move(board, row_idx, side, player)
+        if check_win(board, player, placed, geometry):
+            counts[0] += 1
+            nodes += depth == 1
+        elif check_draw(board):
+            counts[1] += 1
+            nodes += depth == 1
+        elif depth == 1:
+            nodes += 1
+        else:
+            nodes += _perft_list(board, opponent, depth - 1, geometry, counts)
+        undo_move(board, placed)
+    return nodes
+
+
+def _perft_bitboard(
+    position: BitBoard, player: str, depth: int, counts: List[int]
+) -> int:
+    if depth == 0:
+        return 1
+    nodes = 0
+    opponent = _other(player)
+    for row_idx, side in position.valid_moves():
+        placed = position.make_move(row_idx, side, player)
+        if position.check_win(player):
+            counts[0] += 1
+            nodes += depth == 1
+        elif position.is_full():
+            counts[1] += 1
+            nodes += depth == 1
+        elif depth == 1:
+            nodes += 1
+        else:
+            nodes += _perft_bitboard(position, opponent, depth - 1, counts)
+        position.undo_move(placed)
+    return nodes
+
+
+def perft(
+    board: Board,
+    player: str,
+    depth: int,
+    geometry: Optional[BoardGeometry] = None,
+    backend: str = PERFT_BACKEND_LIST,
+) -> PerftResult:
+    """
+    Counts from board with player to move. The board is left as it was; a
+    position whose game is already over counts as having no moves.
+    """
+    if backend not in PERFT_BACKENDS:
+        raise ValueError(f"unknown perft backend {backend!r}")
+    if depth < 0:
+        raise ValueError("perft depth must be non-negative")
+    geometry = geometry or DEFAULT_GEOMETRY
+    if depth and any(
+        check_win(board, piece, None, geometry) for piece in (PLAYER_X, PLAYER_O)
+    ):
+        return PerftResult(0, 0, 0)
+    counts = [0, 0]
+    if backend == PERFT_BACKEND_LIST:
+        nodes = _perft_list([row[:] for row in board], player, depth, geometry, counts)
+    else:
+        nodes = _perft_bitboard(
+            BitBoard.from_board(board, geometry), player, depth, counts
+        )
+    return PerftResult(nodes, counts[0], counts[1])
+
+
+def perft_divide(
+    board: Board,
+    player: str,
+    depth: int,
+    geometry: Optional[BoardGeometry] = None,
+    backend: str = PERFT_BACKEND_LIST,
+) -> Dict[Move, PerftResult]:
+    """perft per root move, to narrow a mismatch down to the line that causes it."""
+    if depth < 1:
+        raise ValueError("perft divide needs depth >= 1")
+    geometry = geometry or DEFAULT_GEOMETRY
+    divided = {}
+    for row_idx, side in _list_moves(board):
+        child = [row[:] for row in board]
+        placed = apply_move(child, row_idx, side, player)
+        if check_win(child, player, placed, geometry):
+            divided[(row_idx, side)] = PerftResult(int(depth == 1), 1, 0)
+        elif check_draw(child):
+            divided[(row_idx, side)] = PerftResult(int(depth == 1), 0, 1)
+        else:
+            divided[(row_idx, side)] = perft(
+                child, _other(player), depth - 1, geometry, backend
+            )
+    return divided
+
+
+def time_perft(
+    board: Board,
+    player: str,
+    depth: int,
+    geometry: Optional[BoardGeometry] = None,
+    backends: Sequence[str] = PERFT_BACKENDS,
+    clock: Callable[[], float] = time.perf_counter,
+) -> List[PerftTiming]:
+    """Runs perft once per backend and times it."""
+    timings = []
+    for backend in backends:
+        started = clock()
+        result = perft(board, player, depth, geometry, backend)
+        timings.append(PerftTiming(backend, depth, result, clock() - started))
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Count and time move generation (perft)."
+    )
+    parser.add_argument("--position", choices=sorted(PERFT_POSITIONS), default="start")
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 2, 3, 4])
+    parser.add_argument(
+        "--backends", nargs="+", choices=PERFT_BACKENDS, default=list(PERFT_BACKENDS)
+    )
+    parser.add_argument(
+        "--divide", action="store_true", help="Counts per root move at the last depth."
+    )
+    args = parser.parse_args()
+
+    position = PERFT_POSITIONS[args.position]
+    board, player = position_board(position)
+    logger.info(f"perft {args.position} {tuple(position.geometry)}, {player} to move")
+    mismatches = 0
+    for depth in args.depths:
+        timings = time_perft(board, player, depth, position.geometry, args.backends)
+        for timing in timings:
+            nodes, wins, draws = timing.result
+            logger.info(
+                f"depth {depth} {timing.backend:>8}: nodes={nodes} wins={wins} draws={draws} "
+                f"{timing.seconds:.3f}s {timing.nodes_per_second:.0f} nodes/s"
+            )
+        if len({timing.result for timing in timings}) > 1:
+            logger.error(f"depth {depth}: backends disagree")
+            mismatches += 1
+    if args.divide:
+        for backend in args.backends:
+            divided = perft_divide(
+                board, player, args.depths[-1], position.geometry, backend
+            )
+            for (row_idx, side), result in divided.items():
+                logger.info(
+                    f"{backend} {row_idx}{side}: {result.nodes} {result.wins} {result.draws}"
+                )
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
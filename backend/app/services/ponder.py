@@ -0,0 +1,227 @@
+# backend/app/services/ponder.py
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.ai.base_bot import BaseBot, GameLogicBoard
+from app.services.ai.batch_eval import get_batch_evaluator, positions_to_array
+from app.services.ai.hard_bot import HardAIBot
+from app.services.ai_executor import (
+    AIExecutor,
+    AIExecutorError,
+    AIExecutorOverloadedError,
+    ai_executor,
+)
+from app.services.game_logic import BitBoard, BoardGeometry, apply_move
+
+from app.core.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+Move = Tuple[int, str]
+BoardKey = Tuple[Tuple[Optional[str], ...], ...]
+
+# Ponder searches are registered with the executor under their own id so that
+# cancelling a game's live search never takes its ponder searches with it (and back)
+PONDER_GAME_ID_SUFFIX: str = ":ponder"
+
+
+def board_key(board: GameLogicBoard) -> BoardKey:
+    return tuple(tuple(row) for row in board)
+
+
+def rank_replies(
+    board: GameLogicBoard, human_piece: str, geometry: Optional[BoardGeometry] = None
+) -> List[Move]:
+    """
+    Orders the human's legal replies from most to least likely, judged by the
+    Hard evaluation from the human's side one ply ahead. Replies that win on the
+    spot are dropped: the game ends there and the AI never has to answer them.
+    """
+    position = BitBoard.from_board(board, geometry)
+    replies = []
+    children = []
+    for row, side in position.valid_moves():
+        child = position.copy()
+        child.apply_move(row, side, human_piece)
+        if child.check_win(human_piece):
+            continue
+        replies.append((row, side))
+        children.append(child)
+    if not children:
+        return []
+    # All replies scored in one batch call
+    evaluator = get_batch_evaluator(HardAIBot, position.geometry)
+    scores = evaluator.evaluate(
+        positions_to_array(children, position.geometry), human_piece
+    )
+    scored = sorted(
+        zip(scores.tolist(), replies), key=lambda item: item[0], reverse=True
+    )
+    return [move for _, move in scored]
+
+
+class PonderSession:
+    """Background search state for one game while the human is thinking."""
+
+    def __init__(self, game_id: str):
+        self.game_id = game_id
+        self.results: Dict[BoardKey, Optional[Move]] = {}
+        self.current_key: Optional[BoardKey] = None
+        self.current_future: Optional[asyncio.Future] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def executor_id(self) -> str:
+        return f"{self.game_id}{PONDER_GAME_ID_SUFFIX}"
+
+
+class PonderManager:
+    """
+    Searches the AI's answers to the human's likely replies during the human's turn.
+
+    After the AI moves, start() walks the human's replies (most likely first) and
+    computes the AI's answer to each in the AI executor, one at a time. When the
+    human's move arrives, take_result() returns the pondered answer if that reply
+    was covered, waits for it if it is being searched right now, and otherwise
+    discards the session so the live search starts from scratch.
+
+    - At most max_games games ponder at once in this process; further games
+      simply don't ponder.
+    - A reply is only submitted while the executor has an idle worker for the
+      game, so pondering never queues ahead of a live search. Ponder searches
+      share the game's lane, so in process mode they warm the same worker's
+      tables as its live searches.
+    Hits, misses and searches are reported under "ponder.*".
+    """
+
+    def __init__(
+        self,
+        max_games: int = 4,
+        max_replies: int = 8,
+        executor: Optional[AIExecutor] = None,
+    ):
+        self.executor = executor if executor is not None else ai_executor
+        self.max_games = max_games
+        self.max_replies = max_replies
+        self._sessions: Dict[str, PonderSession] = {}
+
+    @classmethod
+    def from_settings(cls) -> "PonderManager":
+        return cls(
+            max_games=settings.AI_PONDER_MAX_GAMES,
+            max_replies=settings.AI_PONDER_MAX_REPLIES,
+        )
+
+    @property
+    def active_games(self) -> int:
+        return len(self._sessions)
+
+    def start(
+        self,
+        game_id: str,
+        bot: BaseBot,
+        board: GameLogicBoard,
+        human_piece: str,
+        ai_piece: str,
+    ) -> bool:
+        """Starts pondering the position where the human is to move. Returns False if capped."""
+        self.stop(game_id)
+        if self.max_games <= 0 or len(self._sessions) >= self.max_games:
+            metrics.increment("ponder.rejected")
+            return False
+        session = PonderSession(game_id)
+        session.task = asyncio.create_task(
+            self._ponder(session, bot, board, human_piece)
+        )
+        self._sessions[game_id] = session
+        metrics.set_gauge("ponder.active_games", len(self._sessions))
+        logger.info(f"Pondering game {game_id} for AI ({ai_piece})")
+        return True
+
+    async def _ponder(
+        self,
+        session: PonderSession,
+        bot: BaseBot,
+        board: GameLogicBoard,
+        human_piece: str,
+    ):
+        for row, side in rank_replies(board, human_piece, bot.geometry)[
+            : self.max_replies
+        ]:
+            if not self.executor.has_idle_worker(session.game_id):
+                metrics.increment("ponder.skipped_busy")
+                return
+            child = [r[:] for r in board]
+            apply_move(child, row, side, human_piece)
+            key = board_key(child)
+            session.current_key = key
+            session.current_future = asyncio.ensure_future(
+                self.executor.compute_move(
+                    session.executor_id, bot, child, affinity=session.game_id
+                )
+            )
+            try:
+                # Shielded: if the human plays this very reply, take_result keeps
+                # waiting on the search after this loop has been cancelled.
+                move = await asyncio.shield(session.current_future)
+            except AIExecutorOverloadedError:
+                return
+            except AIExecutorError as e:
+                logger.info(f"Ponder search for game {session.game_id} stopped: {e}")
+                return
+            session.results[key] = move
+            session.current_key = None
+            session.current_future = None
+            metrics.increment("ponder.searches")
+
+    async def take_result(
+        self, game_id: str, board: GameLogicBoard
+    ) -> Tuple[bool, Optional[Move]]:
+        """
+        Ends pondering for game_id and returns (found, move) for the position the
+        AI now has to answer. found is False when the reply was not pondered.
+        """
+        session = self._sessions.get(game_id)
+        if session is None:
+            return False, None
+        key = board_key(board)
+        if key in session.results:
+            self.stop(game_id)
+            metrics.increment("ponder.hits")
+            return True, session.results[key]
+        if session.current_key == key and session.current_future is not None:
+            future = session.current_future
+            session.current_future = None  # Keep stop() from cancelling it
+            self.stop(game_id)
+            try:
+                move = await future
+            except AIExecutorError:
+                metrics.increment("ponder.misses")
+                return False, None
+            metrics.increment("ponder.hits")
+            return True, move
+        self.stop(game_id)
+        metrics.increment("ponder.misses")
+        return False, None
+
+    def stop(self, game_id: str):
+        """Drops the game's session and cancels its background searches."""
+        session = self._sessions.pop(game_id, None)
+        if session is None:
+            return
+        if session.task is not None:
+            session.task.cancel()
+        if session.current_future is not None:
+            # Nobody will await it any more; retrieve the outcome so asyncio
+            # doesn't log it as never retrieved.
+            session.current_future.add_done_callback(
+                lambda f: f.cancelled() or f.exception()
+            )
+            self.executor.cancel_game(session.executor_id)
+        metrics.set_gauge("ponder.active_games", len(self._sessions))
+
+
+# Singleton shared by the PvE manager and the WebSocket endpoint
+ponder_manager = PonderManager.from_settings()
@@ -7,13 +7,19 @@ from app.websockets.connection_manager import manager  # For broadcasting
 from app.services.game_logic import (
     Board as GameLogicBoard,
     apply_move,
-    check_win,
     check_draw,
+    find_winning_line,
     create_board as service_create_board,
 )
 from app.services.ai.easy_bot import EasyAIBot
-from app.services.ai.medium_bot import MediumAIBot
-from app.services.ai.hard_bot import HardAIBot
+from app.services.ai_executor import (
+    AIExecutorError,
+    AIMoveCancelledError,
+    record_search_stats,
+)
+from app.services.bot_registry import bot_registry, difficulty_from
+from app.services.move_cache import compute_move_cached
+from app.services.ponder import ponder_manager
 from app.core import constants
 from app.db.models import Game  # For type hinting db_game
 
@@ -22,25 +28,28 @@ from app.core.logging_config import setup_logger
 logger = setup_logger(__name__)
 
 
-def _get_pve_ai_bot_instance(game_mode: str, ai_player_piece: str):
-    """Instantiates an AI bot for PVE based on game_mode and piece."""
-    game_mode_upper = game_mode.upper()
-    if constants.AI_DIFFICULTY_EASY in game_mode_upper:
-        return EasyAIBot(player_piece=ai_player_piece)
-    elif constants.AI_DIFFICULTY_MEDIUM in game_mode_upper:
-        return MediumAIBot(player_piece=ai_player_piece, search_depth=2)
-    elif constants.AI_DIFFICULTY_HARD in game_mode_upper:
-        return HardAIBot(player_piece=ai_player_piece, search_depth=4)  # Example depth
-    logger.error(f"ERROR PVE: Could not determine AI type for game_mode {game_mode}")
-    return None
+def _get_pve_min_reveal_seconds(game_mode: str) -> float:
+    """Minimum time before a PVE AI move is revealed, by difficulty."""
+    for difficulty, seconds in constants.AI_PVE_MIN_REVEAL_SECONDS.items():
+        if difficulty in game_mode.upper():
+            return seconds
+    return 0.0
 
 
 async def _handle_pve_ai_turn(db: Session, db_game: Game, active_game_id: str):
     """Handles the AI's turn in a PVE game."""
     ai_player_token = db_game.current_player_token
     ai_player_piece = constants.PLAYER_O  # AI is always P2/O in PVE
-
-    ai_bot_instance = _get_pve_ai_bot_instance(db_game.game_mode, ai_player_piece)
+    geometry = crud_game.game_geometry(db_game)
+
+    # Built on the game's first AI turn and reused until the game ends
+    ai_bot_instance = bot_registry.get_bot(
+        active_game_id,
+        ai_player_piece,
+        db_game.game_mode,
+        seed=db_game.ai_seed,
+        geometry=geometry,
+    )
 
     if not ai_bot_instance:
         logger.error(f"ERROR: PVE AI bot for mode {db_game.game_mode} not implemented.")
@@ -57,18 +66,46 @@ async def _handle_pve_ai_turn(db: Session, db_game: Game, active_game_id: str):
         return
 
     logger.info(f"PVE AI ({ai_player_piece}, {db_game.game_mode}) is thinking...")
-    # Add a small delay to simulate thinking and improve UX
-    await asyncio.sleep(
-        0.5
-        + (0.5 if constants.AI_DIFFICULTY_MEDIUM in db_game.game_mode else 0)
-        + (1.0 if constants.AI_DIFFICULTY_HARD in db_game.game_mode else 0)
-    )
+    # The "thinking" delay is a minimum reveal time that overlaps the search, so the
+    # move is released at max(search time, delay) rather than delay + search time.
+    loop = asyncio.get_running_loop()
+    reveal_at = loop.time() + _get_pve_min_reveal_seconds(db_game.game_mode)
 
     current_board: GameLogicBoard = db_game.board_state.get(
-        "board", service_create_board()
+        "board", service_create_board(geometry)
     )
-    # board_for_ai = [row[:] for row in current_board] # If AI mutates
-    ai_move_tuple = ai_bot_instance.get_move(current_board)
+    # A reply searched while the human was thinking needs no live search
+    pondered, ai_move_tuple = await ponder_manager.take_result(
+        active_game_id, current_board
+    )
+    if pondered:
+        logger.info(f"PVE AI for game {active_game_id} answered from pondering.")
+    else:
+        # The search runs in the AI executor so other games' sockets keep flowing meanwhile,
+        # unless another game already searched this position
+        try:
+            ai_move_tuple, search_stats = await compute_move_cached(
+                active_game_id,
+                ai_bot_instance,
+                difficulty_from(db_game.game_mode),
+                current_board,
+            )
+            record_search_stats(active_game_id, ai_bot_instance, search_stats)
+        except AIMoveCancelledError:
+            logger.info(f"PVE AI turn for game {active_game_id} cancelled.")
+            return
+        except AIExecutorError as e:
+            # Overloaded or too slow: fall back to the cheap bot so the game keeps moving
+            logger.warning(
+                f"PVE AI search failed for game {active_game_id} ({e}); using fallback move."
+            )
+            ai_move_tuple = EasyAIBot(
+                player_piece=ai_player_piece, geometry=geometry
+            ).get_move(current_board)
+
+    remaining_reveal_delay = reveal_at - loop.time()
+    if remaining_reveal_delay > 0:
+        await asyncio.sleep(remaining_reveal_delay)
 
     if not ai_move_tuple:
         logger.warning(
@@ -115,7 +152,10 @@ async def _handle_pve_ai_turn(db: Session, db_game: Game, active_game_id: str):
     is_game_over_this_turn = False
     next_player_token_if_active = db_game.player1_token  # Back to Human
 
-    if check_win(board_after_ai_move, ai_player_piece, ai_placed_coords):
+    winning_line = find_winning_line(
+        board_after_ai_move, ai_player_piece, ai_placed_coords, geometry
+    )
+    if winning_line:
         current_turn_status = constants.get_win_status(ai_player_piece)
         winner_for_turn = ai_player_token  # AI's token
         is_game_over_this_turn = True
@@ -142,6 +182,7 @@ async def _handle_pve_ai_turn(db: Session, db_game: Game, active_game_id: str):
 
     final_board_to_broadcast = final_db_game_state.board_state.get("board", [])
     if is_game_over_this_turn:
+        bot_registry.release_game(active_game_id)
         await manager.broadcast_game_over(
             active_game_id,
             final_board_to_broadcast,
@@ -152,6 +193,7 @@ async def _handle_pve_ai_turn(db: Session, db_game: Game, active_game_id: str):
                 if winner_for_turn != constants.DRAW_WINNER_TOKEN_VALUE
                 else None
             ),
+            winning_line=winning_line,
         )
     else:
         last_move_payload = {
@@ -167,3 +209,19 @@ async def _handle_pve_ai_turn(db: Session, db_game: Game, active_game_id: str):
             next_player_token_if_active,
             last_move_payload,
         )
+        ponder_bot_instance = bot_registry.get_ponder_bot(
+            active_game_id,
+            ai_player_piece,
+            db_game.game_mode,
+            seed=db_game.ai_seed,
+            geometry=geometry,
+        )
+        if ponder_bot_instance:
+            # Use the human's think time to search the AI's answers to their replies
+            ponder_manager.start(
+                active_game_id,
+                ponder_bot_instance,
+                final_board_to_broadcast,
+                human_piece=constants.PLAYER_X,
+                ai_piece=ai_player_piece,
+            )
@@ -1,6 +1,6 @@
 # backend/app/websockets/connection_manager.py
 from fastapi import WebSocket
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 import json
 
 from app.core import constants
@@ -197,6 +197,7 @@ class ConnectionManager:
         winning_player_piece: Optional[str],
         reason: Optional[str] = None,
         exclude_client_id: Optional[str] = None,
+        winning_line: Optional[List[Tuple[int, int]]] = None,
     ):
         payload = {
             "game_id": game_id,
@@ -205,6 +206,10 @@ class ConnectionManager:
             "winner_token": winner_token,
             "winning_player_piece": winning_player_piece,
             "reason": reason,
+            # Cells of the winning line as [row, col] pairs, null for draws/forfeits
+            "winning_line": (
+                [list(cell) for cell in winning_line] if winning_line else None
+            ),
         }
         await self.broadcast_to_game(
             {"type": constants.WS_MSG_TYPE_GAME_OVER, "payload": payload},
@@ -0,0 +1,560 @@
+# backend/tests/test_ai_bots.py
+# Test cases for the AI bots and their search helpers
+
+import random
+import time
+
+import pytest
+from app.services.game_logic import (
+    BitBoard,
+    BoardGeometry,
+    create_board,
+    apply_move,
+    is_valid_move,
+)
+from app.services.ai.base_bot import MOVE_SOURCE_FORCED, MOVE_SOURCE_SEARCH
+from app.services.ai.easy_bot import EasyAIBot
+from app.services.ai.engine import MATE_SCORE, is_mate_score
+from app.services.ai.eval_weights import center_rows, score_window
+from app.services.ai.medium_bot import MediumAIBot
+from app.services.ai.hard_bot import HardAIBot
+from app.services.ai.mcts_bot import MCTSAIBot
+from app.services.ai.root_split import split_search_root
+from app.services.ai.window_eval import WindowEvaluator
+from app.services.ai.transposition import (
+    TT_EXACT,
+    TT_LOWER_BOUND,
+    TranspositionTable,
+    get_shared_transposition_table,
+)
+from app.core.constants import (
+    PLAYER_X,
+    PLAYER_O,
+    ROWS,
+)
+
+
+def test_zobrist_hash_is_incremental():
+    rng = random.Random(11)
+    board = create_board()
+    position = BitBoard()
+    player = PLAYER_X
+    for _ in range(30):
+        moves = [
+            (r, s)
+            for r in range(ROWS)
+            for s in ("L", "R")
+            if is_valid_move(board, r, s)
+        ]
+        row, side = rng.choice(moves)
+        apply_move(board, row, side, player)
+        position.apply_move(row, side, player)
+        assert position.zobrist_hash == BitBoard.from_board(board).zobrist_hash
+        player = PLAYER_O if player == PLAYER_X else PLAYER_X
+
+
+def test_zobrist_hash_is_order_independent():
+    # Pushes into different rows commute, so both orders reach the same key
+    first, second = BitBoard(), BitBoard()
+    first.apply_move(0, "L", PLAYER_X)
+    first.apply_move(5, "R", PLAYER_O)
+    first.apply_move(2, "L", PLAYER_X)
+    second.apply_move(2, "L", PLAYER_X)
+    second.apply_move(5, "R", PLAYER_O)
+    second.apply_move(0, "L", PLAYER_X)
+    assert first.zobrist_hash == second.zobrist_hash
+    assert first.zobrist_hash != BitBoard().zobrist_hash
+
+
+def test_transposition_table_store_and_probe():
+    table = TranspositionTable(size=8)
+    assert table.probe(42) is None
+    table.store(42, 3, 150, TT_EXACT, (1, "L"))
+    entry = table.probe(42)
+    assert entry.depth == 3 and entry.score == 150 and entry.best_move == (1, "L")
+    assert table.hits == 1 and table.misses == 1
+    assert table.probe(42 + 8) is None  # Same slot, different key
+    # peek reads the same entries without touching the counters
+    assert table.peek(42) == entry and table.peek(42 + 8) is None
+    assert table.hits == 1 and table.misses == 2
+
+
+def test_transposition_table_replacement_policy():
+    table = TranspositionTable(size=8)
+    table.store(1, 5, 10, TT_EXACT, (0, "L"))
+    table.store(
+        9, 2, 20, TT_LOWER_BOUND, (0, "R")
+    )  # Shallower, same generation: rejected
+    assert table.probe(1).depth == 5
+    table.new_search()
+    table.store(9, 2, 20, TT_LOWER_BOUND, (0, "R"))  # Stored entry is stale now
+    assert table.probe(9).score == 20
+    assert table.probe(1) is None
+
+
+def test_transposition_table_size_must_be_power_of_two():
+    with pytest.raises(ValueError):
+        TranspositionTable(size=100)
+
+
+def test_shared_transposition_table_is_reused():
+    assert get_shared_transposition_table(
+        "test_shared"
+    ) is get_shared_transposition_table("test_shared")
+
+
+def _reference_score(bot, position):
+    """Window-by-window score of position for bot, straight off the weights."""
+    tables = bot.tables
+    ai_bits = position.bits_for(bot.player_piece)
+    opponent_bits = position.bits_for(bot.opponent_piece)
+    score = 0
+    for mask in tables.window_masks:
+        ai_count = (ai_bits & mask).bit_count()
+        opponent_count = (opponent_bits & mask).bit_count()
+        empty_count = tables.connect_n - ai_count - opponent_count
+        score += score_window(
+            bot.weights, ai_count, opponent_count, empty_count, tables.connect_n
+        )
+    for r in center_rows(tables.rows):
+        for c in range(tables.cols):
+            bit = tables.cell_bit(r, c)
+            score += bot.weights.center_row * (
+                bool(ai_bits & bit) - bool(opponent_bits & bit)
+            )
+    return score
+
+
+@pytest.mark.parametrize("bot_class", [MediumAIBot, HardAIBot])
+def test_incremental_evaluation_matches_full_rescan(bot_class):
+    rng = random.Random(3)
+    bot = bot_class(PLAYER_O)
+    evaluator = bot._evaluator
+    rescan = WindowEvaluator(PLAYER_O, bot._evaluate_counts, bot.cell_weights)
+    position = BitBoard()
+    evaluator.reset(position)
+    placed_pieces = []
+    player = PLAYER_X
+    for _ in range(35):
+        moves = position.valid_moves()
+        if not moves:
+            break
+        row, side = rng.choice(moves)
+        placed = position.apply_move(row, side, player)
+        evaluator.place(*placed, player)
+        placed_pieces.append((placed, player))
+        assert evaluator.score == _reference_score(bot, position)
+        rescan.reset(position)
+        assert evaluator.threat_windows == rescan.threat_windows
+        player = PLAYER_O if player == PLAYER_X else PLAYER_X
+
+    empty_score = WindowEvaluator(PLAYER_O, bot._evaluate_counts).score
+    for placed, piece in reversed(placed_pieces):
+        evaluator.remove(*placed, piece)
+    assert evaluator.score == empty_score
+    assert not any(evaluator.ai_counts) and not any(evaluator.opponent_counts)
+    assert evaluator.threat_windows == 0
+
+
+@pytest.mark.parametrize("bot_class, depth", [(MediumAIBot, 2), (HardAIBot, 3)])
+def test_bots_block_immediate_threat(bot_class, depth):
+    board = create_board()
+    for _ in range(3):
+        apply_move(board, 0, "L", PLAYER_X)  # X threatens (0, 3)
+    apply_move(board, 4, "R", PLAYER_O)
+    apply_move(board, 5, "R", PLAYER_O)
+    bot = bot_class(PLAYER_O, search_depth=depth)
+    assert bot.get_move(board) == (0, "L")
+
+
+def test_hard_bot_search_uses_transposition_table():
+    board = create_board()
+    apply_move(board, 3, "L", PLAYER_X)
+    apply_move(board, 3, "R", PLAYER_O)
+    apply_move(board, 2, "L", PLAYER_X)
+    table = TranspositionTable()
+    bot = HardAIBot(PLAYER_O, search_depth=3, transposition_table=table)
+    assert bot.get_move(board) is not None
+    assert len(table) > 0
+    # Searching the same position again is answered from the stored entries
+    assert bot.get_move(board) is not None
+    assert table.hits > 0
+
+
+@pytest.mark.parametrize("bot_class", [MediumAIBot, HardAIBot])
+def test_time_budget_bounds_think_time(bot_class):
+    board = create_board()
+    apply_move(board, 3, "L", PLAYER_X)
+    bot = bot_class(PLAYER_O, search_depth=12, time_budget=0.2)
+    started = time.monotonic()
+    move = bot.get_move(board)
+    elapsed = time.monotonic() - started
+    assert move is not None and is_valid_move(board, *move)
+    assert 1 <= bot.completed_depth < 12
+    assert elapsed < 0.2 + 0.3  # Budget plus polling slack
+
+
+def test_iterative_deepening_matches_fixed_depth_when_budget_allows():
+    board = create_board()
+    apply_move(board, 3, "L", PLAYER_X)
+    apply_move(board, 3, "R", PLAYER_O)
+    apply_move(board, 2, "L", PLAYER_X)
+    apply_move(board, 2, "L", PLAYER_X)
+
+    fixed = HardAIBot(PLAYER_O, search_depth=3)
+    deepening = HardAIBot(PLAYER_O, search_depth=3, time_budget=60)
+    position = BitBoard.from_board(board)
+    _, fixed_score = fixed._search_root(position, position.valid_moves(), 3)
+    deepening.get_move(board)
+    assert deepening.completed_depth == 3
+    _, deepening_score = deepening._search_root(position, position.valid_moves(), 3)
+    assert deepening_score == fixed_score
+
+
+def _random_position(plies, seed):
+    rng = random.Random(seed)
+    while True:
+        position = BitBoard()
+        player = PLAYER_X
+        for _ in range(plies):
+            position.apply_move(*rng.choice(position.valid_moves()), player)
+            if position.check_win(player):
+                break
+            player = PLAYER_O if player == PLAYER_X else PLAYER_X
+        else:
+            return position, player
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_parallel_root_search_matches_serial(seed):
+    position, player = _random_position(6 + seed, seed)
+    board = position.to_board()
+
+    serial = HardAIBot(player, search_depth=4, endgame_max_empty_cells=0, seed=seed)
+    serial_move = serial.get_move(board)
+    parallel = HardAIBot(
+        player, search_depth=4, endgame_max_empty_cells=0, root_workers=2, seed=seed
+    )
+    assert parallel.get_move(board) == serial_move
+
+    # Scores agree too (fresh tables: entries from a deeper search would change them)
+    root_moves = position.valid_moves()
+    serial = HardAIBot(player, search_depth=3)
+    parallel = HardAIBot(player, search_depth=3)
+    assert split_search_root(parallel, position, root_moves, 3, 3)[
+        :2
+    ] == serial._search_root(position, root_moves, 3)
+
+
+def test_parallel_root_search_respects_node_threshold(monkeypatch):
+    from app.services.ai import engine
+
+    def fail_split(*args):
+        raise AssertionError("search should have stayed serial")
+
+    monkeypatch.setattr(engine, "split_search_root", fail_split)
+    board = create_board()
+    apply_move(board, 3, "L", PLAYER_X)
+    bot = HardAIBot(
+        PLAYER_O, search_depth=3, root_workers=2, parallel_min_nodes=10**9
+    )
+    assert bot.get_move(board) is not None
+    assert bot._depth_nodes[3] > 0
+
+
+def _plain_negamax(bot, position, depth, ply):
+    """Full-width negamax with no pruning or table, scored like SearchBot.negamax."""
+    mover, previous = (
+        (bot.opponent_piece, bot.player_piece)
+        if ply % 2
+        else (bot.player_piece, bot.opponent_piece)
+    )
+    if position.check_win(previous):
+        return -(MATE_SCORE - ply)
+    if position.is_full():
+        return 0
+    if depth == 0:
+        score = _reference_score(bot, position)
+        return -score if ply % 2 else score
+    best = None
+    for move in position.valid_moves():
+        placed = position.make_move(*move, mover)
+        score = -_plain_negamax(bot, position, depth - 1, ply + 1)
+        position.undo_move(placed)
+        best = score if best is None else max(best, score)
+    return best
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_negamax_finds_the_full_width_scores_and_ties(seed):
+    position, player = _random_position(8 + 2 * seed, 100 + seed)
+    bot = HardAIBot(player, search_depth=3)
+    bot.threat_eval = False  # The reference scores every leaf with the heuristic
+    scores = {}
+    for move in position.valid_moves():
+        child = position.copy()
+        child.make_move(*move, player)
+        scores[move] = -_plain_negamax(bot, child, 2, 1)
+    best = max(scores.values())
+
+    bot._reset_ordering()
+    tied_moves, score = bot._search_root(position, position.valid_moves(), 3)
+    assert score == best
+    assert set(tied_moves) == {move for move, value in scores.items() if value == best}
+
+
+def test_wins_and_losses_score_by_distance():
+    board = create_board()
+    for _ in range(3):
+        apply_move(board, 0, "L", PLAYER_O)
+    position = BitBoard.from_board(board)
+    bot = HardAIBot(PLAYER_O, search_depth=3)
+    bot._reset_ordering()
+    tied_moves, score = bot._search_root(position, position.valid_moves(), 3)
+    assert tied_moves == [(0, "L")] and score == MATE_SCORE - 1
+
+    # The same threat held by the opponent, with two ways to complete it: lost in 2
+    board = create_board()
+    for row in (1, 2, 3):
+        apply_move(board, row, "L", PLAYER_X)
+    position = BitBoard.from_board(board)
+    bot = HardAIBot(PLAYER_O, search_depth=3)
+    bot._reset_ordering()
+    _, score = bot._search_root(position, position.valid_moves(), 3)
+    assert score == -(MATE_SCORE - 2)
+
+
+def test_threat_scan_scores_unstoppable_threats_exactly():
+    # X threatens (0, 3) and, behind it, (0, 4): blocking the first uncovers the second
+    board = create_board()
+    for col in range(3):
+        board[0][col] = PLAYER_X
+    for row in (1, 2, 3):
+        board[row][4] = PLAYER_X
+    for row, col in ((1, 0), (3, 1), (5, 0), (6, 2), (4, 6)):
+        board[row][col] = PLAYER_O
+    position = BitBoard.from_board(board)
+    bot = HardAIBot(PLAYER_O, search_depth=1)
+    bot._evaluator.reset(position)
+    assert bot._scan_threats(position, PLAYER_O, 0) == (-(MATE_SCORE - 2), ())
+    # With X to move one ply down, X wins on the next ply
+    assert bot._scan_threats(position, PLAYER_X, 1) == (MATE_SCORE - 2, ())
+
+
+def test_moves_uncovering_a_threat_are_ordered_last():
+    board = create_board()
+    for col in range(3):
+        board[0][col] = PLAYER_X
+    for row in (1, 2, 3):
+        board[row][4] = PLAYER_X
+    board[4][0] = PLAYER_X
+    for row, col in ((0, 3), (1, 0), (3, 1), (5, 0), (6, 2), (4, 6)):
+        board[row][col] = PLAYER_O
+    position = BitBoard.from_board(board)
+    bot = HardAIBot(PLAYER_O, search_depth=1)
+    bot._reset_ordering()
+    bot._evaluator.reset(position)
+    # One threat to block at (0, 4); filling (4, 5) would uncover X's win at (4, 4)
+    score, exposing = bot._scan_threats(position, PLAYER_O, 0)
+    assert score is None and exposing == ((4, "R"),)
+    ordered = bot._order_moves(position, PLAYER_O, 0, None, exposing)
+    assert ordered[0] == (0, "L") and ordered[-1] == (4, "R")
+
+
+def test_threat_eval_agrees_with_a_deeper_plain_search():
+    forced = 0
+    for seed in range(40):
+        position, player = _random_position(12 + seed % 10, 200 + seed)
+        threat_bot = HardAIBot(player, search_depth=2)
+        threat_bot._reset_ordering()
+        _, threat_score = threat_bot._search_root(position, position.valid_moves(), 2)
+        if not is_mate_score(threat_score):
+            continue
+        forced += 1
+        # Forced results are exact: searching two plies further proves the same
+        plain_bot = HardAIBot(player, search_depth=4)
+        plain_bot.threat_eval = False
+        plain_bot._reset_ordering()
+        _, plain_score = plain_bot._search_root(position, position.valid_moves(), 4)
+        assert plain_score == threat_score or (
+            threat_score > 0 and plain_score > threat_score
+        )
+    assert forced > 0
+
+
+def test_aspiration_window_recovers_from_a_wrong_guess():
+    position, player = _random_position(10, 7)
+    root_moves = position.valid_moves()
+    expected = HardAIBot(player, search_depth=4)
+    expected._reset_ordering()
+    tied_moves, score = expected._search_root(position, root_moves, 4)
+
+    for guess in (score - 10**7, score + 10**7):
+        bot = HardAIBot(player, search_depth=4)
+        bot._reset_ordering()
+        bot._depth_nodes = {}
+        move, guessed_score = bot._search_depth(position, list(root_moves), 4, guess)
+        assert guessed_score == score and move in tied_moves
+        assert bot._aspiration_researches > 0
+
+
+def test_move_ordering_searches_fewer_nodes_for_the_same_scores():
+    from app.services.ai.benchmark import benchmark_positions, run_search_benchmark
+
+    positions = benchmark_positions(4, seed=1)
+    unordered = run_search_benchmark(HardAIBot, positions, 4, move_ordering=False)
+    ordered = run_search_benchmark(HardAIBot, positions, 4, move_ordering=True)
+    assert ordered.nodes < unordered.nodes
+
+    for position, player in positions:
+        scores = []
+        for move_ordering in (False, True):
+            bot = HardAIBot(player, search_depth=4)
+            bot.move_ordering = move_ordering
+            bot._reset_ordering()
+            _, score = bot._search_root(position, position.valid_moves(), 4)
+            scores.append(score)
+        assert scores[0] == scores[1]
+
+
+def test_root_ties_are_the_only_randomness():
+    board = create_board()
+    apply_move(board, 3, "L", PLAYER_X)
+    bot = HardAIBot(PLAYER_O, search_depth=3)
+    position = BitBoard.from_board(board)
+    bot._reset_ordering()
+    tied_moves, _ = bot._search_root(position, position.valid_moves(), 3)
+    # Rows above and below row 3 mirror each other, so their moves tie exactly
+    assert len(tied_moves) > 1
+    chosen = {HardAIBot(PLAYER_O, search_depth=3).get_move(board) for _ in range(40)}
+    assert chosen == set(tied_moves)
+
+
+def test_search_stats_describe_the_search():
+    board = create_board()
+    apply_move(board, 3, "L", PLAYER_X)
+    apply_move(board, 3, "R", PLAYER_O)
+    apply_move(board, 2, "L", PLAYER_X)
+    bot = HardAIBot(PLAYER_O, search_depth=4, endgame_max_empty_cells=0)
+    move, stats = bot.get_move(board, return_stats=True)
+
+    assert stats.source == MOVE_SOURCE_SEARCH
+    assert stats.completed_depth == 4 and len(stats.depth_seconds) == 1
+    assert stats.nodes > stats.leaf_evaluations > 0
+    assert stats.tt_hits + stats.tt_misses > 0
+    assert sum(stats.cutoffs_by_ply) > 0
+    assert stats.principal_variation[0] == move
+    assert 1 < len(stats.principal_variation) <= 4
+    # The variation is a legal line from the position
+    position = BitBoard.from_board(board)
+    player = PLAYER_O
+    for row, side in stats.principal_variation:
+        assert position.is_valid_move(row, side)
+        position.apply_move(row, side, player)
+        player = PLAYER_X if player == PLAYER_O else PLAYER_O
+    assert stats.elapsed_seconds > 0 and "pv=[" in stats.summary()
+
+    # Without the flag get_move still returns just the move
+    assert bot.get_move(board) in BitBoard.from_board(board).valid_moves()
+
+
+def test_search_stats_for_forced_moves_and_deepening():
+    board = create_board()
+    for _ in range(3):
+        apply_move(board, 0, "L", PLAYER_X)
+    _, stats = MediumAIBot(PLAYER_O).get_move(board, return_stats=True)
+    assert stats.source == MOVE_SOURCE_FORCED and stats.nodes == 0
+
+    board = create_board()
+    apply_move(board, 3, "L", PLAYER_X)
+    bot = HardAIBot(PLAYER_O, search_depth=3, time_budget=60)
+    _, stats = bot.get_move(board, return_stats=True)
+    assert stats.completed_depth == 3
+    assert len(stats.depth_seconds) == 3
+
+
+@pytest.mark.parametrize(
+    "make_bot",
+    [
+        lambda seed: EasyAIBot(PLAYER_O, seed=seed),
+        lambda seed: MediumAIBot(PLAYER_O, search_depth=2, seed=seed),
+        lambda seed: HardAIBot(
+            PLAYER_O, search_depth=3, endgame_max_empty_cells=0, seed=seed
+        ),
+        lambda seed: MCTSAIBot(
+            PLAYER_O, time_budget=None, max_iterations=30, seed=seed
+        ),
+    ],
+)
+def test_same_seed_and_board_give_the_same_move_and_stats(make_bot):
+    board = create_board()
+    apply_move(board, 3, "L", PLAYER_X)
+    untimed = dict(elapsed_seconds=0.0, depth_seconds=())
+
+    move, stats = make_bot(1234).get_move(board, return_stats=True)
+    for _ in range(3):
+        again, again_stats = make_bot(1234).get_move(board, return_stats=True)
+        assert again == move
+        assert again_stats._replace(**untimed) == stats._replace(**untimed)
+
+    # A bot that has already played elsewhere still picks the same move here
+    played = make_bot(1234)
+    other = create_board()
+    apply_move(other, 0, "R", PLAYER_X)
+    played.get_move(other)
+    assert played.get_move(board) == move
+
+
+VARIANT_GEOMETRIES = [BoardGeometry(9, 9, 5), BoardGeometry(6, 7, 4)]
+
+
+@pytest.mark.parametrize("geometry", VARIANT_GEOMETRIES)
+@pytest.mark.parametrize(
+    "make_bot",
+    [
+        lambda geometry: EasyAIBot(PLAYER_O, seed=1, geometry=geometry),
+        lambda geometry: MediumAIBot(PLAYER_O, search_depth=2, geometry=geometry),
+        lambda geometry: HardAIBot(PLAYER_O, search_depth=3, geometry=geometry),
+        lambda geometry: MCTSAIBot(
+            PLAYER_O, time_budget=None, max_iterations=200, seed=1, geometry=geometry
+        ),
+    ],
+)
+def test_bots_play_other_geometries(make_bot, geometry):
+    bot = make_bot(geometry)
+    assert bot.geometry == geometry
+    # O is one piece short of a line along the first row and takes the win
+    board = create_board(geometry)
+    for row in range(geometry.connect_n - 1):
+        apply_move(board, 0, "R", PLAYER_O)
+        apply_move(board, row + 2, "L", PLAYER_X)
+    assert bot.get_move(board) == (0, "R")
+    if isinstance(bot, EasyAIBot):
+        return  # Easy does not block
+
+    # X is one piece short of a line along the last row; O must block it
+    board = create_board(geometry)
+    last_row = geometry.rows - 1
+    for _ in range(geometry.connect_n - 1):
+        apply_move(board, last_row, "L", PLAYER_X)
+    apply_move(board, 0, "R", PLAYER_O)
+    apply_move(board, 1, "R", PLAYER_O)
+    assert bot.get_move(board) == (last_row, "L")
+
+
+@pytest.mark.parametrize("geometry", VARIANT_GEOMETRIES)
+def test_incremental_evaluation_on_other_geometries(geometry):
+    rng = random.Random(4)
+    bot = HardAIBot(PLAYER_O, geometry=geometry)
+    evaluator = bot._evaluator
+    position = BitBoard(geometry)
+    evaluator.reset(position)
+    player = PLAYER_X
+    for _ in range(30):
+        moves = position.valid_moves()
+        if not moves or position.check_win(PLAYER_X) or position.check_win(PLAYER_O):
+            break
+        placed = position.apply_move(*rng.choice(moves), player)
+        evaluator.place(*placed, player)
+        assert evaluator.score == _reference_score(bot, position)
+        player = PLAYER_O if player == PLAYER_X else PLAYER_X
@@ -0,0 +1,180 @@
+# backend/tests/test_ai_executor.py
+# Test cases for running AI searches off the event loop
+
+import asyncio
+import time
+
+import pytest
+from app.services.ai_executor import (
+    AI_EXECUTOR_MODE_PROCESS,
+    AI_EXECUTOR_MODE_THREAD,
+    AIExecutor,
+    AIExecutorOverloadedError,
+    AIMoveCancelledError,
+    AIMoveTimeoutError,
+    record_search_stats,
+)
+from app.core.metrics import metrics
+from app.services.ai.base_bot import BaseBot
+from app.services.ai.hard_bot import HardAIBot
+from app.services.ai.transposition import (
+    get_shared_transposition_table,
+    release_shared_transposition_table,
+)
+from app.services.game_logic import create_board, apply_move, is_valid_move
+from app.core.constants import PLAYER_X, PLAYER_O
+
+
+class SleepyBot(BaseBot):
+    """Stands in for a long search."""
+
+    def __init__(self, player_piece: str, seconds: float):
+        super().__init__(player_piece)
+        self.seconds = seconds
+
+    def _choose_move(self, board):
+        time.sleep(self.seconds)
+        return (0, "L")
+
+
+def test_compute_move_in_process_pool():
+    executor = AIExecutor(mode=AI_EXECUTOR_MODE_PROCESS, max_workers=1)
+    board = create_board()
+    apply_move(board, 3, "L", PLAYER_X)
+    try:
+        move = asyncio.run(
+            executor.compute_move("game-1", HardAIBot(PLAYER_O, search_depth=2), board)
+        )
+    finally:
+        executor.shutdown()
+    assert move is not None and is_valid_move(board, *move)
+    assert executor.pending == 0
+
+
+def test_process_lanes_keep_a_games_table_warm_between_moves():
+    executor = AIExecutor(mode=AI_EXECUTOR_MODE_PROCESS, max_workers=2)
+    board = create_board()
+    apply_move(board, 3, "L", PLAYER_X)
+    table = get_shared_transposition_table("test-lane-affinity")
+
+    def make_bot():
+        # Pickled per move; the table re-attaches by name in the worker
+        return HardAIBot(
+            PLAYER_O,
+            search_depth=4,
+            transposition_table=table,
+            endgame_max_empty_cells=0,
+        )
+
+    async def scenario():
+        _, first = await executor.compute_move_with_stats("game-1", make_bot(), board)
+        _, again = await executor.compute_move_with_stats("game-1", make_bot(), board)
+        # A second game is given the other, still cold, worker
+        _, other = await executor.compute_move_with_stats("game-2", make_bot(), board)
+        return first, again, other
+
+    try:
+        first, again, other = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+        release_shared_transposition_table("test-lane-affinity")
+    assert again.nodes < first.nodes
+    assert other.nodes == first.nodes
+
+
+def test_event_loop_keeps_running_during_search():
+    executor = AIExecutor(mode=AI_EXECUTOR_MODE_THREAD, max_workers=1)
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        move = await executor.compute_move(
+            "game-1", SleepyBot(PLAYER_O, 0.3), create_board()
+        )
+        ticker_task.cancel()
+        return move, ticks
+
+    move, ticks = asyncio.run(scenario())
+    executor.shutdown()
+    assert move == (0, "L")
+    assert ticks >= 10
+
+
+def test_timeout_raises():
+    executor = AIExecutor(mode=AI_EXECUTOR_MODE_THREAD, max_workers=1)
+    with pytest.raises(AIMoveTimeoutError):
+        asyncio.run(
+            executor.compute_move(
+                "game-1", SleepyBot(PLAYER_O, 0.5), create_board(), timeout=0.05
+            )
+        )
+    executor.shutdown()
+    assert executor.pending == 0
+
+
+def test_backpressure_rejects_when_queue_is_full():
+    executor = AIExecutor(mode=AI_EXECUTOR_MODE_THREAD, max_workers=1, max_pending=1)
+
+    async def scenario():
+        first = asyncio.create_task(
+            executor.compute_move("game-1", SleepyBot(PLAYER_O, 0.2), create_board())
+        )
+        await asyncio.sleep(0)
+        with pytest.raises(AIExecutorOverloadedError):
+            await executor.compute_move(
+                "game-2", SleepyBot(PLAYER_O, 0.2), create_board()
+            )
+        return await first
+
+    assert asyncio.run(scenario()) == (0, "L")
+    executor.shutdown()
+
+
+def test_cancel_game_cancels_only_that_game():
+    executor = AIExecutor(mode=AI_EXECUTOR_MODE_THREAD, max_workers=2)
+
+    async def scenario():
+        doomed = asyncio.create_task(
+            executor.compute_move("game-1", SleepyBot(PLAYER_O, 0.2), create_board())
+        )
+        survivor = asyncio.create_task(
+            executor.compute_move("game-2", SleepyBot(PLAYER_O, 0.2), create_board())
+        )
+        await asyncio.sleep(0)
+        assert executor.cancel_game("game-1") == 1
+        with pytest.raises(AIMoveCancelledError):
+            await doomed
+        return await survivor
+
+    assert asyncio.run(scenario()) == (0, "L")
+    executor.shutdown()
+    assert executor.pending == 0
+
+
+def test_compute_move_with_stats_feeds_metrics():
+    metrics.reset()
+    executor = AIExecutor(mode=AI_EXECUTOR_MODE_THREAD, max_workers=1)
+    board = create_board()
+    apply_move(board, 3, "L", PLAYER_X)
+    bot = HardAIBot(PLAYER_O, search_depth=3, endgame_max_empty_cells=0)
+    try:
+        move, stats = asyncio.run(
+            executor.compute_move_with_stats("game-1", bot, board)
+        )
+    finally:
+        executor.shutdown()
+    assert move == stats.principal_variation[0]
+    assert stats.nodes > 0
+
+    record_search_stats("game-1", bot, stats)
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]["ai_search.HardAIBot.moves.search"] == 1
+    assert snapshot["timings"]["ai_search.HardAIBot.nodes"]["max"] == stats.nodes
+    assert snapshot["timings"]["ai_search.HardAIBot.completed_depth"]["max"] == 3
@@ -0,0 +1,99 @@
+# backend/tests/test_batch_eval.py
+# Test cases for vectorised batch position evaluation
+
+import numpy as np
+
+from app.services.ai.batch_eval import (
+    BATCH_EMPTY,
+    BATCH_O,
+    BATCH_X,
+    BatchEvaluator,
+    boards_to_array,
+    get_batch_evaluator,
+    positions_to_array,
+    random_positions,
+)
+from app.services.ai.hard_bot import HardAIBot
+from app.services.ai.medium_bot import MediumAIBot
+from app.services.game_logic import (
+    DEFAULT_GEOMETRY,
+    BitBoard,
+    BoardGeometry,
+    create_board,
+)
+from app.core.constants import PLAYER_X, PLAYER_O, ROWS, COLS
+
+
+def bot_score(bot, position):
+    """The bot's own (incremental) evaluation of position."""
+    bot._evaluator.reset(position)
+    return bot._evaluator.score
+
+
+def test_array_conversions_agree():
+    positions = random_positions(50, seed=3)
+    from_bits = positions_to_array(positions)
+    from_boards = boards_to_array([position.to_board() for position in positions])
+    assert from_bits.dtype == np.int8 and from_bits.shape == (50, ROWS, COLS)
+    assert np.array_equal(from_bits, from_boards)
+
+    board = create_board()
+    board[1][2] = PLAYER_X
+    board[4][6] = PLAYER_O
+    array = boards_to_array([board])[0]
+    assert (array[1, 2], array[4, 6], array[0, 0]) == (BATCH_X, BATCH_O, BATCH_EMPTY)
+
+
+def test_scores_match_hard_bot_evaluation():
+    positions = random_positions(200, seed=4)
+    array = positions_to_array(positions)
+    for player in (PLAYER_X, PLAYER_O):
+        bot = HardAIBot(player, search_depth=1)
+        expected = [bot_score(bot, position) for position in positions]
+        assert (
+            get_batch_evaluator(HardAIBot).evaluate(array, player).tolist() == expected
+        )
+
+
+def test_scores_match_medium_bot_evaluation():
+    positions = random_positions(200, seed=5)
+    array = positions_to_array(positions)
+    for player in (PLAYER_X, PLAYER_O):
+        bot = MediumAIBot(player, search_depth=1)
+        expected = [bot_score(bot, position) for position in positions]
+        assert (
+            get_batch_evaluator(MediumAIBot).evaluate(array, player).tolist()
+            == expected
+        )
+
+
+def test_chunked_evaluation_matches_one_pass():
+    array = positions_to_array(random_positions(37, seed=6))
+    evaluator = BatchEvaluator.for_bot(HardAIBot(PLAYER_X, search_depth=1))
+    assert np.array_equal(
+        evaluator.evaluate(array, PLAYER_X, chunk_size=5),
+        evaluator.evaluate(array, PLAYER_X),
+    )
+    assert evaluator.evaluate(positions_to_array([BitBoard()]), PLAYER_O).tolist() == [
+        bot_score(HardAIBot(PLAYER_O, search_depth=1), BitBoard())
+    ]
+
+
+def test_scores_match_on_other_geometries():
+    for geometry in (BoardGeometry(9, 9, 5), BoardGeometry(6, 7, 4)):
+        positions = random_positions(60, seed=7, geometry=geometry)
+        array = positions_to_array(positions, geometry)
+        assert array.shape == (60, geometry.rows, geometry.cols)
+        assert np.array_equal(
+            array,
+            boards_to_array([position.to_board() for position in positions], geometry),
+        )
+        bot = HardAIBot(PLAYER_O, search_depth=1, geometry=geometry)
+        expected = [bot_score(bot, position) for position in positions]
+        evaluator = get_batch_evaluator(HardAIBot, geometry)
+        assert get_batch_evaluator(HardAIBot, geometry) is evaluator
+        assert evaluator is not get_batch_evaluator(HardAIBot)
+        assert evaluator.evaluate(array, PLAYER_O).tolist() == expected
+    assert get_batch_evaluator(HardAIBot) is get_batch_evaluator(
+        HardAIBot, DEFAULT_GEOMETRY
+    )
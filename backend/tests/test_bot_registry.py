@@ -0,0 +1,125 @@
+# backend/tests/test_bot_registry.py
+# Test cases for per-game bot reuse and pooled shared resources
+
+from app.services.ai.easy_bot import EasyAIBot
+from app.services.ai.hard_bot import HardAIBot
+from app.services.ai.mcts_bot import MCTSAIBot
+from app.services.ai.medium_bot import MediumAIBot
+from app.services.ai import transposition
+from app.services.bot_registry import BotRegistry, difficulty_from, new_ai_seed
+from app.services.game_logic import BoardGeometry
+from app.core import constants
+from app.core.constants import PLAYER_X, PLAYER_O
+
+
+def test_difficulty_from_modes_and_tokens():
+    assert difficulty_from("PVE_HARD") == constants.AI_DIFFICULTY_HARD
+    assert difficulty_from("AI_EASY_PLAYER_1") == constants.AI_DIFFICULTY_EASY
+    assert difficulty_from("AI_MCTS_PLAYER_2") == constants.AI_DIFFICULTY_MCTS
+    assert difficulty_from("pve_medium") == constants.AI_DIFFICULTY_MEDIUM
+    assert difficulty_from("PVP") is None
+
+
+def test_one_bot_per_game_and_seat():
+    registry = BotRegistry()
+    bot = registry.get_bot("game-1", PLAYER_O, "PVE_HARD")
+    assert isinstance(bot, HardAIBot) and bot.player_piece == PLAYER_O
+    # Later turns get the same instance, whatever text they pass
+    assert registry.get_bot("game-1", PLAYER_O, "PVE_HARD") is bot
+    assert registry.get_bot("game-2", PLAYER_O, "PVE_HARD") is not bot
+
+    assert isinstance(registry.get_bot("ava", PLAYER_X, "AI_EASY_PLAYER_1"), EasyAIBot)
+    assert isinstance(
+        registry.get_bot("ava", PLAYER_O, "AI_MEDIUM_PLAYER_2"), MediumAIBot
+    )
+    assert isinstance(registry.get_bot("mcts", PLAYER_O, "PVE_MCTS"), MCTSAIBot)
+    assert registry.get_bot("pvp", PLAYER_O, "PVP") is None
+    assert registry.bot_count == 5
+
+
+def test_ponder_bot_is_separate_and_hard_only():
+    registry = BotRegistry()
+    live = registry.get_bot("game-1", PLAYER_O, "PVE_HARD")
+    ponder = registry.get_ponder_bot("game-1", PLAYER_O, "PVE_HARD")
+    assert isinstance(ponder, HardAIBot) and ponder is not live
+    assert ponder.time_budget == constants.AI_HARD_PONDER_TIME_BUDGET_SECONDS
+    # Both search into the one pooled table
+    assert ponder.transposition_table is live.transposition_table
+    assert registry.get_ponder_bot("game-2", PLAYER_O, "PVE_MEDIUM") is None
+
+
+def test_resources_are_shared_and_released_with_the_last_game():
+    registry = BotRegistry()
+    first = registry.get_bot("game-1", PLAYER_O, "PVE_HARD")
+    second = registry.get_bot("game-2", PLAYER_O, "PVE_HARD")
+    assert first.transposition_table is second.transposition_table
+    assert first.opening_book is second.opening_book
+    table_name = f"{constants.AI_DIFFICULTY_HARD}_{PLAYER_O}"
+    assert registry.resource_names == {"opening_book", f"tt:{table_name}"}
+
+    assert registry.release_game("game-1") == 1
+    assert registry.resource_names == {"opening_book", f"tt:{table_name}"}
+    assert table_name in transposition._shared_tables
+
+    assert registry.release_game("game-2") == 1
+    assert registry.resource_names == set()
+    assert table_name not in transposition._shared_tables
+    assert registry.bot_count == 0
+    # A new game starts from fresh resources
+    third = registry.get_bot("game-3", PLAYER_O, "PVE_HARD")
+    assert third.transposition_table is not first.transposition_table
+    registry.release_game("game-3")
+
+
+def test_mcts_budget_is_refreshed_every_turn(monkeypatch):
+    from app.services import bot_registry as registry_module
+
+    registry = BotRegistry()
+    bot = registry.get_bot("game-1", PLAYER_O, "PVE_MCTS")
+    assert bot.time_budget == constants.AI_MCTS_TIME_BUDGET_SECONDS
+
+    monkeypatch.setattr(registry_module.ai_executor, "_pending", 50)
+    assert registry.get_bot("game-1", PLAYER_O, "PVE_MCTS") is bot
+    assert bot.time_budget == constants.AI_MCTS_MIN_TIME_BUDGET_SECONDS
+
+
+def test_bots_get_the_game_seed():
+    registry = BotRegistry()
+    for text in ("PVE_EASY", "PVE_MEDIUM", "PVE_HARD", "PVE_MCTS"):
+        assert registry.get_bot(text, PLAYER_O, text, seed=42).seed == 42
+    assert registry.get_bot("unseeded", PLAYER_O, "PVE_HARD").seed is None
+    assert 0 <= new_ai_seed() < 1 << constants.AI_SEED_BITS
+
+
+def test_seeded_bots_stop_at_fixed_limits_and_do_not_ponder():
+    registry = BotRegistry()
+    hard = registry.get_bot("game-1", PLAYER_O, "PVE_HARD", seed=42)
+    assert hard.time_budget is None
+    assert hard.search_depth == constants.AI_HARD_SEEDED_SEARCH_DEPTH
+    assert hard.transposition_table.shared_name is None and hard.root_workers == 1
+    assert registry.get_ponder_bot("game-1", PLAYER_O, "PVE_HARD", seed=42) is None
+
+    mcts = registry.get_bot("game-2", PLAYER_O, "PVE_MCTS", seed=42)
+    assert mcts.time_budget is None
+    assert mcts.max_iterations == constants.AI_MCTS_SEEDED_MAX_ITERATIONS
+
+
+def test_bots_get_the_game_geometry():
+    registry = BotRegistry()
+    geometry = BoardGeometry(9, 9, 5)
+    for text in ("PVE_EASY", "PVE_MEDIUM", "PVE_HARD", "PVE_MCTS"):
+        assert (
+            registry.get_bot(text, PLAYER_O, text, geometry=geometry).geometry
+            == geometry
+        )
+    ponder = registry.get_ponder_bot(
+        "PVE_HARD", PLAYER_O, "PVE_HARD", geometry=geometry
+    )
+    assert ponder.geometry == geometry
+    # No opening book off the default board, and a table of the geometry's own
+    assert ponder.opening_book is None
+    default = registry.get_bot("default", PLAYER_O, "PVE_HARD")
+    assert default.transposition_table is not ponder.transposition_table
+    for game_id in ("PVE_EASY", "PVE_MEDIUM", "PVE_HARD", "PVE_MCTS", "default"):
+        registry.release_game(game_id)
+    assert registry.resource_names == set()
@@ -0,0 +1,118 @@
+# backend/tests/test_endgame.py
+# Test cases for the exact endgame solver
+
+import random
+import time
+
+import pytest
+from app.services.ai.base_bot import MOVE_SOURCE_ENDGAME, SearchTimeout
+from app.services.ai.endgame import (
+    ENDGAME_DRAW,
+    ENDGAME_LOSS,
+    ENDGAME_WIN,
+    MATE_SCORE,
+    EndgameSolver,
+    empty_cell_count,
+    solve_endgame,
+)
+from app.services.ai.hard_bot import HardAIBot
+from app.services.game_logic import BitBoard
+from app.core.constants import PLAYER_X, PLAYER_O
+
+
+def _other(player):
+    return PLAYER_O if player == PLAYER_X else PLAYER_X
+
+
+def _brute_force_score(position, player, ply=1):
+    """Plain minimax over every line, same scoring as the solver."""
+    best = None
+    for row, side in position.valid_moves():
+        child = position.copy()
+        child.apply_move(row, side, player)
+        if child.check_win(player):
+            score = MATE_SCORE - ply
+        else:
+            score = -_brute_force_score(child, _other(player), ply + 1)
+        best = score if best is None else max(best, score)
+    return 0 if best is None else best
+
+
+def _random_late_position(rng, empty_cells):
+    while True:
+        position, player = BitBoard(), PLAYER_X
+        while empty_cell_count(position) > empty_cells:
+            row, side = rng.choice(position.valid_moves())
+            position.apply_move(row, side, player)
+            if position.check_win(player):
+                break
+            player = _other(player)
+        else:
+            return position, player
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_solver_matches_brute_force(seed):
+    rng = random.Random(seed)
+    for _ in range(5):
+        position, player = _random_late_position(rng, rng.randint(6, 9))
+        result = EndgameSolver().solve(position, player)
+        score = _brute_force_score(position, player)
+        if score > 0:
+            assert (result.outcome, result.distance) == (
+                ENDGAME_WIN,
+                MATE_SCORE - score,
+            )
+        elif score < 0:
+            assert (result.outcome, result.distance) == (
+                ENDGAME_LOSS,
+                MATE_SCORE + score,
+            )
+        else:
+            assert result.outcome == ENDGAME_DRAW
+        child = position.copy()
+        child.apply_move(*result.best_move, player)  # The reported move is legal
+
+
+def test_one_solver_answers_for_either_side_to_move():
+    # Memo entries of one side to move must not answer for the other
+    rng = random.Random(116)
+    position, _ = _random_late_position(rng, rng.randint(7, 10))
+    shared = EndgameSolver()
+    for player in (PLAYER_X, PLAYER_O, PLAYER_X, PLAYER_O):
+        assert shared.solve(position, player) == EndgameSolver().solve(position, player)
+
+
+def test_solver_prefers_fastest_win():
+    board = [
+        ["X", "X", "X", None, None, "O", "O"],
+        ["O", "O", "X", "O", "X", "O", "X"],
+        ["X", "X", "O", "X", "O", "X", "O"],
+        ["O", "O", "X", "O", "X", "O", "X"],
+        ["X", "O", "O", "X", "O", "X", "O"],
+        ["O", "X", "X", "O", "X", "O", "X"],
+        ["X", "O", "O", "X", "O", "X", None],
+    ]
+    result = solve_endgame(board, PLAYER_X, EndgameSolver())
+    assert result == (ENDGAME_WIN, 1, (0, "L"))
+
+
+def test_full_board_is_a_draw():
+    board = [["X" if (r + c) % 2 else "O" for c in range(7)] for r in range(7)]
+    assert solve_endgame(board, PLAYER_X, EndgameSolver()) == (ENDGAME_DRAW, 0, None)
+
+
+def test_solver_respects_deadline():
+    position, player = _random_late_position(random.Random(5), 30)
+    with pytest.raises(SearchTimeout):
+        EndgameSolver().solve(position, player, deadline=time.monotonic())
+
+
+def test_hard_bot_switches_to_solver_late():
+    position, player = _random_late_position(random.Random(8), 10)
+    expected = EndgameSolver().solve(position, player)
+    bot = HardAIBot(player, search_depth=3, endgame_max_empty_cells=10)
+    move, stats = bot.get_move(position.to_board(), return_stats=True)
+    assert move == expected.best_move
+    assert stats.source == MOVE_SOURCE_ENDGAME  # The heuristic search never ran
+    assert stats.leaf_evaluations == 0
@@ -0,0 +1,120 @@
+# backend/tests/test_eval_weights.py
+# Test cases for evaluation weights stored as data
+
+import json
+
+import pytest
+
+from app.services.ai import eval_weights
+from app.services.ai.eval_weights import (
+    DEFAULT_EVAL_WEIGHTS,
+    DEFAULT_WEIGHTS_PATH,
+    EvalWeightsError,
+    get_eval_weights,
+    read_weights_file,
+    center_rows,
+    score_window,
+    write_weights_file,
+)
+from app.services.ai.hard_bot import HardAIBot
+from app.services.ai.medium_bot import MediumAIBot
+from app.services.game_logic import (
+    SYMMETRY_FLIP_ROWS,
+    WINDOW_MASKS,
+    BitBoard,
+    BoardGeometry,
+)
+from app.services.ai.batch_eval import random_positions
+from app.core.constants import (
+    AI_DIFFICULTY_HARD,
+    AI_DIFFICULTY_MEDIUM,
+    BOARD_VARIANT_COMPACT,
+    BOARD_VARIANTS,
+    CONNECT_N,
+    PLAYER_O,
+    PLAYER_X,
+)
+
+
+def test_shipped_file_holds_the_default_weights():
+    assert read_weights_file(DEFAULT_WEIGHTS_PATH) == DEFAULT_EVAL_WEIGHTS
+    assert HardAIBot(PLAYER_O).weights == DEFAULT_EVAL_WEIGHTS[AI_DIFFICULTY_HARD]
+    assert MediumAIBot(PLAYER_O).weights == DEFAULT_EVAL_WEIGHTS[AI_DIFFICULTY_MEDIUM]
+
+
+def test_window_scores_follow_the_weights():
+    hard = DEFAULT_EVAL_WEIGHTS[AI_DIFFICULTY_HARD]
+    assert score_window(hard, 4, 0, 0) == 10000000
+    assert score_window(hard, 0, 4, 0) == -10000000
+    assert score_window(hard, 3, 0, 1) == 50000
+    assert score_window(hard, 0, 3, 1) == -250000
+    assert score_window(hard, 2, 1, 1) == 200
+    assert score_window(hard, 1, 0, 3) == 500
+
+
+def test_bots_evaluate_with_the_weights_they_are_given():
+    position = BitBoard()
+    for row, side, player in (
+        (3, "L", PLAYER_O),
+        (3, "L", PLAYER_O),
+        (0, "R", PLAYER_X),
+    ):
+        position.apply_move(row, side, player)
+    default = HardAIBot(PLAYER_O)
+    weights = default.weights._replace(open_two=7, center_row=0)
+    custom = HardAIBot(PLAYER_O, weights=weights)
+    default._evaluator.reset(position)
+    custom._evaluator.reset(position)
+    assert custom._evaluator.score != default._evaluator.score
+    # No center bonus, so the score is the window scores under the custom weights
+    o_bits, x_bits = position.o_bits, position.x_bits
+    assert custom._evaluator.score == sum(
+        score_window(
+            weights,
+            (o_bits & mask).bit_count(),
+            (x_bits & mask).bit_count(),
+            CONNECT_N - ((o_bits | x_bits) & mask).bit_count(),
+        )
+        for mask in WINDOW_MASKS
+    )
+
+
+def test_center_rows_survive_a_row_flip():
+    assert center_rows(7) == (2, 3, 4)
+    for rows in range(1, 10):
+        assert {rows - 1 - r for r in center_rows(rows)} == set(center_rows(rows))
+
+
+def test_compact_evaluation_is_row_flip_symmetric():
+    # Canonical hashes fold row flips, so cached moves rely on this
+    geometry = BoardGeometry(*BOARD_VARIANTS[BOARD_VARIANT_COMPACT])
+    bot = HardAIBot(PLAYER_O, geometry=geometry)
+    evaluator = bot._evaluator
+    for position in random_positions(40, seed=9, geometry=geometry):
+        evaluator.reset(position)
+        score = evaluator.score
+        evaluator.reset(position.transformed(SYMMETRY_FLIP_ROWS))
+        assert evaluator.score == score
+
+
+def test_weights_files_round_trip_and_fall_back(tmp_path, monkeypatch):
+    path = str(tmp_path / "weights.json")
+    tuned = DEFAULT_EVAL_WEIGHTS[AI_DIFFICULTY_MEDIUM]._replace(three=1234)
+    write_weights_file(path, {AI_DIFFICULTY_MEDIUM: tuned})
+    assert read_weights_file(path) == {AI_DIFFICULTY_MEDIUM: tuned}
+
+    monkeypatch.setattr(eval_weights, "_loaded", {})
+    assert get_eval_weights(AI_DIFFICULTY_MEDIUM, path) == tuned
+    # Entries missing from the file come from the built-in defaults
+    assert (
+        get_eval_weights(AI_DIFFICULTY_HARD, path)
+        == DEFAULT_EVAL_WEIGHTS[AI_DIFFICULTY_HARD]
+    )
+
+    broken = tmp_path / "broken.json"
+    broken.write_text(json.dumps({AI_DIFFICULTY_MEDIUM: {"win": 1}}))
+    with pytest.raises(EvalWeightsError):
+        read_weights_file(str(broken))
+    assert get_eval_weights(AI_DIFFICULTY_MEDIUM, str(broken)) == (
+        DEFAULT_EVAL_WEIGHTS[AI_DIFFICULTY_MEDIUM]
+    )
@@ -2,13 +2,33 @@
 # backend/tests/test_game_logic.py
 # Test cases for game logic functions
 
+import random
+
 import pytest
 from app.services.game_logic import (
     create_board,
     is_valid_move,
     apply_move,
     check_win,
-    check_draw
+    check_draw,
+    BitBoard,
+    undo_move,
+    WINDOWS,
+    CELL_WINDOWS,
+    WINDOW_MASKS,
+    cell_bit,
+    SYMMETRIES,
+    SYMMETRY_FLIP_ROWS,
+    SYMMETRY_MIRROR,
+    canonical_hash,
+    canonicalize_board,
+    transform_board,
+    transform_move,
+    BoardGeometry,
+    DEFAULT_BOARD_TABLES,
+    DEFAULT_GEOMETRY,
+    board_tables,
+    find_winning_line,
 )
 from app.core.constants import (
     PLAYER_X,
@@ -17,6 +37,7 @@ from app.core.constants import (
     ROWS,
     COLS,
     CONNECT_N,
+    BOARD_VARIANTS,
 )
 
 def test_create_board():
@@ -148,4 +169,314 @@ def test_edge_case_stacking_full_row():
     
     # Now the row should be full
     assert is_valid_move(board, row_to_fill, "L") == False
-    assert is_valid_move(board, row_to_fill, "R") == False
\ No newline at end of file
+    assert is_valid_move(board, row_to_fill, "R") == False
+
+
+def _random_playout_boards(seed, games=20):
+    """Yields (board, position) pairs along random games, kept in lockstep."""
+    rng = random.Random(seed)
+    for _ in range(games):
+        board = create_board()
+        position = BitBoard()
+        player = PLAYER_X
+        while True:
+            yield board, position
+            moves = [
+                (r, s)
+                for r in range(ROWS)
+                for s in ("L", "R")
+                if is_valid_move(board, r, s)
+            ]
+            if not moves or check_win(board, PLAYER_X) or check_win(board, PLAYER_O):
+                break
+            row, side = rng.choice(moves)
+            assert apply_move(board, row, side, player) == position.apply_move(
+                row, side, player
+            )
+            player = PLAYER_O if player == PLAYER_X else PLAYER_X
+
+
+def test_bitboard_round_trip():
+    board = create_board()
+    apply_move(board, 0, "L", PLAYER_X)
+    apply_move(board, 0, "R", PLAYER_O)
+    apply_move(board, 6, "R", PLAYER_X)
+    position = BitBoard.from_board(board)
+    assert position.to_board() == board
+    assert position.left_fill[0] == 1
+    assert position.right_fill[0] == COLS - 2
+    assert position.right_fill[6] == COLS - 2
+
+
+def test_bitboard_matches_list_board():
+    for board, position in _random_playout_boards(seed=7):
+        assert position.to_board() == board
+        assert BitBoard.from_board(board).to_board() == board
+        for r in range(-1, ROWS + 1):
+            for side in ("L", "R", "X"):
+                assert position.is_valid_move(r, side) == is_valid_move(board, r, side)
+        assert position.check_win(PLAYER_X) == check_win(board, PLAYER_X)
+        assert position.check_win(PLAYER_O) == check_win(board, PLAYER_O)
+        assert position.is_full() == check_draw(board)
+
+
+def test_bitboard_full_row_and_hand_made_gaps():
+    position = BitBoard()
+    for i in range(COLS):
+        assert position.apply_move(3, "L" if i % 2 else "R", PLAYER_X) is not None
+    assert not position.is_valid_move(3, "L")
+    assert position.apply_move(3, "R", PLAYER_O) is None
+
+    # Boards built cell by cell may have gaps; pushes still land like apply_move
+    board = create_board()
+    board[2][1] = PLAYER_O
+    position = BitBoard.from_board(board)
+    assert position.apply_move(2, "L", PLAYER_X) == apply_move(board, 2, "L", PLAYER_X)
+    assert position.apply_move(2, "L", PLAYER_X) == apply_move(board, 2, "L", PLAYER_X)
+    assert position.to_board() == board
+
+
+def test_window_index():
+    # 7x7, connect 4: 4 per row and column, 16 per diagonal direction
+    assert len(WINDOWS) == 2 * ROWS * (COLS - CONNECT_N + 1) + 2 * (
+        ROWS - CONNECT_N + 1
+    ) * (COLS - CONNECT_N + 1)
+    assert len(set(WINDOWS)) == len(WINDOWS)
+    for index, window in enumerate(WINDOWS):
+        assert len(window) == CONNECT_N
+        assert WINDOW_MASKS[index] == sum(cell_bit(r, c) for r, c in window)
+        for r, c in window:
+            assert index in CELL_WINDOWS[r][c]
+    assert sum(
+        len(CELL_WINDOWS[r][c]) for r in range(ROWS) for c in range(COLS)
+    ) == CONNECT_N * len(WINDOWS)
+
+
+def test_make_and_undo_move_restore_the_position():
+    rng = random.Random(13)
+    position = BitBoard()
+    board = create_board()
+    history = []
+    player = PLAYER_X
+    for _ in range(40):
+        moves = position.valid_moves()
+        if not moves:
+            break
+        row, side = rng.choice(moves)
+        snapshot = (
+            position.x_bits,
+            position.o_bits,
+            position.zobrist_hash,
+            position.left_fill[:],
+            position.right_fill[:],
+        )
+        placed = position.make_move(row, side, player)
+        assert (placed.row, placed.col) == apply_move(board, row, side, player)
+        history.append((placed, snapshot))
+        player = PLAYER_O if player == PLAYER_X else PLAYER_X
+    assert position.to_board() == board
+
+    for placed, snapshot in reversed(history):
+        position.undo_move(placed)
+        undo_move(board, (placed.row, placed.col))
+        assert (
+            position.x_bits,
+            position.o_bits,
+            position.zobrist_hash,
+            position.left_fill,
+            position.right_fill,
+        ) == snapshot
+    assert board == create_board()
+
+
+def test_make_move_on_full_row_and_with_gaps():
+    position = BitBoard()
+    for i in range(COLS):
+        position.make_move(3, "L" if i % 2 else "R", PLAYER_X)
+    assert position.make_move(3, "L", PLAYER_O) is None
+
+    board = create_board()
+    board[2][1] = PLAYER_O
+    position = BitBoard.from_board(board)
+    placed = position.make_move(2, "L", PLAYER_X)
+    assert position.left_fill[2] == 2  # Walked past the existing piece
+    position.undo_move(placed)
+    assert position.to_board() == board and position.left_fill[2] == 0
+
+
+def test_mirrored_bitboard():
+    for board, position in _random_playout_boards(seed=21, games=3):
+        mirror = position.mirrored()
+        assert mirror.to_board() == [row[::-1] for row in board]
+        assert (
+            mirror.zobrist_hash == BitBoard.from_board(mirror.to_board()).zobrist_hash
+        )
+        assert mirror.valid_moves() == position.valid_moves()
+        for r in range(ROWS):
+            if position.is_valid_move(r, "L"):
+                assert mirror.left_fill[r] == COLS - 1 - position.right_fill[r]
+        assert mirror.mirrored().zobrist_hash == position.zobrist_hash
+
+
+def test_symmetry_transforms_preserve_play():
+    for board, position in _random_playout_boards(seed=22, games=3):
+        player = (
+            PLAYER_X
+            if position.x_bits.bit_count() == position.o_bits.bit_count()
+            else PLAYER_O
+        )
+        for transform in SYMMETRIES:
+            image = position.transformed(transform)
+            assert image.to_board() == transform_board(board, transform)
+            assert image.zobrist_hash == position.symmetry_hashes()[transform]
+            fresh = BitBoard.from_board(image.to_board())
+            for r in range(ROWS):
+                # Full rows only need left_fill > right_fill, whatever the values
+                if fresh.is_valid_move(r, "L"):
+                    assert (image.left_fill[r], image.right_fill[r]) == (
+                        fresh.left_fill[r],
+                        fresh.right_fill[r],
+                    )
+                else:
+                    assert not image.is_valid_move(r, "L")
+            assert image.transformed(transform).zobrist_hash == position.zobrist_hash
+            assert image.check_win(PLAYER_X) == position.check_win(PLAYER_X)
+            # A move and its image land on corresponding cells
+            for move in position.valid_moves():
+                placed = position.copy().apply_move(*move, player)
+                image_placed = image.copy().apply_move(
+                    *transform_move(move, transform), player
+                )
+                assert (
+                    transform_move(transform_move(move, transform), transform) == move
+                )
+                assert image_placed == (
+                    ROWS - 1 - placed[0]
+                    if transform & SYMMETRY_FLIP_ROWS
+                    else placed[0],
+                    COLS - 1 - placed[1] if transform & SYMMETRY_MIRROR else placed[1],
+                )
+
+
+def test_canonical_form_is_shared_by_the_symmetry_class():
+    for board, position in _random_playout_boards(seed=23, games=3):
+        canonical_board, transform = canonicalize_board(board)
+        assert transform_board(canonical_board, transform) == board
+        for image_transform in SYMMETRIES:
+            image_board = transform_board(board, image_transform)
+            assert canonicalize_board(image_board)[0] == canonical_board
+            assert (
+                canonical_hash(BitBoard.from_board(image_board))[0]
+                == canonical_hash(position)[0]
+            )
+
+
+VARIANT_GEOMETRIES = [BoardGeometry(*variant) for variant in BOARD_VARIANTS.values()]
+
+
+def _expected_window_count(rows, cols, connect_n):
+    horizontal = rows * max(cols - connect_n + 1, 0)
+    vertical = cols * max(rows - connect_n + 1, 0)
+    diagonal = max(rows - connect_n + 1, 0) * max(cols - connect_n + 1, 0)
+    return horizontal + vertical + 2 * diagonal
+
+
+def test_board_tables_are_built_once_per_geometry():
+    assert board_tables() is DEFAULT_BOARD_TABLES
+    assert board_tables(BoardGeometry(ROWS, COLS, CONNECT_N)) is DEFAULT_BOARD_TABLES
+    assert DEFAULT_BOARD_TABLES.windows is WINDOWS
+    large = board_tables(BoardGeometry(9, 9, 5))
+    assert board_tables(BoardGeometry(9, 9, 5)) is large
+    assert BitBoard(BoardGeometry(9, 9, 5)).tables is large
+    for bad in (
+        BoardGeometry(10, 7, 4),
+        BoardGeometry(7, 0, 4),
+        BoardGeometry(6, 7, 8),
+    ):
+        with pytest.raises(ValueError):
+            board_tables(bad)
+
+
+@pytest.mark.parametrize("geometry", VARIANT_GEOMETRIES)
+def test_variant_window_index(geometry):
+    tables = board_tables(geometry)
+    assert len(tables.windows) == _expected_window_count(*geometry)
+    for index, window in enumerate(tables.windows):
+        assert len(window) == geometry.connect_n
+        assert tables.window_masks[index] == sum(
+            tables.cell_bit(r, c) for r, c in window
+        )
+        for r, c in window:
+            assert index in tables.cell_windows[r][c]
+    assert tables.full_board_mask == sum(
+        tables.cell_bit(r, c)
+        for r in range(geometry.rows)
+        for c in range(geometry.cols)
+    )
+
+
+@pytest.mark.parametrize("geometry", VARIANT_GEOMETRIES)
+def test_variant_bitboard_matches_list_board(geometry):
+    rng = random.Random(31)
+    for _ in range(5):
+        board = create_board(geometry)
+        position = BitBoard(geometry)
+        player = PLAYER_X
+        while True:
+            assert position.to_board() == board
+            assert (
+                BitBoard.from_board(board, geometry).zobrist_hash
+                == position.zobrist_hash
+            )
+            for transform in SYMMETRIES:
+                image = position.transformed(transform)
+                assert image.to_board() == transform_board(board, transform)
+            moves = position.valid_moves()
+            assert moves == [
+                (r, s)
+                for r in range(geometry.rows)
+                for s in ("L", "R")
+                if is_valid_move(board, r, s)
+            ]
+            if (
+                not moves
+                or position.check_win(PLAYER_X)
+                or position.check_win(PLAYER_O)
+            ):
+                assert position.is_full() == check_draw(board)
+                break
+            row, side = rng.choice(moves)
+            placed = apply_move(board, row, side, player)
+            assert position.apply_move(row, side, player) == placed
+            assert position.check_win(player) == check_win(
+                board, player, placed, geometry
+            )
+            assert position.check_win(player) == check_win(
+                board, player, None, geometry
+            )
+            player = PLAYER_O if player == PLAYER_X else PLAYER_X
+
+
+def test_connect_five_needs_five_in_a_row():
+    geometry = BoardGeometry(9, 9, 5)
+    board = create_board(geometry)
+    for _ in range(4):
+        placed = apply_move(board, 8, "L", PLAYER_X)
+    assert not check_win(board, PLAYER_X, placed, geometry)
+    # Without a geometry the board's size and the default CONNECT_N are assumed
+    assert check_win(board, PLAYER_X, placed)
+    placed = apply_move(board, 8, "L", PLAYER_X)
+    assert find_winning_line(board, PLAYER_X, placed, geometry) == [
+        (8, c) for c in range(5)
+    ]
+
+
+def test_default_geometry_hashes_are_unchanged():
+    # Cached moves and the opening book are keyed on these hashes
+    board = create_board()
+    apply_move(board, 3, "L", PLAYER_X)
+    apply_move(board, 0, "R", PLAYER_O)
+    position = BitBoard.from_board(board)
+    assert position.geometry == DEFAULT_GEOMETRY
+    assert position.zobrist_hash == 0xB1D3702671CB8EF3
+    assert canonical_hash(position) == (4266253811252141328, SYMMETRY_MIRROR)
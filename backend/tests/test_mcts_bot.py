@@ -0,0 +1,159 @@
+# backend/tests/test_mcts_bot.py
+# Test cases for the Monte Carlo tree search bot and its batched playouts
+
+import random
+import time
+from fractions import Fraction
+
+import numpy as np
+import pytest
+from app.services.ai.mcts_bot import (
+    MCTS_POLICY_GREEDY,
+    MCTS_POLICY_RANDOM,
+    MCTSAIBot,
+    batch_playouts,
+    load_scaled_time_budget,
+)
+from app.services.game_logic import BitBoard
+from app.core.constants import PLAYER_X, PLAYER_O
+
+
+def _other(player):
+    return PLAYER_O if player == PLAYER_X else PLAYER_X
+
+
+def _random_position(empty_cells, seed):
+    """A position with empty_cells cells left and no winner, reached by random play."""
+    rng = random.Random(seed)
+    while True:
+        position = BitBoard()
+        player = PLAYER_X
+        for _ in range(49 - empty_cells):
+            position.apply_move(*rng.choice(position.valid_moves()), player)
+            if position.check_win(player):
+                break
+            player = _other(player)
+        else:
+            return position, player
+
+
+def _exact_random_outcome(position, player):
+    """Probabilities of (X wins, O wins, draw) when both sides pick uniformly from valid_moves."""
+    moves = position.valid_moves()
+    if not moves:
+        return (Fraction(0), Fraction(0), Fraction(1))
+    totals = [Fraction(0)] * 3
+    for row, side in moves:
+        child = position.copy()
+        child.apply_move(row, side, player)
+        if child.check_win(player):
+            outcome = (Fraction(1), Fraction(0), Fraction(0))
+            if player == PLAYER_O:
+                outcome = (Fraction(0), Fraction(1), Fraction(0))
+        else:
+            outcome = _exact_random_outcome(child, _other(player))
+        totals = [total + share / len(moves) for total, share in zip(totals, outcome)]
+    return tuple(totals)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_random_playouts_match_exact_distribution(seed):
+    position, player = _random_position(6, seed)
+    expected = _exact_random_outcome(position, player)
+    count = 4000
+    results = batch_playouts(
+        position, player, count, np.random.default_rng(seed), MCTS_POLICY_RANDOM
+    )
+    assert sum(results) == count
+    for observed, probability in zip(results, expected):
+        assert abs(observed / count - float(probability)) < 0.04
+
+
+def test_greedy_playouts_take_immediate_win():
+    position = BitBoard()
+    for _ in range(3):
+        position.apply_move(0, "L", PLAYER_X)
+        position.apply_move(6, "L", PLAYER_O)
+    # X to move completes row 0 on the spot in every playout
+    results = batch_playouts(
+        position, PLAYER_X, 64, np.random.default_rng(0), MCTS_POLICY_GREEDY
+    )
+    assert results == (64, 0, 0)
+
+
+def test_playouts_from_full_board_are_draws():
+    for seed in range(20):
+        position, player = _random_position(1, seed)
+        position.apply_move(*position.valid_moves()[0], player)
+        if not position.check_win(player):
+            break
+    assert position.is_full() and not position.check_win(player)
+    assert batch_playouts(position, _other(player), 16, np.random.default_rng(0)) == (
+        0,
+        0,
+        16,
+    )
+
+
+def test_mcts_takes_win_and_blocks():
+    position = BitBoard()
+    for _ in range(3):
+        position.apply_move(2, "L", PLAYER_X)
+        position.apply_move(4, "R", PLAYER_O)
+    bot_x = MCTSAIBot(PLAYER_X, time_budget=None, max_iterations=10)
+    assert bot_x.get_move(position.to_board()) == (2, "L")
+
+    position.apply_move(5, "L", PLAYER_X)
+    bot_o = MCTSAIBot(PLAYER_O, time_budget=None, max_iterations=10)
+    # Winning beats blocking X on row 2
+    assert bot_o.get_move(position.to_board()) == (4, "R")
+
+    blocking = BitBoard()
+    for _ in range(3):
+        blocking.apply_move(1, "R", PLAYER_X)
+    blocking.apply_move(5, "L", PLAYER_O)
+    blocking.apply_move(6, "L", PLAYER_O)
+    assert MCTSAIBot(PLAYER_O, time_budget=None, max_iterations=10).get_move(
+        blocking.to_board()
+    ) == (1, "R")
+
+
+def test_mcts_iteration_and_time_budgets():
+    position, player = _random_position(40, 1)
+    bot = MCTSAIBot(player, time_budget=None, max_iterations=25, batch_size=8)
+    move = bot.get_move(position.to_board())
+    assert move in position.valid_moves()
+    if bot.iterations:  # 0 when the move was forced
+        assert bot.iterations == 25
+        assert bot.playouts == 25 * 8
+
+    bot = MCTSAIBot(player, time_budget=0.2)
+    started = time.monotonic()
+    assert bot.get_move(position.to_board()) in position.valid_moves()
+    assert time.monotonic() - started < 1.0
+
+
+def test_mcts_rejects_bad_configuration():
+    with pytest.raises(ValueError):
+        MCTSAIBot(PLAYER_X, time_budget=None, max_iterations=None)
+    with pytest.raises(ValueError):
+        MCTSAIBot(PLAYER_X, playout_policy="heavy")
+
+
+def test_load_scaled_time_budget():
+    assert (
+        load_scaled_time_budget(1.0, pending=0, max_workers=2, min_time_budget=0.2)
+        == 1.0
+    )
+    assert (
+        load_scaled_time_budget(1.0, pending=1, max_workers=2, min_time_budget=0.2)
+        == 1.0
+    )
+    assert (
+        load_scaled_time_budget(1.0, pending=3, max_workers=2, min_time_budget=0.2)
+        == 0.5
+    )
+    assert (
+        load_scaled_time_budget(1.0, pending=50, max_workers=2, min_time_budget=0.2)
+        == 0.2
+    )
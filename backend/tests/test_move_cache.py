@@ -0,0 +1,247 @@
+# backend/tests/test_move_cache.py
+# Test cases for the cross-game AI move cache
+
+import asyncio
+
+from app.core.metrics import metrics
+from app.services import move_cache as move_cache_module
+from app.services.ai.base_bot import (
+    MOVE_SOURCE_CACHE,
+    MOVE_SOURCE_ENDGAME,
+    MOVE_SOURCE_FORCED,
+    MOVE_SOURCE_SEARCH,
+    SearchStats,
+)
+from app.services.ai.medium_bot import MediumAIBot
+from app.services.ai_executor import AI_EXECUTOR_MODE_THREAD, AIExecutor
+from app.services.game_logic import (
+    SYMMETRY_FLIP_ROWS,
+    SYMMETRY_ROTATE,
+    BitBoard,
+    BoardGeometry,
+    create_board,
+    apply_move,
+    transform_board,
+)
+from app.services.move_cache import (
+    MoveCache,
+    MoveCacheEntry,
+    SQLiteMoveCacheStore,
+    compute_move_cached,
+)
+from app.core.constants import (
+    AI_DIFFICULTY_EASY,
+    AI_DIFFICULTY_MEDIUM,
+    PLAYER_X,
+    PLAYER_O,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def searched(depth: int = 4, score: float = 12.0) -> SearchStats:
+    return SearchStats(source=MOVE_SOURCE_SEARCH, completed_depth=depth, score=score)
+
+
+def board_with(*moves):
+    board = create_board()
+    player = PLAYER_X
+    for row, side in moves:
+        apply_move(board, row, side, player)
+        player = PLAYER_O if player == PLAYER_X else PLAYER_X
+    return board
+
+
+def mirror(board):
+    return BitBoard.from_board(board).mirrored().to_board()
+
+
+def test_hit_after_store_and_miss_for_other_keys():
+    cache = MoveCache(max_entries=10, ttl_seconds=60)
+    board = board_with((3, "L"))
+    assert cache.lookup(board, PLAYER_O, AI_DIFFICULTY_MEDIUM, 2) is None
+    cache.store_move(board, PLAYER_O, AI_DIFFICULTY_MEDIUM, 2, (2, "R"), searched())
+
+    move, entry = cache.lookup(board, PLAYER_O, AI_DIFFICULTY_MEDIUM, 2)
+    assert move == (2, "R") and entry.score == 12.0 and entry.completed_depth == 4
+    # Side to move, difficulty and depth are all part of the key
+    assert cache.lookup(board, PLAYER_X, AI_DIFFICULTY_MEDIUM, 2) is None
+    assert cache.lookup(board, PLAYER_O, AI_DIFFICULTY_EASY, 2) is None
+    assert cache.lookup(board, PLAYER_O, AI_DIFFICULTY_MEDIUM, 3) is None
+    assert (cache.hits, cache.misses) == (1, 4)
+    assert metrics.snapshot()["gauges"]["move_cache.entries"] == 1
+
+
+def test_mirrored_position_shares_the_entry():
+    cache = MoveCache(max_entries=10, ttl_seconds=60)
+    board = board_with((3, "L"), (1, "L"))
+    cache.store_move(board, PLAYER_X, AI_DIFFICULTY_MEDIUM, 2, (1, "L"), searched())
+
+    move, _ = cache.lookup(mirror(board), PLAYER_X, AI_DIFFICULTY_MEDIUM, 2)
+    assert move == (1, "R")
+    assert len(cache) == 1
+
+
+def test_row_reversed_position_shares_the_entry():
+    cache = MoveCache(max_entries=10, ttl_seconds=60)
+    board = board_with((1, "L"), (2, "R"))
+    cache.store_move(board, PLAYER_X, AI_DIFFICULTY_MEDIUM, 2, (1, "L"), searched())
+
+    flipped = transform_board(board, SYMMETRY_ROTATE)
+    move, _ = cache.lookup(flipped, PLAYER_X, AI_DIFFICULTY_MEDIUM, 2)
+    assert move == (5, "R")
+    assert len(cache) == 1
+
+
+def test_only_searched_moves_are_stored_and_deeper_results_win():
+    cache = MoveCache(max_entries=10, ttl_seconds=60)
+    board = board_with((3, "L"))
+    cache.store_move(
+        board,
+        PLAYER_O,
+        AI_DIFFICULTY_MEDIUM,
+        2,
+        (0, "L"),
+        SearchStats(source=MOVE_SOURCE_FORCED),
+    )
+    assert len(cache) == 0
+
+    cache.store_move(
+        board, PLAYER_O, AI_DIFFICULTY_MEDIUM, 2, (2, "R"), searched(depth=6)
+    )
+    cache.store_move(
+        board, PLAYER_O, AI_DIFFICULTY_MEDIUM, 2, (4, "L"), searched(depth=3)
+    )
+    move, _ = cache.lookup(board, PLAYER_O, AI_DIFFICULTY_MEDIUM, 2)
+    assert move == (2, "R")
+
+
+def test_results_short_of_the_key_depth_are_neither_stored_nor_served():
+    cache = MoveCache(max_entries=10, ttl_seconds=60)
+    board = board_with((3, "L"))
+    # A time-budgeted search keyed on its depth cap that ran out of time early
+    cache.store_move(
+        board, PLAYER_O, AI_DIFFICULTY_MEDIUM, 8, (2, "R"), searched(depth=5)
+    )
+    assert len(cache) == 0
+
+    # An endgame solve is exact however few plies were left
+    solved = SearchStats(source=MOVE_SOURCE_ENDGAME, completed_depth=3, score=100.0)
+    cache.store_move(board, PLAYER_O, AI_DIFFICULTY_MEDIUM, 8, (2, "R"), solved)
+    move, entry = cache.lookup(board, PLAYER_O, AI_DIFFICULTY_MEDIUM, 8)
+    assert move == (2, "R") and entry.completed_depth == 8
+
+    # Shallow entries from a shared store are not served either
+    position = BitBoard.from_board(board)
+    key, _ = cache.key_for(position, PLAYER_O, AI_DIFFICULTY_MEDIUM, 6)
+    cache._insert(key, MoveCacheEntry((2, "R"), 1.0, 4, cache._clock()))
+    assert cache.lookup(board, PLAYER_O, AI_DIFFICULTY_MEDIUM, 6) is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = MoveCache(max_entries=2, ttl_seconds=60)
+    boards = [board_with((row, "L")) for row in range(3)]
+    cache.store_move(boards[0], PLAYER_O, AI_DIFFICULTY_MEDIUM, 2, (5, "L"), searched())
+    cache.store_move(boards[1], PLAYER_O, AI_DIFFICULTY_MEDIUM, 2, (5, "L"), searched())
+    assert cache.lookup(boards[0], PLAYER_O, AI_DIFFICULTY_MEDIUM, 2) is not None
+    bytes_for_two = cache.memory_bytes
+
+    cache.store_move(boards[2], PLAYER_O, AI_DIFFICULTY_MEDIUM, 2, (5, "L"), searched())
+    assert len(cache) == 2
+    assert cache.lookup(boards[1], PLAYER_O, AI_DIFFICULTY_MEDIUM, 2) is None
+    assert cache.lookup(boards[0], PLAYER_O, AI_DIFFICULTY_MEDIUM, 2) is not None
+    assert cache.memory_bytes == bytes_for_two
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = MoveCache(max_entries=10, ttl_seconds=60, clock=clock)
+    board = board_with((3, "L"))
+    cache.store_move(board, PLAYER_O, AI_DIFFICULTY_MEDIUM, 2, (2, "R"), searched())
+    clock.now += 59
+    assert cache.lookup(board, PLAYER_O, AI_DIFFICULTY_MEDIUM, 2) is not None
+    clock.now += 2
+    assert cache.lookup(board, PLAYER_O, AI_DIFFICULTY_MEDIUM, 2) is None
+    assert len(cache) == 0
+
+
+def test_illegal_cached_move_is_a_miss():
+    cache = MoveCache(max_entries=10, ttl_seconds=60)
+    board = board_with((3, "L"))
+    cache.store_move(board, PLAYER_O, AI_DIFFICULTY_MEDIUM, 2, (9, "L"), searched())
+    assert cache.lookup(board, PLAYER_O, AI_DIFFICULTY_MEDIUM, 2) is None
+
+
+def test_shared_store_serves_other_processes(tmp_path):
+    path = str(tmp_path / "moves.sqlite")
+    writer = MoveCache(10, 60, store=SQLiteMoveCacheStore(path, 60))
+    reader = MoveCache(10, 60, store=SQLiteMoveCacheStore(path, 60))
+    board = board_with((3, "L"), (1, "L"))
+    writer.store_move(
+        board, PLAYER_X, AI_DIFFICULTY_MEDIUM, 2, (1, "L"), searched(score=-7.0)
+    )
+
+    move, entry = reader.lookup(mirror(board), PLAYER_X, AI_DIFFICULTY_MEDIUM, 2)
+    assert move == (1, "R") and entry.score == -7.0
+    assert len(reader) == 1  # Kept locally after the store hit
+
+
+def test_compute_move_cached_skips_the_executor_on_a_hit(monkeypatch):
+    cache = MoveCache(max_entries=10, ttl_seconds=60)
+    executor = AIExecutor(mode=AI_EXECUTOR_MODE_THREAD, max_workers=1)
+    monkeypatch.setattr(move_cache_module, "move_cache", cache)
+    monkeypatch.setattr(move_cache_module, "ai_executor", executor)
+    bot = MediumAIBot(PLAYER_O, search_depth=2)
+    board = board_with((3, "L"))
+    try:
+        move, stats = asyncio.run(
+            compute_move_cached("game-1", bot, AI_DIFFICULTY_MEDIUM, board)
+        )
+        assert stats.source == MOVE_SOURCE_SEARCH and stats.score is not None
+        assert len(cache) == 1
+
+        # Another game reaching the mirrored position is answered without a search
+        cached_move, cached_stats = asyncio.run(
+            compute_move_cached("game-2", bot, AI_DIFFICULTY_MEDIUM, mirror(board))
+        )
+        assert cached_stats.source == MOVE_SOURCE_CACHE
+        assert cached_stats.score == stats.score
+        assert cached_move == (move[0], "R" if move[1] == "L" else "L")
+        assert executor.pending == 0 and cache.hits == 1
+
+        # Difficulties outside AI_MOVE_CACHE_DIFFICULTIES always search
+        _, easy_stats = asyncio.run(
+            compute_move_cached("game-3", bot, AI_DIFFICULTY_EASY, board)
+        )
+        assert easy_stats.source == MOVE_SOURCE_SEARCH
+    finally:
+        executor.shutdown()
+
+
+def test_geometries_do_not_share_entries():
+    cache = MoveCache(max_entries=10, ttl_seconds=60)
+    geometry = BoardGeometry(9, 9, 5)
+    board = create_board(geometry)
+    apply_move(board, 8, "L", PLAYER_X)
+    cache.store_move(
+        board, PLAYER_O, AI_DIFFICULTY_MEDIUM, 2, (0, "R"), searched(), geometry
+    )
+    move, _ = cache.lookup(board, PLAYER_O, AI_DIFFICULTY_MEDIUM, 2, geometry)
+    assert move == (0, "R")
+    # The row-reversed image answers with the reversed row of its own geometry
+    flipped = transform_board(board, SYMMETRY_FLIP_ROWS)
+    assert cache.lookup(flipped, PLAYER_O, AI_DIFFICULTY_MEDIUM, 2, geometry)[0] == (
+        8,
+        "R",
+    )
+    # Same board size, other connect length: another key
+    assert (
+        cache.lookup(board, PLAYER_O, AI_DIFFICULTY_MEDIUM, 2, BoardGeometry(9, 9, 4))
+        is None
+    )
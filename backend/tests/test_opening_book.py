@@ -0,0 +1,86 @@
+# backend/tests/test_opening_book.py
+# Test cases for the HardAIBot opening book
+
+import pickle
+
+from app.services.ai.hard_bot import HardAIBot
+from app.services.ai.opening_book import (
+    OpeningBook,
+    book_positions,
+    build_book,
+    canonical_key,
+    decode_move,
+    encode_move,
+    get_opening_book,
+    write_book,
+)
+from app.services.game_logic import (
+    SYMMETRIES,
+    SYMMETRY_FLIP_ROWS,
+    BitBoard,
+    create_board,
+    apply_move,
+    transform_move,
+)
+from app.core.constants import PLAYER_X, PLAYER_O, ROWS
+
+
+def test_move_codes_round_trip():
+    for row in range(ROWS):
+        for side in ("L", "R"):
+            assert decode_move(encode_move((row, side))) == (row, side)
+
+
+def test_symmetric_positions_share_a_key():
+    position = BitBoard()
+    position.apply_move(2, "L", PLAYER_X)
+    position.apply_move(5, "L", PLAYER_O)
+    keys = {canonical_key(position.transformed(t))[0] for t in SYMMETRIES}
+    assert len(keys) == 1
+    assert canonical_key(position)[1] != canonical_key(position.mirrored())[1]
+    # Plies 0-1: the empty board plus 14 first moves folded into 4 symmetry classes
+    # (rows 0/6, 1/5, 2/4 and 3, either side)
+    assert len(book_positions(2)) == 1 + 4
+
+
+def test_lookup_maps_moves_through_the_mirror(tmp_path):
+    position = BitBoard()
+    position.apply_move(3, "L", PLAYER_X)
+    key, transform = canonical_key(position)
+    stored = transform_move((3, "L"), transform)  # Reply "next to X" in canonical form
+    path = str(tmp_path / "book.bin")
+    write_book(path, {key: encode_move(stored)}, plies=2, search_depth=1)
+
+    book = OpeningBook(path)
+    assert book.lookup(position, PLAYER_O) == (3, "L")
+    assert book.lookup(position.mirrored(), PLAYER_O) == (3, "R")
+    assert book.lookup(position.transformed(SYMMETRY_FLIP_ROWS), PLAYER_O) == (3, "L")
+    assert book.lookup(position, PLAYER_X) is None  # Not X's turn
+    assert book.lookup(BitBoard(), PLAYER_X) is None
+    assert len(book) == 1 and book.plies == 2
+
+
+def test_missing_or_corrupt_book_is_empty(tmp_path):
+    assert len(OpeningBook(str(tmp_path / "missing.bin"))) == 0
+    corrupt = tmp_path / "corrupt.bin"
+    corrupt.write_bytes(b"not a book at all")
+    assert OpeningBook(str(corrupt)).lookup(BitBoard(), PLAYER_X) is None
+
+
+def test_book_pickles_by_path():
+    book = get_opening_book("/nonexistent/book.bin")
+    assert pickle.loads(pickle.dumps(book)) is book
+
+
+def test_hard_bot_plays_built_book_moves(tmp_path):
+    entries = build_book(plies=2, search_depth=2)
+    assert len(entries) == 5
+    path = str(tmp_path / "book.bin")
+    write_book(path, entries, plies=2, search_depth=2)
+
+    board = create_board()
+    apply_move(board, 6, "R", PLAYER_X)
+    bot = HardAIBot(PLAYER_O, search_depth=2, opening_book=OpeningBook(path))
+    move = bot.get_move(board)
+    assert move == bot.opening_book.lookup(BitBoard.from_board(board), PLAYER_O)
+    assert bot.completed_depth == 0 and bot._nodes_searched == 0  # No search ran
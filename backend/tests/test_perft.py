@@ -0,0 +1,113 @@
+# backend/tests/test_perft.py
+# Known perft counts: a regression gate for is_valid_move/apply_move/check_win
+# and their BitBoard counterparts
+
+import pytest
+
+from app.services.game_logic import apply_move, check_draw, check_win
+from app.services.perft import (
+    PERFT_BACKENDS,
+    PERFT_POSITIONS,
+    PerftResult,
+    perft,
+    perft_divide,
+    position_board,
+    time_perft,
+)
+from app.core.constants import PLAYER_O, PLAYER_X
+
+# (position, depth): (nodes, wins, draws)
+KNOWN_COUNTS = {
+    ("start", 0): (1, 0, 0),
+    ("start", 1): (14, 0, 0),
+    ("start", 2): (196, 0, 0),
+    ("start", 3): (2744, 0, 0),
+    ("start", 4): (38416, 0, 0),
+    ("midgame", 1): (14, 2, 0),
+    ("midgame", 2): (168, 14, 0),
+    ("midgame", 3): (2184, 317, 0),
+    ("midgame", 4): (26330, 2859, 0),
+    ("endgame", 1): (8, 1, 0),
+    ("endgame", 2): (48, 18, 0),
+    ("endgame", 3): (188, 70, 0),
+    ("endgame", 4): (672, 406, 0),
+    ("endgame", 5): (1216, 854, 0),
+    ("endgame", 6): (1536, 1814, 576),
+    ("endgame", 7): (0, 1814, 576),
+    ("large", 1): (18, 0, 0),
+    ("large", 2): (324, 0, 0),
+    ("large", 3): (5832, 0, 0),
+}
+
+
+@pytest.mark.parametrize("backend", PERFT_BACKENDS)
+@pytest.mark.parametrize("name, depth", sorted(KNOWN_COUNTS))
+def test_known_counts(name, depth, backend):
+    position = PERFT_POSITIONS[name]
+    board, player = position_board(position)
+    before = [row[:] for row in board]
+    assert (
+        perft(board, player, depth, position.geometry, backend)
+        == KNOWN_COUNTS[(name, depth)]
+    )
+    assert board == before
+
+
+def _naive_perft(board, player, depth, geometry):
+    """Copies per move and full-board win scans: slow, but shares no shortcuts."""
+    if depth == 0:
+        return PerftResult(1, 0, 0)
+    nodes = wins = draws = 0
+    opponent = PLAYER_O if player == PLAYER_X else PLAYER_X
+    for row_idx in range(len(board)):
+        for side in ("L", "R"):
+            child = [row[:] for row in board]
+            if apply_move(child, row_idx, side, player) is None:
+                continue
+            if check_win(child, player, None, geometry):
+                wins += 1
+                nodes += depth == 1
+            elif check_draw(child):
+                draws += 1
+                nodes += depth == 1
+            else:
+                below = _naive_perft(child, opponent, depth - 1, geometry)
+                nodes += below.nodes
+                wins += below.wins
+                draws += below.draws
+    return PerftResult(nodes, wins, draws)
+
+
+@pytest.mark.parametrize("name, depth", [("midgame", 3), ("endgame", 6), ("large", 2)])
+def test_counts_match_a_naive_search(name, depth):
+    position = PERFT_POSITIONS[name]
+    board, player = position_board(position)
+    assert perft(board, player, depth, position.geometry) == _naive_perft(
+        board, player, depth, position.geometry
+    )
+
+
+def test_divide_sums_to_the_total():
+    position = PERFT_POSITIONS["midgame"]
+    board, player = position_board(position)
+    for backend in PERFT_BACKENDS:
+        divided = perft_divide(board, player, 3, position.geometry, backend)
+        assert len(divided) == 14
+        assert tuple(map(sum, zip(*divided.values()))) == KNOWN_COUNTS[("midgame", 3)]
+
+
+def test_finished_games_have_no_moves_and_timings_cover_every_backend():
+    position = PERFT_POSITIONS["midgame"]
+    board, player = position_board(position)
+    won = next(
+        move for move, result in perft_divide(board, player, 1).items() if result.wins
+    )
+    apply_move(board, *won, player)
+    assert perft(board, PLAYER_O, 2) == (0, 0, 0)
+    assert perft(board, PLAYER_O, 0) == (1, 0, 0)
+
+    timings = time_perft(*position_board(position), 2, position.geometry)
+    assert [timing.backend for timing in timings] == list(PERFT_BACKENDS)
+    assert all(timing.result == KNOWN_COUNTS[("midgame", 2)] for timing in timings)
+    with pytest.raises(ValueError):
+        perft(board, PLAYER_O, 1, backend="numpy")
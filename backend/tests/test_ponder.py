@@ -0,0 +1,113 @@
+# backend/tests/test_ponder.py
+# Test cases for pondering during the human's turn
+
+import asyncio
+import time
+
+from app.services.ai_executor import AI_EXECUTOR_MODE_THREAD, AIExecutor
+from app.services.ai.base_bot import BaseBot
+from app.services.ponder import PonderManager, rank_replies
+from app.services.game_logic import create_board, apply_move
+from app.core.constants import PLAYER_X, PLAYER_O
+
+
+class RecordingBot(BaseBot):
+    """Answers (0, "R") after a short delay and counts its searches."""
+
+    def __init__(self, player_piece: str, seconds: float = 0.01):
+        super().__init__(player_piece)
+        self.seconds = seconds
+        self.calls = 0
+
+    def _choose_move(self, board):
+        self.calls += 1
+        time.sleep(self.seconds)
+        return (0, "R")
+
+
+def _board_after(moves):
+    board = create_board()
+    for row, side, piece in moves:
+        apply_move(board, row, side, piece)
+    return board
+
+
+def test_rank_replies_skips_immediate_wins():
+    board = _board_after([(0, "L", PLAYER_X)] * 3 + [(4, "R", PLAYER_O)])
+    replies = rank_replies(board, PLAYER_X)
+    assert (0, "L") not in replies  # Wins on the spot, nothing to answer
+    assert len(replies) == 13
+
+
+def test_pondered_reply_is_answered_without_a_live_search():
+    executor = AIExecutor(mode=AI_EXECUTOR_MODE_THREAD, max_workers=2)
+    ponder = PonderManager(max_games=1, max_replies=14, executor=executor)
+    board = _board_after([(3, "L", PLAYER_X), (3, "R", PLAYER_O)])
+    bot = RecordingBot(PLAYER_O)
+
+    async def scenario():
+        assert ponder.start("game-1", bot, board, PLAYER_X, PLAYER_O)
+        await asyncio.sleep(0.5)  # The human thinks
+        human_board = [row[:] for row in board]
+        apply_move(human_board, 5, "L", PLAYER_X)
+        return await ponder.take_result("game-1", human_board)
+
+    assert asyncio.run(scenario()) == (True, (0, "R"))
+    executor.shutdown()
+    assert ponder.active_games == 0
+
+
+def test_reply_being_searched_is_awaited_instead_of_restarted():
+    executor = AIExecutor(mode=AI_EXECUTOR_MODE_THREAD, max_workers=2)
+    ponder = PonderManager(max_games=1, max_replies=14, executor=executor)
+    board = _board_after([(3, "L", PLAYER_X), (3, "R", PLAYER_O)])
+    first_reply = rank_replies(board, PLAYER_X)[0]
+
+    async def scenario():
+        ponder.start(
+            "game-1", RecordingBot(PLAYER_O, seconds=0.3), board, PLAYER_X, PLAYER_O
+        )
+        await asyncio.sleep(0.05)  # First reply is in flight
+        human_board = [row[:] for row in board]
+        apply_move(human_board, first_reply[0], first_reply[1], PLAYER_X)
+        return await ponder.take_result("game-1", human_board)
+
+    assert asyncio.run(scenario()) == (True, (0, "R"))
+    executor.shutdown()
+
+
+def test_unpondered_reply_is_a_miss():
+    executor = AIExecutor(mode=AI_EXECUTOR_MODE_THREAD, max_workers=2)
+    ponder = PonderManager(max_games=1, max_replies=1, executor=executor)
+    board = _board_after([(3, "L", PLAYER_X), (3, "R", PLAYER_O)])
+    last_reply = rank_replies(board, PLAYER_X)[-1]
+
+    async def scenario():
+        ponder.start("game-1", RecordingBot(PLAYER_O), board, PLAYER_X, PLAYER_O)
+        await asyncio.sleep(0.2)
+        human_board = [row[:] for row in board]
+        apply_move(human_board, last_reply[0], last_reply[1], PLAYER_X)
+        return await ponder.take_result("game-1", human_board)
+
+    assert asyncio.run(scenario()) == (False, None)
+    executor.shutdown()
+    assert executor.pending == 0
+
+
+def test_pondering_is_capped_per_process():
+    executor = AIExecutor(mode=AI_EXECUTOR_MODE_THREAD, max_workers=2)
+    ponder = PonderManager(max_games=1, executor=executor)
+    board = create_board()
+
+    async def scenario():
+        assert ponder.start("game-1", RecordingBot(PLAYER_O), board, PLAYER_X, PLAYER_O)
+        assert not ponder.start(
+            "game-2", RecordingBot(PLAYER_O), board, PLAYER_X, PLAYER_O
+        )
+        ponder.stop("game-1")
+        assert ponder.start("game-2", RecordingBot(PLAYER_O), board, PLAYER_X, PLAYER_O)
+        ponder.stop("game-2")
+
+    asyncio.run(scenario())
+    executor.shutdown()
+    assert ponder.active_games == 0
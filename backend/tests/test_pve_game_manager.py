@@ -0,0 +1,106 @@
+# backend/tests/test_pve_game_manager.py
+# Test cases for the PvE AI turn handler
+
+import asyncio
+import random
+from types import SimpleNamespace
+
+from app.core import constants
+from app.crud import crud_game
+from app.services import move_cache as move_cache_module
+from app.services import pve_game_manager as pve_module
+from app.services.ai_executor import AI_EXECUTOR_MODE_THREAD, AIExecutor
+from app.services.bot_registry import bot_registry
+from app.services.game_logic import BitBoard, apply_move, create_board
+from app.services.move_cache import MoveCache
+from app.core.constants import PLAYER_X
+
+HUMAN_TOKEN = "human"
+AI_TOKEN = (
+    f"{constants.AI_PLAYER_TOKEN_PREFIX}HARD{constants.AI_PLAYER_TOKEN_GENERIC_SUFFIX}"
+)
+
+
+class FakeCrud:
+    """Stands in for crud_game: updates the one in-memory game."""
+
+    def __init__(self, game):
+        self.game = game
+
+    game_geometry = staticmethod(crud_game.game_geometry)
+
+    def update_game_state(self, db, game_id, **fields):
+        for name, value in fields.items():
+            setattr(self.game, name, value)
+        return self.game
+
+
+class SilentManager:
+    """Stands in for the connection manager; nobody is listening."""
+
+    async def broadcast_game_update(self, *args, **kwargs):
+        pass
+
+    async def broadcast_game_over(self, *args, **kwargs):
+        pass
+
+    async def broadcast_error_to_game(self, *args, **kwargs):
+        pass
+
+
+def _play_pve_game(monkeypatch, game_id, ai_seed, human_moves=4):
+    """The AI's moves in a PVE_HARD game where the human plays a fixed script."""
+    game = SimpleNamespace(
+        id=game_id,
+        game_mode="PVE_HARD",
+        ai_seed=ai_seed,
+        player1_token=HUMAN_TOKEN,
+        current_player_token=HUMAN_TOKEN,
+        status=constants.GAME_STATUS_ACTIVE,
+        board_state={"board": create_board()},
+        board_rows=None,
+        board_cols=None,
+        connect_n=None,
+    )
+    monkeypatch.setattr(pve_module, "crud_game", FakeCrud(game))
+    human_rng = random.Random(5)
+    ai_moves = []
+    for _ in range(human_moves):
+        board = [row[:] for row in game.board_state["board"]]
+        human_move = human_rng.choice(BitBoard.from_board(board).valid_moves())
+        apply_move(board, *human_move, PLAYER_X)
+        game.board_state = {"board": board}
+        game.current_player_token = AI_TOKEN
+        asyncio.run(pve_module._handle_pve_ai_turn(None, game, game_id))
+        after = game.board_state["board"]
+        ai_moves.append(
+            [
+                (r, c)
+                for r, row in enumerate(board)
+                for c, cell in enumerate(row)
+                if after[r][c] != cell
+            ]
+        )
+        if game.status != constants.GAME_STATUS_ACTIVE:
+            break
+    bot_registry.release_game(game_id)
+    return ai_moves
+
+
+def test_seeded_hard_game_replays_move_for_move(monkeypatch):
+    executor = AIExecutor(mode=AI_EXECUTOR_MODE_THREAD, max_workers=1)
+    cache = MoveCache(max_entries=100, ttl_seconds=60)
+    monkeypatch.setattr(move_cache_module, "ai_executor", executor)
+    monkeypatch.setattr(move_cache_module, "move_cache", cache)
+    monkeypatch.setattr(pve_module, "manager", SilentManager())
+    monkeypatch.setattr(pve_module, "_get_pve_min_reveal_seconds", lambda mode: 0.0)
+    try:
+        first = _play_pve_game(monkeypatch, "seeded-1", ai_seed=1234)
+        # A new game created with the first one's recorded seed
+        replay = _play_pve_game(monkeypatch, "seeded-2", ai_seed=1234)
+    finally:
+        executor.shutdown()
+    assert first == replay
+    assert all(len(cells) == 1 for cells in first)
+    # Seeded games neither read nor fill the cross-game move cache
+    assert len(cache) == 0 and cache.hits + cache.misses == 0
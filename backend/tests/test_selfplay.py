@@ -0,0 +1,97 @@
+# backend/tests/test_selfplay.py
+# Test cases for the headless self-play and tuning harness
+
+import random
+
+import pytest
+
+from app.services.ai.eval_weights import DEFAULT_EVAL_WEIGHTS
+from app.services.ai.selfplay import (
+    GameResult,
+    MatchResult,
+    PlayerConfig,
+    cheapest_config,
+    elo_from_score,
+    play_pair,
+    random_opening,
+    run_match,
+    spsa_tune,
+    tunable_parameters,
+)
+from app.core.constants import AI_DIFFICULTY_MEDIUM
+
+
+def test_match_result_score_interval_and_elo():
+    result = MatchResult(wins=60, draws=20, losses=20)
+    assert result.games == 100 and result.score == 0.7
+    low, high = result.score_interval()
+    assert low < 0.7 < high and high - low == pytest.approx(2 * 1.96 * 0.4 / 10)
+    assert result.elo == pytest.approx(147.2, abs=0.1)
+    assert elo_from_score(0.5) == 0 and elo_from_score(1.0) > 1000
+    # All draws: no spread at all
+    assert MatchResult(draws=10).score_interval() == (0.5, 0.5)
+
+    updated = (
+        MatchResult().add(GameResult(1, 300, 10, 0.5)).add(GameResult(-1, 100, 10, 0.5))
+    )
+    assert (updated.wins, updated.losses, updated.nodes_per_move) == (1, 1, 20)
+
+
+def test_openings_are_reproducible_and_unfinished():
+    first = random_opening(random.Random(5), 6)
+    assert first == random_opening(random.Random(5), 6) and len(first) == 6
+
+
+def test_paired_games_are_deterministic():
+    first, second = PlayerConfig("medium", 2), PlayerConfig("medium", 1)
+    opening = random_opening(random.Random(1), 4)
+    assert play_pair(first, second, opening, 7)[0].outcome == (
+        play_pair(first, second, opening, 7)[0].outcome
+    )
+    as_x, as_o = play_pair(first, second, opening, 7)
+    assert as_x.moves > 0 and as_o.moves > 0 and as_x.nodes > 0
+
+
+def test_match_is_symmetric_and_parallel_matches_serial():
+    first, second = PlayerConfig("medium", 2), PlayerConfig("medium", 1)
+    serial = run_match(first, second, 6, seed=3)
+    assert serial.games == 6
+    mirrored = run_match(second, first, 6, seed=3)
+    assert (mirrored.wins, mirrored.draws, mirrored.losses) == (
+        serial.losses,
+        serial.draws,
+        serial.wins,
+    )
+    parallel = run_match(first, second, 6, seed=3, workers=2)
+    assert parallel[:5] == serial[:5]
+
+
+def test_spsa_moves_only_the_tunable_weights():
+    start = DEFAULT_EVAL_WEIGHTS[AI_DIFFICULTY_MEDIUM]
+    assert tunable_parameters(start) == [
+        "three",
+        "open_two",
+        "opponent_three",
+        "opponent_open_two",
+    ]
+    seen = []
+    tuned = spsa_tune(
+        PlayerConfig("medium", 1),
+        iterations=2,
+        games_per_iteration=2,
+        progress=lambda k, weights, match: seen.append((k, match.games)),
+    )
+    assert seen == [(0, 2), (1, 2)]
+    assert tuned.win == start.win and tuned.blocked_two == 0
+    # Every tuned weight keeps its sign
+    for field in tunable_parameters(start):
+        assert (getattr(tuned, field) > 0) == (getattr(start, field) > 0)
+
+
+def test_cheapest_config_holding_the_target():
+    reference = PlayerConfig("medium", 2)
+    candidates = [PlayerConfig("medium", 2), PlayerConfig("medium", 1)]
+    best, results = cheapest_config(candidates, reference, 0.0, games=2)
+    assert best == PlayerConfig("medium", 1)
+    assert [candidate for candidate, _ in results] == candidates
+    assert cheapest_config(candidates, reference, 1.01, games=2)[0] is None
@@ -0,0 +1,125 @@
+# backend/tests/test_win_detection.py
+# Property-style tests: the local win check through last_move_coords must agree
+# with the full-board scan on randomly generated positions.
+
+import random
+
+import pytest
+from app.services.game_logic import (
+    LINE_DIRECTIONS,
+    create_board,
+    is_valid_move,
+    apply_move,
+    check_win,
+    find_winning_line,
+)
+from app.core.constants import (
+    PLAYER_X,
+    PLAYER_O,
+    EMPTY_CELL,
+    ROWS,
+    COLS,
+    CONNECT_N,
+)
+
+
+def _assert_is_winning_line(board, player, line):
+    assert len(line) >= CONNECT_N
+    assert all(board[r][c] == player for r, c in line)
+    dr, dc = line[1][0] - line[0][0], line[1][1] - line[0][1]
+    assert (dr, dc) in LINE_DIRECTIONS
+    for (r1, c1), (r2, c2) in zip(line, line[1:]):
+        assert (r2 - r1, c2 - c1) == (dr, dc)
+
+
+def _cell_completes_window(board, player, row_idx, col_idx):
+    """Reference answer: does any CONNECT_N window through the cell belong to player?"""
+    for dr, dc in LINE_DIRECTIONS:
+        for offset in range(CONNECT_N):
+            start_r, start_c = row_idx - dr * offset, col_idx - dc * offset
+            cells = [(start_r + dr * i, start_c + dc * i) for i in range(CONNECT_N)]
+            if all(0 <= r < ROWS and 0 <= c < COLS for r, c in cells) and all(
+                board[r][c] == player for r, c in cells
+            ):
+                return True
+    return False
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_local_check_matches_full_scan_in_random_games(seed):
+    rng = random.Random(seed)
+    board = create_board()
+    player = PLAYER_X
+    while True:
+        moves = [
+            (r, s)
+            for r in range(ROWS)
+            for s in ("L", "R")
+            if is_valid_move(board, r, s)
+        ]
+        if not moves:
+            break
+        row, side = rng.choice(moves)
+        coords = apply_move(board, row, side, player)
+
+        local_line = find_winning_line(board, player, coords)
+        full_line = find_winning_line(board, player)
+        assert (local_line is None) == (full_line is None)
+        assert check_win(board, player, coords) == check_win(board, player)
+        if local_line:
+            assert coords in local_line
+            _assert_is_winning_line(board, player, local_line)
+            _assert_is_winning_line(board, player, full_line)
+            break
+        player = PLAYER_O if player == PLAYER_X else PLAYER_X
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_local_check_matches_reference_on_random_fills(seed):
+    rng = random.Random(1000 + seed)
+    density = rng.uniform(0.3, 0.9)
+    board = create_board()
+    for r in range(ROWS):
+        for c in range(COLS):
+            if rng.random() < density:
+                board[r][c] = rng.choice((PLAYER_X, PLAYER_O))
+
+    for r in range(ROWS):
+        for c in range(COLS):
+            player = board[r][c]
+            if player == EMPTY_CELL:
+                continue
+            line = find_winning_line(board, player, (r, c))
+            assert (line is not None) == _cell_completes_window(board, player, r, c)
+            if line:
+                assert (r, c) in line
+                _assert_is_winning_line(board, player, line)
+
+
+def test_full_scan_fallback_when_coords_missing_or_stale():
+    board = create_board()
+    for i in range(CONNECT_N):
+        board[2][1 + i] = PLAYER_O
+    assert find_winning_line(board, PLAYER_O) == [(2, 1 + i) for i in range(CONNECT_N)]
+    # Coords that do not hold the player's piece fall back to scanning everything
+    assert find_winning_line(board, PLAYER_O, (6, 6)) is not None
+    assert find_winning_line(board, PLAYER_X, (2, 1)) is None
+
+
+def test_local_check_returns_whole_run():
+    board = create_board()
+    for c in range(CONNECT_N + 1):
+        board[4][c] = PLAYER_X
+    line = find_winning_line(board, PLAYER_X, (4, 2))
+    assert line == [(4, c) for c in range(CONNECT_N + 1)]
+
+
+def test_both_paths_report_the_same_whole_run():
+    # Five in a row on the connect-4 board: neither path clips it to CONNECT_N
+    board = create_board()
+    for i in range(CONNECT_N + 1):
+        board[1 + i][1 + i] = PLAYER_O
+    run = [(1 + i, 1 + i) for i in range(CONNECT_N + 1)]
+    assert find_winning_line(board, PLAYER_O) == run
+    for coords in run:
+        assert find_winning_line(board, PLAYER_O, coords) == run
@@ -2,9 +2,9 @@
 import React from 'react'
 import { Box, Button, VStack, HStack, Text, Icon } from '@chakra-ui/react'
 import { FaArrowLeft, FaArrowRight } from 'react-icons/fa' // For arrow icons
-import { NUM_ROWS } from '../constants/gameConstants' // Assuming NUM_ROWS is defined in your constants
+import { NUM_ROWS, NUM_COLS } from '../constants/gameConstants' // Defaults when the game's geometry is unknown
 
-const Controls = ({ onMakeMove, isDisabled, currentPlayerPiece }) => {
+const Controls = ({ onMakeMove, isDisabled, currentPlayerPiece, numRows = NUM_ROWS, numCols = NUM_COLS }) => {
     const handleMove = (rowIndex, side) => {
         if (!isDisabled) {
             onMakeMove(rowIndex, side)
@@ -16,7 +16,7 @@ const Controls = ({ onMakeMove, isDisabled, currentPlayerPiece }) => {
             <Text textAlign="center" fontWeight="bold" mb={2}>
                 Click a side to place your piece ({currentPlayerPiece || '?'})
             </Text>
-            {Array.from({ length: NUM_ROWS }).map((_, rowIndex) => (
+            {Array.from({ length: numRows }).map((_, rowIndex) => (
                 <HStack key={rowIndex} spacing={2} justifyContent="center">
                     <Button
                         onClick={() => handleMove(rowIndex, 'L')}
@@ -30,7 +30,7 @@ const Controls = ({ onMakeMove, isDisabled, currentPlayerPiece }) => {
                         Row {rowIndex}
                     </Button>
                     <Box
-                        w={`${50 * 7 + (7 - 1) * 4}px`} // Approximate width of the board for visual spacing
+                        w={`${50 * numCols + (numCols - 1) * 4}px`} // Approximate width of the board for visual spacing
                         textAlign="center"
                         fontWeight="bold"
                         p={2}
@@ -79,6 +79,7 @@ const GameSetup = ({ setIsLoading, setError, isLoading }) => {
                                         <option value="EASY">Easy</option>
                                         <option value="MEDIUM">Medium</option>
                                         <option value="HARD">Hard</option>
+                                        <option value="MCTS">Monte Carlo</option>
                                     </Select>
                                 </VStack>
                             )}
@@ -87,13 +88,13 @@ const GameSetup = ({ setIsLoading, setError, isLoading }) => {
                                     <VStack spacing={1} align="stretch">
                                         <Text fontSize="sm" color="gray.600">AI 1 (Plays as X):</Text>
                                         <Select value={avaAi1Difficulty} onChange={(e) => setAvaAi1Difficulty(e.target.value)}>
-                                            <option value="EASY">Easy</option><option value="MEDIUM">Medium</option><option value="HARD">Hard</option>
+                                            <option value="EASY">Easy</option><option value="MEDIUM">Medium</option><option value="HARD">Hard</option><option value="MCTS">Monte Carlo</option>
                                         </Select>
                                     </VStack>
                                     <VStack spacing={1} align="stretch">
                                         <Text fontSize="sm" color="gray.600">AI 2 (Plays as O):</Text>
                                         <Select value={avaAi2Difficulty} onChange={(e) => setAvaAi2Difficulty(e.target.value)}>
-                                            <option value="EASY">Easy</option><option value="MEDIUM">Medium</option><option value="HARD">Hard</option>
+                                            <option value="EASY">Easy</option><option value="MEDIUM">Medium</option><option value="HARD">Hard</option><option value="MCTS">Monte Carlo</option>
                                         </Select>
                                     </VStack>
                                 </VStack>
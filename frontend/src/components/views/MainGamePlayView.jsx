@@ -35,6 +35,8 @@ const MainGamePlayView = ({
                         onMakeMove={onMakeMove}
                         isDisabled={controlsDisabled}
                         currentPlayerPiece={currentPlayerPiece}
+                        numRows={gameState.geometry?.rows ?? gameState.board.length}
+                        numCols={gameState.geometry?.cols ?? gameState.board[0]?.length}
                     />
                 )}
 
@@ -42,6 +42,7 @@ export const AI_DIFFICULTY = {
     EASY: 'EASY',
     MEDIUM: 'MEDIUM',
     HARD: 'HARD',
+    MCTS: 'MCTS',
 };
 
 // WebSocket Message Types (as used in socketService and potentially hooks)
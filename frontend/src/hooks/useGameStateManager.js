@@ -10,6 +10,7 @@ const INITIAL_GAME_STATE = {
     winner_token: null,
     players_map: {},
     last_move: null,
+    geometry: null, // { rows, cols, connect_n } from GAME_START
 };
 
 const useGameStateManager = (clientId) => {
@@ -56,6 +57,7 @@ const useGameStateManager = (clientId) => {
             status: GAME_STATUS.ACTIVE,
             winner_token: null,
             last_move: null,
+            geometry: payload.geometry || null,
         }));
         // Update gameData if 'your_token' and 'your_piece' are in GAME_START and differ (e.g. on reconnect)
         if (payload.your_token && payload.your_piece && gameData?.player_token !== payload.your_token) {